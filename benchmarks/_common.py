@@ -0,0 +1,55 @@
+"""
+Shared helpers for benchmark scripts
+Run benchmarks from the project root, e.g. `python -m benchmarks.bench_predict_stream`
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from modules.AIModel import SentimentClassifier
+
+TRAIN_FILE = "data/train_clean.csv"
+TEST_FILE = "data/test1.csv"
+
+
+def load_or_train_classifier() -> SentimentClassifier:
+    """
+    Load modules/model.pkl, or fit a fresh model on data/train_clean.csv
+    (in memory only, nothing is written) when no model has been trained yet
+    """
+    clf = SentimentClassifier()
+    if os.path.exists("modules/model.pkl") and clf._loadModel():
+        return clf
+
+    df = pd.read_csv(TRAIN_FILE)
+    df['label'] = pd.to_numeric(df['label'], errors='coerce')
+    df = df.dropna(subset=['label'])
+    clf.model.fit(clf.vectorizer.fit_transform(df['text']), df['label'].astype(int))
+    clf.is_trained = True
+    clf.n_samples = len(df)
+    return clf
+
+
+def replicate_csv(source: str, target: str, factor: int) -> int:
+    """
+    Write `source` repeated `factor` times into `target`
+
+    Returns:
+        Number of data rows written
+    """
+    df = pd.read_csv(source)
+    with open(target, 'w', encoding='utf-8', newline='') as f:
+        for i in range(factor):
+            df.to_csv(f, index=False, header=(i == 0))
+    return len(df) * factor
+
+
+@contextmanager
+def timer(results: dict, key: str):
+    """Store elapsed wall time (seconds) of the block in results[key]"""
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
@@ -0,0 +1,67 @@
+"""
+Benchmark: fixed random sleeps vs adaptive DOM-signal scrolling
+Loads benchmarks/fixtures/youtube_comments_infinite.html (appends a batch of
+comments after each scroll) and reports time per comment loaded for the
+previous fixed-sleep loop and for YoutubeCommentScraper._scroll.
+Requires Chrome + chromedriver on the machine.
+
+Usage:
+    python -m benchmarks.bench_adaptive_scroll --total 200 --delay 400
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+from pathlib import Path
+
+from modules.YoutubeCommentScraper import YoutubeCommentScraper
+
+FIXTURE = Path(__file__).parent / "fixtures" / "youtube_comments_infinite.html"
+COUNT_JS = "return document.querySelectorAll('ytd-comment-thread-renderer').length"
+
+
+def _fixed_sleep_scroll(driver, scroll_time):
+    """The previous _scroll loop: random 2-4 s sleeps plus 2 s on every stall"""
+    time.sleep(3)
+    last_height = driver.execute_script("return document.documentElement.scrollHeight")
+    for _ in range(scroll_time):
+        driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
+        time.sleep(random.randint(2, 4))
+        new_height = driver.execute_script("return document.documentElement.scrollHeight")
+        if new_height == last_height:
+            time.sleep(2)
+            new_height = driver.execute_script("return document.documentElement.scrollHeight")
+            if new_height == last_height:
+                break
+        last_height = new_height
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--total', type=int, default=200)
+    parser.add_argument('--delay', type=int, default=400, help='fixture load delay (ms)')
+    parser.add_argument('--scroll-time', type=int, default=50)
+    args = parser.parse_args()
+
+    url = f"{FIXTURE.resolve().as_uri()}?total={args.total}&delay={args.delay}"
+
+    print(f"{'mode':<12}{'comments':>10}{'seconds':>10}{'ms/comment':>12}")
+    with YoutubeCommentScraper() as scraper, contextlib.redirect_stdout(io.StringIO()):
+        scraper._get_url(url)
+        start = time.monotonic()
+        _fixed_sleep_scroll(scraper.driver, args.scroll_time)
+        fixed = (scraper.driver.execute_script(COUNT_JS), time.monotonic() - start)
+
+        scraper._get_url(url)
+        scraper._scroll(args.scroll_time, deadline=300, idle_timeout=2)
+        stats = scraper.scroll_stats
+
+    for name, (count, seconds) in [('fixed', fixed), ('adaptive', (stats['comments'], stats['seconds']))]:
+        per_comment = seconds / count * 1000 if count else float('nan')
+        print(f"{name:<12}{count:>10}{seconds:>10.1f}{per_comment:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: Cleaner.clean_series (fused batch pass) vs apply(clean_single_text)
+Scales up the data/raw_comments_*.csv comments, checks byte-identical output
+(plus a randomized edge-case corpus) and reports the speedup.
+
+Usage:
+    python -m benchmarks.bench_cleaner --scale 1000
+"""
+
+import argparse
+import glob
+import random
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import timer
+from modules.Cleaner import Cleaner
+
+EDGE_ALPHABET = list("aZ9_ .,!?@#/:-'\"\t\n\r\x0b\x0c  　ΣσςİıßĐđáỆ😀") + [
+    'http', 'https://x.y/z', 'www.', '@user', '@a.b', 'ΑΣ', '\u2028', '\u2029', None,
+]
+
+
+def _edge_corpus(n: int, seed: int = 0) -> pd.Series:
+    """Random texts mixing URLs, mentions, punctuation, odd whitespace and non-str values"""
+    rng = random.Random(seed)
+    values = []
+    for _ in range(n):
+        if rng.random() < 0.05:
+            values.append(rng.choice([None, np.nan, 123, '']))
+            continue
+        parts = [rng.choice(EDGE_ALPHABET) for _ in range(rng.randint(0, 12))]
+        values.append(''.join(p for p in parts if isinstance(p, str)))
+    return pd.Series(values, dtype=object)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scale', type=int, default=1000, help='times to replicate the raw comments')
+    args = parser.parse_args()
+
+    cleaner = Cleaner()
+
+    edge = _edge_corpus(50000)
+    edge_ok = cleaner.clean_series(edge, batch_size=997).tolist() == edge.apply(cleaner.clean_single_text).tolist()
+    print(f"Edge-case corpus identical: {edge_ok}")
+
+    comments = pd.concat(
+        [pd.read_csv(path)['comment'] for path in sorted(glob.glob('data/raw_comments_*.csv'))],
+        ignore_index=True,
+    )
+    series = pd.Series(np.tile(comments.to_numpy(dtype=object), args.scale), dtype=object)
+    print(f"Input: {len(series):,} comments ({args.scale}x raw_comments)")
+
+    times = {}
+    with timer(times, 'apply'):
+        expected = series.apply(cleaner.clean_single_text)
+    with timer(times, 'batch'):
+        cleaned = cleaner.clean_series(series)
+
+    identical = cleaned.tolist() == expected.tolist()
+    print(f"apply(clean_single_text): {times['apply']:.2f}s ({len(series) / times['apply']:,.0f} rows/s)")
+    print(f"clean_series:             {times['batch']:.2f}s ({len(series) / times['batch']:,.0f} rows/s)")
+    print(f"Speedup: {times['apply'] / times['batch']:.1f}x, identical output: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark: per-element extraction vs bulk single-call extraction
+Renders N comments with benchmarks/fixtures/youtube_comments_infinite.html
+(first batch = all comments), extracts them both ways, checks the results
+match and prints per-phase timings. Requires Chrome + chromedriver.
+
+Usage:
+    python -m benchmarks.bench_extract_comments --comments 2000
+"""
+
+import argparse
+import contextlib
+import io
+from pathlib import Path
+
+from modules.YoutubeCommentScraper import YoutubeCommentScraper
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--comments', type=int, default=2000)
+    args = parser.parse_args()
+
+    urls = {
+        'static fixture': (FIXTURES / "youtube_comments.html").resolve().as_uri(),
+        f'{args.comments} comments': (f"{(FIXTURES / 'youtube_comments_infinite.html').resolve().as_uri()}"
+                                      f"?total={args.comments}&batch={args.comments}"),
+    }
+
+    with YoutubeCommentScraper() as scraper:
+        for name, url in urls.items():
+            with contextlib.redirect_stdout(io.StringIO()):
+                scraper._get_url(url)
+                elementwise = scraper.extract_comments(bulk=False)
+                slow = scraper.extract_stats
+                bulk = scraper.extract_comments(bulk=True)
+                fast = scraper.extract_stats
+
+            print(f"{name}: {len(bulk)} comments, identical: {bulk == elementwise}")
+            for label, stats in [('element-wise', slow), ('bulk', fast)]:
+                phases = ", ".join(f"{k} {v * 1000:.0f}ms" for k, v in stats.items()
+                                   if k not in ('comments', 'bulk'))
+                print(f"  {label:<13}{phases}")
+            print(f"  speedup: {slow['total'] / fast['total']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
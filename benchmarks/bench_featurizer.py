@@ -0,0 +1,74 @@
+"""
+Benchmark: CountVectorizer vocabulary vs HashingVectorizer featurizer
+Trains on data/train_clean.csv and reports, per featurizer: saved model size,
+load time, transform throughput and accuracy on data/test1.csv.
+
+Usage:
+    python -m benchmarks.bench_featurizer --n-features 16384 65536 262144
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+
+import pandas as pd
+from sklearn.metrics import accuracy_score
+
+from benchmarks._common import TEST_FILE, TRAIN_FILE, timer
+from modules.AIModel import SentimentClassifier
+
+
+def _fit(clf: SentimentClassifier, df: pd.DataFrame) -> None:
+    """Fit vectorizer + model in memory (same steps as _train)"""
+    clf.model.fit(clf.vectorizer.fit_transform(df['text']), df['label'])
+    clf.is_trained = True
+    clf.n_samples = len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n-features', type=int, nargs='+', default=[2 ** 14, 2 ** 16, 2 ** 18])
+    parser.add_argument('--load-repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    train = pd.read_csv(TRAIN_FILE)
+    train['label'] = pd.to_numeric(train['label'], errors='coerce')
+    train = train.dropna(subset=['label'])
+    train['label'] = train['label'].astype(int)
+    test = pd.read_csv(TEST_FILE)
+    test_texts = test['text'].astype(str).tolist()
+
+    configs = [('count', None)] + [('hashing', n) for n in args.n_features]
+
+    print(f"{'featurizer':<18}{'size KB':>10}{'load ms':>10}{'transform rows/s':>18}{'accuracy':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for featurizer, n_features in configs:
+            kwargs = {'featurizer': featurizer}
+            if n_features:
+                kwargs['n_features'] = n_features
+            clf = SentimentClassifier(**kwargs)
+            _fit(clf, train)
+
+            model_path = os.path.join(tmp, f'{featurizer}_{n_features}.pkl')
+            times = {}
+            with contextlib.redirect_stdout(io.StringIO()):
+                clf._saveModel(model_path)
+                with timer(times, 'load'):
+                    for _ in range(args.load_repeats):
+                        loaded = SentimentClassifier()
+                        loaded._loadModel(model_path)
+
+            with timer(times, 'transform'):
+                X = loaded.vectorizer.transform(test_texts)
+            accuracy = accuracy_score(test['label'], loaded.model.predict(X))
+
+            name = featurizer if n_features is None else f"hashing 2^{n_features.bit_length() - 1}"
+            print(f"{name:<18}{os.path.getsize(model_path) / 1024:>10,.0f}"
+                  f"{times['load'] / args.load_repeats * 1000:>10.1f}"
+                  f"{len(test_texts) / times['transform']:>18,.0f}{accuracy * 100:>9.2f}%")
+
+
+if __name__ == "__main__":
+    main()
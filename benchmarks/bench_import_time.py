@@ -0,0 +1,111 @@
+"""
+Benchmark: per-stage import time of the CLI entry point (python -X importtime)
+Runs each stage's import/construction in a fresh interpreter, reports the
+total import time (best of --repeat runs) and the heaviest top-level imports,
+and checks regression thresholds: a time budget per stage plus modules a stage
+must never import (e.g. cleaning must not load selenium, sklearn or matplotlib).
+
+Usage:
+    python -m benchmarks.bench_import_time --repeat 3
+    python -m benchmarks.bench_import_time --check    # exit 1 on regression
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Code run per stage: import the entry point and build only that stage
+STAGES = {
+    'cli': "import main; main.build_parser()",
+    'startup': "import main; main.SocialMediaListenTool('https://youtu.be/x')",
+    'scrape': "import main; main.SocialMediaListenTool('https://youtu.be/x').scraper",
+    'clean': "import main; main.SocialMediaListenTool('https://youtu.be/x').cleaner",
+    'predict': "import main; main.SocialMediaListenTool('https://youtu.be/x').model",
+    'visualize': "import main; main.SocialMediaListenTool('https://youtu.be/x').visualizer",
+}
+
+# Budgets in ms (measured ~65 / 770 / 530 / 1750 / 2700 ms on a 1-CPU box)
+THRESHOLDS_MS = {
+    'cli': 300,
+    'startup': 300,
+    'scrape': 1500,
+    'clean': 1000,
+    'predict': 3000,
+    'visualize': 4500,
+}
+
+HEAVY = ('selenium', 'webdriver_manager', 'sklearn', 'matplotlib', 'wordcloud', 'pyvi', 'pandas')
+FORBIDDEN = {
+    'cli': HEAVY,
+    'startup': HEAVY,
+    'scrape': ('sklearn', 'matplotlib', 'wordcloud', 'pyvi'),
+    'clean': ('selenium', 'webdriver_manager', 'sklearn', 'matplotlib', 'wordcloud', 'pyvi'),
+    'predict': ('selenium', 'webdriver_manager', 'matplotlib', 'wordcloud', 'pyvi'),
+    'visualize': ('selenium', 'webdriver_manager'),
+}
+
+
+def measure(code: str) -> dict:
+    """
+    Run code under -X importtime in a fresh interpreter
+
+    Returns:
+        {'total_ms', 'modules' (set of imported names), 'top' [(ms, name)]}
+    """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    total_us = 0
+    modules = set()
+    top = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|', 2)
+        try:
+            cumulative = int(cumulative)
+        except ValueError:
+            continue  # header line
+        modules.add(name.strip())
+        # Top-level imports are indented by exactly one space after '|'
+        if not name[1:].startswith(' '):
+            total_us += cumulative
+            top.append((cumulative / 1000, name.strip()))
+    return {'total_ms': total_us / 1000, 'modules': modules, 'top': sorted(top, reverse=True)[:3]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per stage (best is kept)')
+    parser.add_argument('--stages', nargs='+', default=list(STAGES), choices=list(STAGES))
+    parser.add_argument('--check', action='store_true', help='exit 1 if a threshold is exceeded')
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'stage':<11}{'ms':>9}{'budget':>9}  heaviest imports")
+    for stage in args.stages:
+        runs = [measure(STAGES[stage]) for _ in range(args.repeat)]
+        best = min(runs, key=lambda r: r['total_ms'])
+        heaviest = ', '.join(f"{name} {ms:.0f}" for ms, name in best['top'])
+        print(f"{stage:<11}{best['total_ms']:>9.0f}{THRESHOLDS_MS[stage]:>9}  {heaviest}")
+
+        if best['total_ms'] > THRESHOLDS_MS[stage]:
+            failures.append(f"{stage}: {best['total_ms']:.0f} ms > {THRESHOLDS_MS[stage]} ms")
+        leaked = sorted(package for package in FORBIDDEN[stage]
+                        if any(m == package or m.startswith(package + '.') for m in best['modules']))
+        if leaked:
+            failures.append(f"{stage}: imports {', '.join(leaked)}")
+
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: full retrain vs incremental train_incremental on a new delta
+Splits data/train_clean.csv into a base set and a "nightly" delta, then
+compares refitting everything against folding only the delta into a saved
+model. Naive Bayes counts are additive, so both models must agree.
+
+Usage:
+    python -m benchmarks.bench_incremental_train --delta 0.05
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import TEST_FILE, TRAIN_FILE, timer
+from modules.AIModel import SentimentClassifier
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--delta', type=float, default=0.05, help='fraction of train set used as delta')
+    parser.add_argument('--n-features', type=int, default=2 ** 14)
+    args = parser.parse_args()
+
+    train = pd.read_csv(TRAIN_FILE)
+    split = int(len(train) * (1 - args.delta))
+    test_texts = pd.read_csv(TEST_FILE)['text'].astype(str).tolist()
+
+    times = {}
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        base_path = os.path.join(tmp, 'base.csv')
+        delta_path = os.path.join(tmp, 'delta.csv')
+        model_path = os.path.join(tmp, 'model.pkl')
+        train.iloc[:split].to_csv(base_path, index=False)
+        train.iloc[split:].to_csv(delta_path, index=False)
+
+        # Yesterday's model, trained on the base set
+        base = SentimentClassifier(featurizer='hashing', n_features=args.n_features)
+        base.train_incremental(base_path, model_path=model_path)
+
+        with timer(times, 'full'):
+            full = SentimentClassifier(featurizer='hashing', n_features=args.n_features)
+            full.train_incremental(TRAIN_FILE, model_path=os.path.join(tmp, 'full.pkl'))
+
+        with timer(times, 'incremental'):
+            nightly = SentimentClassifier()
+            nightly._loadModel(model_path)
+            nightly.train_incremental(delta_path, model_path=model_path)
+
+    same = np.array_equal(full._predict_labels(test_texts), nightly._predict_labels(test_texts))
+    print(f"Base rows: {split:,}  delta rows: {len(train) - split:,}")
+    print(f"Full retrain:      {times['full']:.3f}s")
+    print(f"Incremental delta: {times['incremental']:.3f}s (incl. load + checkpoint)")
+    print(f"Identical predictions on test1.csv: {same}")
+
+
+if __name__ == "__main__":
+    main()
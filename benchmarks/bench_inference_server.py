@@ -0,0 +1,139 @@
+"""
+Benchmark: load generator for the micro-batching scoring service
+Starts modules.InferenceServer in-process on a free port, then N client
+threads send one-comment POST /predict requests (keep-alive) for a fixed
+duration. Runs once with micro-batching and once with max_batch=1, and
+reports client-side p50/p99 latency, throughput and the server's metrics.
+The "direct" transport calls the MicroBatcher from the client threads
+without HTTP, isolating the batching gain from HTTP overhead.
+
+Usage:
+    python -m benchmarks.bench_inference_server --clients 32 --duration 10 --transport both
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import TEST_FILE, load_or_train_classifier
+from modules.Cleaner import Cleaner
+from modules.InferenceServer import MicroBatcher, create_server
+
+
+def _direct_client(batcher, texts: list, stop_at: float, latencies: list, errors: list, seed: int):
+    rng = np.random.default_rng(seed)
+    cleaner = Cleaner()
+    while time.perf_counter() < stop_at:
+        text = cleaner.clean_single_text(texts[rng.integers(len(texts))])
+        start = time.perf_counter()
+        try:
+            batcher.predict([text])
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+def _client(port: int, texts: list, stop_at: float, latencies: list, errors: list, seed: int):
+    rng = np.random.default_rng(seed)
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    while time.perf_counter() < stop_at:
+        body = json.dumps({'texts': [texts[rng.integers(len(texts))]]})
+        start = time.perf_counter()
+        try:
+            conn.request('POST', '/predict', body, {'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except Exception as e:
+            errors.append(str(e))
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def _run(classifier, texts, clients: int, duration: float, max_batch: int, max_wait: float,
+         transport: str) -> dict:
+    if transport == 'http':
+        server = create_server(classifier, port=0, max_batch=max_batch, max_wait=max_wait)
+        batcher = server.batcher
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        target, first_arg = _client, server.server_address[1]
+    else:
+        server = None
+        batcher = MicroBatcher(classifier, max_batch=max_batch, max_wait=max_wait)
+        target, first_arg = _direct_client, batcher
+
+    latencies, errors = [], []
+    stop_at = time.perf_counter() + duration
+    threads = [threading.Thread(target=target, args=(first_arg, texts, stop_at, latencies, errors, i))
+               for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    metrics = batcher.metrics()
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+    batcher.close()
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': len(latencies) / elapsed,
+        'p50': float(np.percentile(latencies_ms, 50)) if len(latencies_ms) else float('nan'),
+        'p99': float(np.percentile(latencies_ms, 99)) if len(latencies_ms) else float('nan'),
+        'server': metrics,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=0.0)
+    parser.add_argument('--transport', choices=('http', 'direct', 'both'), default='both')
+    args = parser.parse_args()
+
+    classifier = load_or_train_classifier()
+    texts = pd.read_csv(TEST_FILE)['text'].dropna().astype(str).tolist()
+
+    transports = ('http', 'direct') if args.transport == 'both' else (args.transport,)
+    runs = {}
+    for transport in transports:
+        runs[f"{transport} batch≤{args.max_batch}"] = _run(
+            classifier, texts, args.clients, args.duration,
+            args.max_batch, args.max_wait_ms / 1000, transport)
+        runs[f"{transport} unbatched"] = _run(
+            classifier, texts, args.clients, args.duration, 1, 0.0, transport)
+
+    print(f"{args.clients} clients x {args.duration:.0f}s, 1 comment per request")
+    # srv = whole request as timed by the HTTP handler (none for direct),
+    # queue = submit -> batch result inside the MicroBatcher
+    print(f"{'mode':<22}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'srv p50':>10}{'srv p99':>10}"
+          f"{'queue p50':>11}{'batch':>8}{'errors':>8}")
+    for name, r in runs.items():
+        server = r['server']
+        print(f"{name:<22}{r['rps']:>10,.0f}{r['p50']:>10.2f}{r['p99']:>10.2f}"
+              f"{server['latency_ms']['p50'] or 0:>10.2f}{server['latency_ms']['p99'] or 0:>10.2f}"
+              f"{server['batch_latency_ms']['p50'] or 0:>11.2f}"
+              f"{server['batch_size']['mean'] or 0:>8.1f}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
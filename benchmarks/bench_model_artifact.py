@@ -0,0 +1,74 @@
+"""
+Benchmark: pickle model.pkl vs memory-mapped model artifact load time
+Trains each featurizer on data/train_clean.csv, saves it in both formats and
+reports on-disk size, mean load time and whether predictions on
+data/test1.csv agree.
+
+Usage:
+    python -m benchmarks.bench_model_artifact --repeats 20
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import TEST_FILE, TRAIN_FILE, timer
+from modules.AIModel import SentimentClassifier
+from modules.ModelArtifact import ModelArtifact
+
+
+def _dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    test_texts = pd.read_csv(TEST_FILE)['text'].astype(str).tolist()
+    configs = [{'featurizer': 'count'}, {'featurizer': 'hashing', 'n_features': 2 ** 18}]
+
+    print(f"{'model':<16}{'format':<18}{'size KB':>10}{'load ms':>10}{'same':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for config in configs:
+            name = config['featurizer'] if 'n_features' not in config else 'hashing 2^18'
+            clf = SentimentClassifier(**config)
+            pkl_path = os.path.join(tmp, 'model.pkl')
+            art_path = os.path.join(tmp, 'artifact')
+            with contextlib.redirect_stdout(io.StringIO()):
+                if clf.featurizer == 'count':
+                    clf._train(TRAIN_FILE, feature='text', label='label', model_path=pkl_path)
+                else:
+                    clf.train_incremental(TRAIN_FILE, model_path=pkl_path)
+                clf._saveArtifact(art_path)
+            expected = clf._predict_labels(test_texts)
+
+            loaders = [
+                ('pickle', pkl_path, os.path.getsize(pkl_path),
+                 lambda c: c._loadModel(pkl_path)),
+                ('artifact mmap', art_path, _dir_size(art_path),
+                 lambda c: ModelArtifact.load(c, art_path, mmap=True)),
+                ('artifact copy', art_path, _dir_size(art_path),
+                 lambda c: ModelArtifact.load(c, art_path, mmap=False)),
+                ('artifact verify', art_path, _dir_size(art_path),
+                 lambda c: ModelArtifact.load(c, art_path, mmap=True, verify=True)),
+            ]
+            for fmt, _, size, load in loaders:
+                times = {}
+                with timer(times, 'load'), contextlib.redirect_stdout(io.StringIO()):
+                    for _ in range(args.repeats):
+                        loaded = SentimentClassifier()
+                        load(loaded)
+                same = np.array_equal(loaded._predict_labels(test_texts), expected)
+                print(f"{name:<16}{fmt:<18}{size / 1024:>10,.0f}"
+                      f"{times['load'] / args.repeats * 1000:>10.2f}{str(same):>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: SentimentClassifier.predict_parallel scaling
+Scores a replicated data/test1.csv with 1/2/4/8 worker processes, reports
+rows/sec and speedup, and checks every run matches the single-process output.
+
+Usage:
+    python -m benchmarks.bench_parallel_predict --factor 50 --workers 1 2 4 8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+
+from benchmarks._common import TEST_FILE, load_or_train_classifier, replicate_csv, timer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--factor', type=int, default=50, help='times to replicate test1.csv')
+    parser.add_argument('--chunk-size', type=int, default=20000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    clf = load_or_train_classifier()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, 'model.pkl')
+        input_path = os.path.join(tmp, 'input.csv')
+        with contextlib.redirect_stdout(io.StringIO()):
+            clf._saveModel(model_path)
+        n_rows = replicate_csv(TEST_FILE, input_path, args.factor)
+        print(f"Input: {n_rows:,} rows, {os.cpu_count()} CPUs")
+
+        times = {}
+        with timer(times, 'baseline'), contextlib.redirect_stdout(io.StringIO()):
+            baseline_path = clf.predict_stream(input_path, folder=os.path.join(tmp, 'baseline'),
+                                               chunk_size=args.chunk_size)
+        with open(baseline_path, 'rb') as f:
+            expected = f.read()
+
+        print(f"{'workers':<10}{'seconds':>10}{'rows/s':>14}{'speedup':>10}{'same':>7}")
+        print(f"{'stream':<10}{times['baseline']:>10.2f}{n_rows / times['baseline']:>14,.0f}"
+              f"{1.0:>10.2f}{'-':>7}")
+        for n in args.workers:
+            with timer(times, n), contextlib.redirect_stdout(io.StringIO()):
+                output_path = clf.predict_parallel(input_path, folder=os.path.join(tmp, f'w{n}'),
+                                                   n_workers=n, chunk_size=args.chunk_size,
+                                                   model_path=model_path)
+            with open(output_path, 'rb') as f:
+                same = f.read() == expected
+            print(f"{n:<10}{times[n]:>10.2f}{n_rows / times[n]:>14,.0f}"
+                  f"{times['baseline'] / times[n]:>10.2f}{str(same):>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: SentimentClassifier.predict vs predict_stream
+Compares wall time, rows/sec and peak Python memory (tracemalloc) on a
+replicated data/test1.csv, and checks both paths write identical output.
+
+Usage:
+    python -m benchmarks.bench_predict_stream --factor 50 --chunk-size 50000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import tracemalloc
+
+from benchmarks._common import TEST_FILE, load_or_train_classifier, replicate_csv, timer
+
+
+def _measure(func, *args, **kwargs):
+    """Run func quietly, return (result, seconds, peak_bytes)"""
+    times = {}
+    tracemalloc.start()
+    with timer(times, 'run'), contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, times['run'], peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--factor', type=int, default=50, help='times to replicate test1.csv')
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    args = parser.parse_args()
+
+    clf = load_or_train_classifier()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'input.csv')
+        n_rows = replicate_csv(TEST_FILE, input_path, args.factor)
+        print(f"Input: {n_rows:,} rows ({os.path.getsize(input_path) / 1e6:.1f} MB)")
+
+        batch_dir = os.path.join(tmp, 'batch')
+        stream_dir = os.path.join(tmp, 'stream')
+        _, t_batch, peak_batch = _measure(clf.predict, input_path, folder=batch_dir)
+        stream_path, t_stream, peak_stream = _measure(
+            clf.predict_stream, input_path, folder=stream_dir, chunk_size=args.chunk_size
+        )
+
+        batch_path = os.path.join(batch_dir, os.listdir(batch_dir)[0])
+        with open(batch_path, 'rb') as a, open(stream_path, 'rb') as b:
+            identical = a.read() == b.read()
+
+    print(f"{'mode':<10}{'seconds':>10}{'rows/s':>14}{'peak MB':>10}")
+    print(f"{'predict':<10}{t_batch:>10.2f}{n_rows / t_batch:>14,.0f}{peak_batch / 1e6:>10.1f}")
+    print(f"{'stream':<10}{t_stream:>10.2f}{n_rows / t_stream:>14,.0f}{peak_stream / 1e6:>10.1f}")
+    print(f"Identical output: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: prediction cache on overlapping scrapes
+Scores data/test1.csv once to warm the cache, then scores an "overlapping
+re-scrape" (the same comments plus a share of new ones) with and without
+the cache, checking the labels agree and reporting time and hit rate.
+
+Usage:
+    python -m benchmarks.bench_prediction_cache --factor 20 --new 0.1
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import TEST_FILE, TRAIN_FILE, timer
+from modules.AIModel import SentimentClassifier
+from modules.Cache import PredictionCache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--factor', type=int, default=20, help='times to replicate test1.csv')
+    parser.add_argument('--new', type=float, default=0.1, help='share of unseen comments in the re-scrape')
+    args = parser.parse_args()
+
+    old = pd.read_csv(TEST_FILE)['text'].astype(str)
+    # Unseen comments: training texts are disjoint from test1.csv
+    new = pd.read_csv(TRAIN_FILE)['text'].astype(str).sample(
+        n=int(len(old) * args.new), random_state=0)
+    previous = [f"{text} {i}" for i in range(args.factor) for text in old]
+    rescrape = previous + [f"{text} {i}" for i in range(args.factor) for text in new]
+
+    times = {}
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        clf = SentimentClassifier()
+        clf._train(TRAIN_FILE, feature='text', label='label', model_path=os.path.join(tmp, 'model.pkl'))
+
+        with PredictionCache(os.path.join(tmp, 'cache.sqlite')) as cache:
+            with timer(times, 'warm'):
+                clf._predict_labels(previous, cache)
+
+        with timer(times, 'nocache'):
+            expected = clf._predict_labels(rescrape)
+        with PredictionCache(os.path.join(tmp, 'cache.sqlite')) as cache:
+            with timer(times, 'cached'):
+                got = clf._predict_labels(rescrape, cache)
+            stats = cache.stats()
+
+    print(f"Previous run: {len(previous):,} comments, re-scrape: {len(rescrape):,} "
+          f"({len(rescrape) - len(previous):,} new)")
+    print(f"Cold cache fill:        {times['warm']:.2f}s")
+    print(f"Re-scrape without cache: {times['nocache']:.2f}s")
+    print(f"Re-scrape with cache:    {times['cached']:.2f}s "
+          f"(hit rate {stats['hit_rate'] * 100:.1f}%, {stats['size']:,} entries)")
+    print(f"Identical labels: {np.array_equal(expected, got)}")
+
+
+if __name__ == "__main__":
+    main()
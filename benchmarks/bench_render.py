@@ -0,0 +1,58 @@
+"""
+Benchmark: headless report rendering, one process vs a render pool
+Writes N result files (data/test1.csv as Text/Label), renders a PNG report
+for each in this process and then with render_reports() on a process pool,
+and reports per-figure token-count / draw+save times and total wall time.
+
+Usage:
+    python -m benchmarks.bench_render --files 8 --workers 4
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import TEST_FILE, timer
+from reports.Visualize import _CloudKeyword, render_reports, report_path_for
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--files', type=int, default=8, help='result files to render')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--format', default='png', choices=('png', 'svg', 'pdf'))
+    args = parser.parse_args()
+
+    df = pd.read_csv(TEST_FILE).rename(columns={'text': 'Text', 'label': 'Label'})
+    times = {}
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        files = []
+        for i in range(args.files):
+            path = os.path.join(tmp, f"test_results_{i}.csv")
+            df.sample(frac=1.0, random_state=i).to_csv(path, index=False)
+            files.append(path)
+
+        cloud = _CloudKeyword()
+        with timer(times, 'serial'):
+            serial = [cloud.keyword(result_file=path, show=False,
+                                    save_path=report_path_for(path, os.path.join(tmp, 'serial'), args.format))
+                      for path in files]
+        with timer(times, 'pool'):
+            pooled = render_reports(files, os.path.join(tmp, 'pool'), args.format, n_workers=args.workers)
+
+    print(f"{args.files} reports ({len(df):,} rows each, {args.format})")
+    for name, runs in (('in-process', serial), (f"pool x{args.workers}", pooled)):
+        count = np.array([r['count_seconds'] for r in runs if r and r['path']])
+        render = np.array([r['render_seconds'] for r in runs if r and r['path']])
+        key = 'serial' if name == 'in-process' else 'pool'
+        print(f"{name:<12} total {times[key]:6.2f}s   per figure: count {count.mean():.2f}s, "
+              f"draw+save {render.mean():.2f}s (max {render.max():.2f}s), ok {len(render)}/{args.files}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: one-Chrome-per-URL scraping vs ScrapeScheduler with a driver pool
+Scrapes N copies of the local fixture benchmarks/fixtures/youtube_comments.html
+(file:// URL, no network needed) and reports wall time and comments/sec.
+Requires Chrome + chromedriver on the machine.
+
+Usage:
+    python -m benchmarks.bench_scrape_scheduler --videos 8 --drivers 1 2 4
+"""
+
+import argparse
+import contextlib
+import io
+from pathlib import Path
+
+from benchmarks._common import timer
+from modules.ScrapeScheduler import ScrapeScheduler
+from modules.YoutubeCommentScraper import YoutubeCommentScraper
+
+FIXTURE = Path(__file__).parent / "fixtures" / "youtube_comments.html"
+
+
+def _sequential(urls, scroll_time):
+    """Previous behaviour: a brand-new Chrome for every video"""
+    total = 0
+    for url in urls:
+        with YoutubeCommentScraper() as scraper:
+            scraper._get_url(url)
+            scraper._scroll(scroll_time)
+            total += len(scraper.extract_comments())
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--videos', type=int, default=8)
+    parser.add_argument('--drivers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--scroll-time', type=int, default=1)
+    args = parser.parse_args()
+
+    # Distinct URLs for the same fixture page
+    urls = [f"{FIXTURE.resolve().as_uri()}?video={i}" for i in range(args.videos)]
+    times = {}
+
+    with timer(times, 'sequential'), contextlib.redirect_stdout(io.StringIO()):
+        total = _sequential(urls, args.scroll_time)
+    print(f"{'mode':<16}{'seconds':>10}{'comments/s':>12}")
+    print(f"{'new driver/URL':<16}{times['sequential']:>10.2f}{total / times['sequential']:>12.1f}")
+
+    for n in args.drivers:
+        scheduler = ScrapeScheduler(max_drivers=n, scroll_time=args.scroll_time)
+        with timer(times, n), contextlib.redirect_stdout(io.StringIO()):
+            total = sum(len(comments or []) for _, comments in scheduler.scrape_many(urls))
+        print(f"{f'pool of {n}':<16}{times[n]:>10.2f}{total / times[n]:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
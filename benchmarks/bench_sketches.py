@@ -0,0 +1,130 @@
+"""
+Benchmark: exact vs sketched result statistics, with error-bound checks
+Builds ResultStatistics and SketchedResultStatistics over data/train_clean.csv
+(optionally replicated), reports time, peak Python memory and serialized
+size, and checks the documented bounds of modules.Sketches against the exact
+counts: HyperLogLog within 3 standard errors, Count-Min never under and at
+most e / width * N over (allowing exp(-depth) of terms to miss), every exact
+top-k term per label found, and merge / save-load reproducing the sketch.
+
+Usage:
+    python -m benchmarks.bench_sketches --factor 1 --top-k 20
+    python -m benchmarks.bench_sketches --check    # exit 1 if a bound is violated
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import TRAIN_FILE, replicate_csv, timer
+from modules.Sketches import SketchedResultStatistics
+from modules.Statistics import ResultStatistics
+
+
+def _measure(results: dict, key: str, func, *args):
+    tracemalloc.start()
+    with timer(results, key):
+        value = func(*args)
+    results[key + '_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return value
+
+
+def check_bounds(exact: ResultStatistics, sketch: SketchedResultStatistics, k: int) -> list:
+    """Compare a sketch with the exact aggregate; returns failure messages"""
+    failures = []
+
+    true_distinct = exact.vocabulary_size
+    error = abs(sketch.vocabulary_size - true_distinct) / true_distinct
+    limit = 3 * sketch.distinct.standard_error
+    print(f"distinct tokens: exact {true_distinct:,}, HLL {sketch.vocabulary_size:,} "
+          f"(error {error:.2%}, bound {limit:.2%})")
+    if error > limit:
+        failures.append(f"HyperLogLog error {error:.2%} > {limit:.2%}")
+
+    for label, counts in sorted(exact.term_counts.items()):
+        hitters = sketch.hitters[label]
+        cms = hitters.sketch
+        terms = list(counts)
+        truth = np.fromiter(counts.values(), dtype=np.int64, count=len(terms))
+        over = cms.estimate(terms) - truth
+        bound = cms.epsilon * cms.total
+        miss_rate = float(np.mean(over > bound))
+        found = {term for term, _ in hitters.top(len(hitters.candidates))}
+        top = [term for term, _ in counts.most_common(k)]
+        recall = sum(term in found for term in top) / len(top)
+        print(f"label {label}: N={cms.total:,} terms={len(terms):,} under={int((over < 0).sum())} "
+              f"max over={int(over.max())} (bound {bound:.1f}) over-bound rate={miss_rate:.2%} "
+              f"top-{k} recall={recall:.0%}")
+        if (over < 0).any():
+            failures.append(f"label {label}: Count-Min underestimated")
+        if miss_rate > cms.delta:
+            failures.append(f"label {label}: {miss_rate:.2%} of terms over e/width*N (delta {cms.delta:.2%})")
+        if recall < 1:
+            failures.append(f"label {label}: top-{k} recall {recall:.0%}")
+    return failures
+
+
+def check_merge_and_roundtrip(path: str, sketch: SketchedResultStatistics) -> list:
+    """Halves merged and a save/load roundtrip must give the same sketch as one pass"""
+    df = pd.read_csv(path)
+    middle = len(df) // 2
+    merged = SketchedResultStatistics().update(df.iloc[:middle]).merge(
+        SketchedResultStatistics().update(df.iloc[middle:]))
+    same_merge = (json.dumps(merged.summary(20)) == json.dumps(sketch.summary(20))
+                  and np.array_equal(merged.distinct.registers, sketch.distinct.registers))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        loaded = SketchedResultStatistics.load(sketch.save(os.path.join(tmp, 'stats.json')))
+    same_roundtrip = json.dumps(loaded.summary(20)) == json.dumps(sketch.summary(20))
+
+    print(f"merge of halves identical: {same_merge}, save/load identical: {same_roundtrip}")
+    failures = []
+    if not same_merge:
+        failures.append("merged halves differ from a single pass")
+    if not same_roundtrip:
+        failures.append("save / load changed the sketch")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--factor', type=int, default=1, help='copies of data/train_clean.csv')
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--top-k', type=int, default=20)
+    parser.add_argument('--check', action='store_true', help='exit 1 if an error bound is violated')
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'results.csv')
+        source = pd.read_csv(TRAIN_FILE).rename(columns={'text': 'Text', 'label': 'Label'})
+        source.to_csv(os.path.join(tmp, 'source.csv'), index=False)
+        n_rows = replicate_csv(os.path.join(tmp, 'source.csv'), path, args.factor)
+
+        exact = _measure(results, 'exact', ResultStatistics.from_file, path, args.chunk_size)
+        sketch = _measure(results, 'sketch', SketchedResultStatistics.from_file, path, args.chunk_size)
+
+        print(f"{n_rows:,} rows, chunk={args.chunk_size:,}")
+        print(f"{'statistics':<12}{'seconds':>10}{'peak MB':>10}{'JSON KB':>10}")
+        for key, stats in (('exact', exact), ('sketch', sketch)):
+            size = len(json.dumps(stats.to_dict(), ensure_ascii=False).encode('utf-8')) / 1e3
+            print(f"{key:<12}{results[key]:>10.2f}{results[key + '_mb']:>10.1f}{size:>10.0f}")
+
+        failures = check_bounds(exact, sketch, args.top_k)
+        failures += check_merge_and_roundtrip(path, sketch)
+
+    for failure in failures:
+        print(f"BOUND VIOLATED {failure}")
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
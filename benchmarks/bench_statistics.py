@@ -0,0 +1,70 @@
+"""
+Benchmark: whole-frame statistics vs the single-pass ResultStatistics
+The old report loaded the full result file, ran value_counts twice and
+joined every text into one string to count the vocabulary. ResultStatistics
+reads Text / Label in chunks and aggregates everything in one pass. Reports
+wall time and peak Python memory (tracemalloc) and checks the numbers agree.
+
+Usage:
+    python -m benchmarks.bench_statistics --factor 20 --chunk-size 50000
+"""
+
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks._common import TEST_FILE, replicate_csv, timer
+from modules.Statistics import ResultStatistics
+
+
+def _whole_frame(path: str) -> dict:
+    df = pd.read_csv(path, usecols=['Text', 'Label'])
+    label_counts = df['Label'].value_counts()
+    df['Label'].value_counts().sort_index()  # the donut chart's second pass
+    return {'rows': len(df), 'labels': label_counts.to_dict(),
+            'vocabulary': len(set(' '.join(df['Text'].astype(str)).split()))}
+
+
+def _single_pass(path: str, chunk_size: int) -> dict:
+    stats = ResultStatistics.from_file(path, chunk_size)
+    return {'rows': stats.rows, 'labels': dict(stats.label_counts),
+            'vocabulary': stats.vocabulary_size}
+
+
+def _measure(results: dict, key: str, func, *args):
+    tracemalloc.start()
+    with timer(results, key):
+        value = func(*args)
+    results[key + '_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--factor', type=int, default=20, help='copies of data/test1.csv')
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'source.csv')
+        pd.read_csv(TEST_FILE).rename(columns={'text': 'Text', 'label': 'Label'}).to_csv(source, index=False)
+        path = os.path.join(tmp, 'test_results.csv')
+        n_rows = replicate_csv(source, path, args.factor)
+
+        whole = _measure(results, 'whole', _whole_frame, path)
+        single = _measure(results, 'single', _single_pass, path, args.chunk_size)
+
+    print(f"{n_rows:,} rows, chunk={args.chunk_size:,}")
+    print(f"{'path':<22}{'seconds':>10}{'peak MB':>10}")
+    print(f"{'whole frame':<22}{results['whole']:>10.2f}{results['whole_mb']:>10.1f}")
+    print(f"{'single pass':<22}{results['single']:>10.2f}{results['single_mb']:>10.1f}")
+    print(f"Same rows, labels and vocabulary: {whole == single}")
+
+
+if __name__ == "__main__":
+    main()
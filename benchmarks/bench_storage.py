@@ -0,0 +1,81 @@
+"""
+Benchmark: CSV vs Parquet vs Arrow IPC for result datasets
+Writes a synthetic Text/Label/Sentiment corpus (texts sampled from
+data/train_clean.csv) chunk by chunk in every storage format, then reports
+file size, write time, full read time and Label-only read time (what a
+downstream aggregation needs), and checks every format reads back the same.
+
+Usage:
+    python -m benchmarks.bench_storage --rows 10000000 --chunk-size 1000000
+"""
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import TRAIN_FILE, timer
+from modules.AIModel import SentimentClassifier
+from modules.Storage import FORMATS, Storage, read_table
+
+
+def _synthetic_chunks(n_rows: int, chunk_size: int, seed: int = 0):
+    """Yield result-shaped DataFrames with texts sampled from the training corpus"""
+    texts = pd.read_csv(TRAIN_FILE)['text'].dropna().astype(str).to_numpy(dtype=object)
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, chunk_size):
+        size = min(chunk_size, n_rows - start)
+        labels = rng.integers(0, 3, size)
+        yield pd.DataFrame({
+            'Text': texts[rng.integers(0, len(texts), size)],
+            'Label': labels,
+            'Sentiment': np.array(list(SentimentClassifier.LABEL_MAP.values()), dtype=object)[labels],
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    parser.add_argument('--formats', nargs='+', default=list(FORMATS), choices=FORMATS)
+    args = parser.parse_args()
+
+    results = {}
+    label_sums = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in args.formats:
+            storage = Storage(fmt)
+            path = os.path.join(tmp, f"results{storage.extension}")
+            times = {}
+            with timer(times, 'write'):
+                with storage.writer(path, SentimentClassifier.RESULT_CATEGORIES) as writer:
+                    for chunk in _synthetic_chunks(args.rows, args.chunk_size):
+                        writer.write(chunk)
+            with timer(times, 'read'):
+                df = read_table(path)
+            n_read = len(df)
+            del df
+            with timer(times, 'read_label'):
+                labels = read_table(path, columns=['Label'])['Label']
+            label_sums[fmt] = (n_read, int(labels.astype(int).sum()))
+            del labels
+            times['mb'] = os.path.getsize(path) / 1e6
+            results[fmt] = times
+            print(f"  {fmt}: done")
+
+    base = results.get('csv')
+    print(f"\n{args.rows:,} rows")
+    print(f"{'format':<10}{'MB':>10}{'write s':>10}{'read s':>10}{'Label s':>10}"
+          + (f"{'size x':>9}{'read x':>9}" if base else ''))
+    for fmt, r in results.items():
+        line = f"{fmt:<10}{r['mb']:>10.1f}{r['write']:>10.2f}{r['read']:>10.2f}{r['read_label']:>10.2f}"
+        if base:
+            line += f"{base['mb'] / r['mb']:>9.1f}{base['read'] / r['read']:>9.1f}"
+        print(line)
+    print(f"Same rows and labels in every format: {len(set(label_sums.values())) == 1}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark: tokenization cache on a repeated visualization run
+Segments data/test1.csv with ViTokenizer directly, then through a
+TokenizationCache twice (cold, then warm as on the next run over the same
+comments), checking every path returns the same segmented texts.
+
+Usage:
+    python -m benchmarks.bench_tokenization_cache --factor 3
+"""
+
+import argparse
+import os
+import tempfile
+
+import pandas as pd
+from pyvi import ViTokenizer
+
+from benchmarks._common import TEST_FILE, timer
+from modules.Cache import TokenizationCache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--factor', type=int, default=3, help='times to replicate test1.csv')
+    args = parser.parse_args()
+
+    texts = pd.read_csv(TEST_FILE)['text'].astype(str).tolist() * args.factor
+
+    times = {}
+    with timer(times, 'direct'):
+        expected = [ViTokenizer.tokenize(text) for text in texts]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'tokens.sqlite')
+        with TokenizationCache(path) as cache, timer(times, 'cold'):
+            cold = cache.tokenize_many(texts)
+        with TokenizationCache(path) as cache:
+            with timer(times, 'warm'):
+                warm = cache.tokenize_many(texts)
+            stats = cache.stats()
+
+    print(f"{len(texts):,} comments ({len(set(texts)):,} distinct)")
+    print(f"ViTokenizer per row:  {times['direct']:.2f}s")
+    print(f"Cache, cold:          {times['cold']:.2f}s")
+    print(f"Cache, warm:          {times['warm']:.2f}s (hit rate {stats['hit_rate'] * 100:.1f}%)")
+    print(f"Identical output: {expected == cold == warm}")
+
+
+if __name__ == "__main__":
+    main()
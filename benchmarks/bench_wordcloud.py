@@ -0,0 +1,71 @@
+"""
+Benchmark: word-cloud input, joined-string path vs token-frequency path
+The old path tokenizes every row, joins the corpus into one string and lets
+WordCloud.generate re-tokenize it; the frequency path counts tokens chunk by
+chunk (optionally on a process pool) and feeds generate_from_frequencies.
+Reports wall time and peak Python memory (tracemalloc, main process) and
+checks both paths produce the same word frequencies.
+
+Usage:
+    python -m benchmarks.bench_wordcloud --factor 10 --chunk-size 20000 --workers 4
+"""
+
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+import pandas as pd
+from pyvi import ViTokenizer
+from wordcloud import WordCloud
+
+from benchmarks._common import TEST_FILE, replicate_csv, timer
+from reports.Visualize import _CloudKeyword
+
+
+def _joined_frequencies(path: str, stopwords: set) -> dict:
+    """The previous keyword() path: whole file, one joined string, WordCloud tokenizes"""
+    df = pd.read_csv(path, usecols=['Text', 'Label'])
+    text = " ".join(ViTokenizer.tokenize(t) for t in df['Text'].astype(str))
+    return WordCloud(stopwords=stopwords, collocations=False).process_text(text)
+
+
+def _measure(results: dict, key: str, func, *args):
+    tracemalloc.start()
+    with timer(results, key):
+        value = func(*args)
+    results[key + '_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--factor', type=int, default=10, help='copies of data/test1.csv')
+    parser.add_argument('--chunk-size', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    cloud = _CloudKeyword()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'source.csv')
+        pd.read_csv(TEST_FILE).rename(columns={'text': 'Text', 'label': 'Label'}).to_csv(source, index=False)
+        path = os.path.join(tmp, 'test_results.csv')
+        n_rows = replicate_csv(source, path, args.factor)
+
+        joined = _measure(results, 'joined', _joined_frequencies, path, cloud.stopwords_set)
+        serial = _measure(results, 'serial', cloud.token_frequencies, path, args.chunk_size)
+        parallel = _measure(results, 'parallel', cloud.token_frequencies, path, args.chunk_size,
+                            args.workers)
+
+    print(f"\n{n_rows:,} rows, chunk={args.chunk_size:,}")
+    print(f"{'path':<22}{'seconds':>10}{'peak MB':>10}")
+    for key, name in (('joined', 'joined + generate'), ('serial', 'frequencies'),
+                      ('parallel', f"frequencies x{args.workers}")):
+        print(f"{name:<22}{results[key]:>10.2f}{results[key + '_mb']:>10.1f}")
+    print(f"Same frequencies: {dict(joined) == dict(serial['frequencies']) == dict(parallel['frequencies'])}")
+
+
+if __name__ == "__main__":
+    main()
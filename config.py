@@ -11,18 +11,22 @@ DATA_DIR = BASE_DIR / "data"
 RESULT_DIR = BASE_DIR / "result"
 MODULES_DIR = BASE_DIR / "modules"
 REPORTS_DIR = BASE_DIR / "reports"
+RUNS_DIR = DATA_DIR / "runs"  # run manifests (artifacts produced by each run)
 
 # Model paths
 MODEL_FILE = MODULES_DIR / "model.pkl"
+MODEL_ARTIFACT_DIR = MODULES_DIR / "model_artifact"  # memory-mapped format
 STOPWORDS_FILE = DATA_DIR / "stopwords.txt"
 
 # ==================== SCRAPER SETTINGS ====================
 SCRAPER = {
     "headless": True,
     "window_size": "1920,1080",
-    "scroll_time": 30,
-    "scroll_delay_min": 2,
-    "scroll_delay_max": 4,
+    "scroll_time": 30,           # Maximum scroll steps
+    "scroll_deadline": 120,      # Total scroll time budget (seconds)
+    "scroll_idle_timeout": 6,    # No new comments + no spinner for this long = end
+    "streaming": False,          # Extract + append to CSV after every scroll step
+    "prune_dom": True,           # Streaming: remove extracted comment nodes from the page
     "wait_timeout": 15,
 }
 
@@ -31,12 +35,50 @@ DATA_PROCESSING = {
     "text_column": "comment",
     "output_encoding": "utf-8-sig",
     "timestamp_format": "%Y-%m-%d_%H-%M-%S",
+    "storage_format": "csv",  # csv | parquet | arrow (columnar formats need pyarrow)
+    "chunk_size": 50000,  # Rows per chunk for streaming predict / parallel cleaning
 }
 
 # ==================== MODEL SETTINGS ====================
 MODEL = {
     "alpha": 1.0,  # Laplace smoothing for MultinomialNB
     "min_df": 1,   # Minimum document frequency for CountVectorizer
+    "featurizer": "count",  # "count" (learned vocabulary) or "hashing" (stateless)
+    "n_features": 2 ** 14,  # Hash buckets when featurizer == "hashing"
+    "tokenized": False,     # Word-segment texts with ViTokenizer before vectorizing (new models)
+}
+
+# Prediction cache: skip re-scoring comments seen in earlier runs.
+# With the plain CountVectorizer + NB model a lookup costs about as much as
+# scoring; enable it for costlier featurizers or heavily overlapping scrapes.
+PREDICTION_CACHE = {
+    "enabled": False,
+    "path": DATA_DIR / "prediction_cache.sqlite",
+    "max_entries": 1_000_000,  # LRU eviction beyond this
+}
+
+# Tokenization cache: ViTokenizer output per distinct cleaned comment, shared by
+# the word cloud and tokenized models across runs.
+TOKENIZATION_CACHE = {
+    "enabled": True,
+    "path": DATA_DIR / "tokenization_cache.sqlite",
+    "max_entries": 1_000_000,  # LRU eviction beyond this
+}
+
+# Comment index: (video id, author, normalized content) of every comment
+# already written, so re-scrapes of a video emit only new comments and the
+# raw / clean / result files grow with new data only.
+DEDUP_INDEX = {
+    "enabled": True,
+    "path": DATA_DIR / "comment_index.sqlite",
+    "max_entries": 5_000_000,  # LRU eviction beyond this (comments no longer on the page go first)
+}
+
+# Trend store: per-run, per-video label counts appended when a run finishes,
+# queried as time series without re-reading old result files.
+TREND_STORE = {
+    "enabled": True,
+    "path": DATA_DIR / "trends.sqlite",
 }
 
 # Label mapping
@@ -55,6 +97,8 @@ VISUALIZATION = {
     "max_words": 150,
     "hspace": 0.3,
     "wspace": 0.3,
+    "show": True,            # False: render headless (Agg) and save reports instead of plt.show
+    "image_format": "png",   # png | svg | pdf for saved reports
 }
 
 # Color palette
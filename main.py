@@ -2,61 +2,173 @@
 Social Media Listen Tool - Main Entry Point
 Automated YouTube comment analysis pipeline:
 Scrape → Clean → Sentiment Analysis → Visualization
+
+Usage:
+    python main.py run https://www.youtube.com/watch?v=VIDEO_ID
+    python main.py scrape --urls-file urls.txt --workers 3
+    python main.py clean --all-pending --workers 4 --format parquet
+    python main.py predict data/clean_comments_VIDEO_ID.csv --workers 4
+    python main.py visualize --save-dir reports/figures
+    python main.py stats result/test_results_*.csv --workers 4 --output stats.json
+    python main.py trend --video VIDEO_ID --window D --save result/trend.png
+    python main.py train data/train_clean.csv --test data/test1.csv
 """
 
-from modules.YoutubeCommentScraper import YoutubeCommentScraper
-from modules.Cleaner import Cleaner
-from modules.AIModel import SentimentClassifier
-from reports.Visualize import _CloudKeyword
-from config import DATA_DIR, SCRAPER, DATA_PROCESSING
-from utils import setup_logger, get_timestamp, ensure_dir_exists
+import argparse
+import os
+import sys
+from typing import Optional
+
+from config import (DATA_DIR, RESULT_DIR, RUNS_DIR, MODEL_FILE, STOPWORDS_FILE, SCRAPER,
+                    DATA_PROCESSING, MODEL, PREDICTION_CACHE, TOKENIZATION_CACHE, DEDUP_INDEX,
+                    TREND_STORE, VISUALIZATION, SENTIMENT_LABELS)
+from modules.RunManifest import RunManifest
+from utils import setup_logger, get_timestamp, ensure_dir_exists, read_list_file
+
+# Stage modules (selenium, sklearn, matplotlib/wordcloud/pyvi, pandas) are
+# imported on first use, so a run that only cleans or predicts never pays
+# for the scraper or the visualizer.
+
+
+def open_token_cache():
+    """TokenizationCache from config, or None when disabled"""
+    if not TOKENIZATION_CACHE["enabled"]:
+        return None
+    from modules.Cache import TokenizationCache
+    return TokenizationCache(TOKENIZATION_CACHE["path"],
+                             max_entries=TOKENIZATION_CACHE["max_entries"])
+
+
+def open_comment_index(enabled: bool = None):
+    """CommentIndex from config (scrapes emit only unseen comments), or None when disabled"""
+    if enabled is None:
+        enabled = DEDUP_INDEX["enabled"]
+    if not enabled:
+        return None
+    from modules.Cache import CommentIndex
+    return CommentIndex(DEDUP_INDEX["path"], max_entries=DEDUP_INDEX["max_entries"])
 
 
 class SocialMediaListenTool:
     """
     Main orchestrator for YouTube sentiment analysis pipeline
+    Components are built on first access (see the properties below).
     """
     
-    def __init__(self, url: str):
+    def __init__(self, url: str = None):
         """
         Initialize the tool with YouTube URL
         
         Args:
-            url: YouTube video URL to analyze
+            url: YouTube video URL to analyze (only needed to scrape / run)
         """
         self.url = url
         self.logger = setup_logger(__name__)
         
-        # Initialize components
-        self.scraper = YoutubeCommentScraper(headless=SCRAPER["headless"])
-        self.cleaner = Cleaner()
-        self.model = SentimentClassifier()
-        self.visualizer = _CloudKeyword()
+        # Components, created lazily
+        self._scraper = None
+        self._cleaner = None
+        self._model = None
+        self._visualizer = None
+        self._storage = None
+        
+        # Artifacts of the current run; stages read their input from here
+        # instead of searching data/ and result/ for the newest file
+        self.manifest = None
         
         # Ensure directories exist
         ensure_dir_exists(str(DATA_DIR))
         ensure_dir_exists("result")
     
-    def scrape_comments(self, scroll_time: int = None) -> bool:
+    @property
+    def scraper(self):
+        if self._scraper is None:
+            from modules.YoutubeCommentScraper import YoutubeCommentScraper
+            self._scraper = YoutubeCommentScraper(headless=SCRAPER["headless"])
+        return self._scraper
+    
+    @property
+    def cleaner(self):
+        if self._cleaner is None:
+            from modules.Cleaner import Cleaner
+            self._cleaner = Cleaner()
+        return self._cleaner
+    
+    @property
+    def model(self):
+        if self._model is None:
+            from modules.AIModel import SentimentClassifier
+            self._model = SentimentClassifier(featurizer=MODEL["featurizer"],
+                                              n_features=MODEL["n_features"],
+                                              tokenized=MODEL["tokenized"])
+        return self._model
+    
+    @property
+    def visualizer(self):
+        if self._visualizer is None:
+            from reports.Visualize import _CloudKeyword
+            self._visualizer = _CloudKeyword()
+        return self._visualizer
+    
+    @property
+    def storage(self):
+        if self._storage is None:
+            from modules.Storage import Storage
+            self._storage = Storage(DATA_PROCESSING["storage_format"])
+        return self._storage
+    
+    def scrape_comments(self, scroll_time: int = None, streaming: bool = None,
+                        dedup: bool = None) -> Optional[bool]:
         """
         Scrape YouTube comments
         
         Args:
             scroll_time: Number of scroll iterations (default from config)
+            streaming: Extract and append new comments after every scroll
+                       step instead of once at the end (default from config)
+            dedup: Write only comments not written by an earlier scrape of
+                   this video (default from config)
             
         Returns:
-            True if successful, False otherwise
+            True if comments were written, None if every scraped comment was
+            already written by an earlier scrape (nothing to do), False on failure
         """
         if scroll_time is None:
             scroll_time = SCRAPER["scroll_time"]
+        if streaming is None:
+            streaming = SCRAPER["streaming"]
         
         self.logger.info(f"🔄 Starting comment scraping from: {self.url}")
+        raw_path = str(DATA_DIR / "raw_comments.csv")
+        if self.manifest is not None:
+            raw_path = str(DATA_DIR / f"raw_comments_{self.manifest.video_id}.csv")
         
+        self.scraper.dedup_index = open_comment_index(dedup)
         try:
             self.scraper._get_url(self.url)
-            self.scraper._scroll(scroll_time)
-            comments = self.scraper.extract_comments()
-            self.scraper._save_to_csv(comments)
+            if streaming:
+                path = self.scraper.stream_to_csv(
+                    output_path=raw_path,
+                    scroll_time=scroll_time,
+                    deadline=SCRAPER["scroll_deadline"],
+                    idle_timeout=SCRAPER["scroll_idle_timeout"],
+                    prune=SCRAPER["prune_dom"]
+                )
+            else:
+                self.scraper._scroll(scroll_time,
+                                     deadline=SCRAPER["scroll_deadline"],
+                                     idle_timeout=SCRAPER["scroll_idle_timeout"])
+                comments = self.scraper.extract_comments()
+                path = self.scraper._save_to_csv(comments, raw_path)
+            
+            if path is None:
+                if self._nothing_new():
+                    self.logger.info("ℹ️  No new comments since the last scrape")
+                    return None
+                self.logger.warning("⚠️  No comments scraped")
+                return False
+            if self.manifest is not None:
+                self.manifest.record("raw", path)
             
             self.logger.info("✅ Comment scraping completed successfully")
             return True
@@ -64,43 +176,92 @@ class SocialMediaListenTool:
         except Exception as e:
             self.logger.error(f"❌ Error during scraping: {e}")
             return False
+        finally:
+            if self.scraper.dedup_index is not None:
+                self.scraper.dedup_index.close()
+                self.scraper.dedup_index = None
     
-    def clean_data(self) -> bool:
+    def _nothing_new(self) -> bool:
+        """True if the last scrape found comments but the dedup index had seen all of them"""
+        stats = self.scraper.dedup_stats
+        return stats['new'] == 0 and stats['skipped'] > 0
+    
+    def clean_data(self, all_pending: bool = False, n_workers: int = None,
+                   input_path: str = None) -> bool:
         """
         Clean scraped comment data
         
+        Args:
+            all_pending: Clean every raw file without a cleaned counterpart
+                         (backfill, in parallel) instead of only the newest one
+            n_workers: Worker processes for all_pending mode (default: CPU count)
+            input_path: Raw file to clean (default: this run's raw file, else
+                        the newest raw_comments file)
+        
         Returns:
             True if successful, False otherwise
         """
         self.logger.info("🧹 Starting data cleaning process...")
         
         try:
-            df = self.cleaner.process_csv(
-                folder_path=str(DATA_DIR),
-                text_column_name=DATA_PROCESSING["text_column"]
-            )
+            if all_pending:
+                written = self.cleaner.clean_pending(
+                    folder_path=str(DATA_DIR),
+                    text_column_name=DATA_PROCESSING["text_column"],
+                    n_workers=n_workers,
+                    chunk_size=DATA_PROCESSING["chunk_size"],
+                    storage_format=self.storage.fmt
+                )
+                self.logger.info(f"✅ Cleaned {len(written)} pending file(s)")
+                return True
+            
+            raw_path = input_path
+            if raw_path is None and self.manifest is not None:
+                raw_path = self.manifest.get("raw")
+            if raw_path is not None:
+                df = self.cleaner.process_file(
+                    raw_path,
+                    text_column_name=DATA_PROCESSING["text_column"]
+                )
+            else:
+                df = self.cleaner.process_csv(
+                    folder_path=str(DATA_DIR),
+                    text_column_name=DATA_PROCESSING["text_column"]
+                )
             
             if df is None or df.empty:
                 self.logger.warning("⚠️  No data to clean")
                 return False
             
-            # Save cleaned data
-            timestamp = get_timestamp()
-            output_path = DATA_DIR / f"clean_comments_{timestamp}.csv"
-            df.to_csv(output_path, index=False, 
-                     encoding=DATA_PROCESSING["output_encoding"])
+            # Save cleaned data (raw_comments<suffix> -> clean_comments<suffix>)
+            if raw_path is not None:
+                output_path = self.cleaner.clean_path_for(raw_path, str(DATA_DIR), self.storage.fmt)
+            else:
+                timestamp = get_timestamp()
+                output_path = DATA_DIR / f"clean_comments_{timestamp}{self.storage.extension}"
+            self.storage.write(df, output_path)
+            if self.manifest is not None:
+                self.manifest.record("clean", str(output_path))
             
-            self.logger.info(f"✅ Cleaned data saved: {output_path.name}")
+            self.logger.info(f"✅ Cleaned data saved: {os.path.basename(output_path)}")
             return True
             
         except Exception as e:
             self.logger.error(f"❌ Error during cleaning: {e}")
             return False
     
-    def run_model(self) -> bool:
+    def run_model(self, streaming: bool = False, n_workers: int = 1,
+                  input_path: str = None, model_path: str = None) -> bool:
         """
         Run sentiment analysis model
         
+        Args:
+            streaming: Predict chunk by chunk (flat memory for huge files)
+            n_workers: Worker processes for scoring (> 1 enables parallel mode)
+            input_path: Clean file to score (default: this run's clean file,
+                        else the newest clean_comments file)
+            model_path: Saved model / artifact directory (default: modules/model.pkl)
+            
         Returns:
             True if successful, False otherwise
         """
@@ -108,16 +269,65 @@ class SocialMediaListenTool:
         
         try:
             # Load model
-            if not self.model._loadModel():
+            load_args = (model_path,) if model_path else ()
+            if not self.model._loadModel(*load_args):
                 self.logger.error("❌ Failed to load model")
                 return False
             
-            # Predict (auto-finds latest clean file)
-            result = self.model.predict()
+            # Predict the given / this run's clean file (or auto-find the latest one)
+            data = input_path
+            if data is None and self.manifest is not None:
+                data = self.manifest.get("clean")
+            output_path = None
+            if data is not None:
+                name, _ = os.path.splitext(os.path.basename(data))
+                if name.startswith("clean_comments"):
+                    name = "test_results" + name[len("clean_comments"):]
+                else:
+                    name = f"test_results_{name}"
+                output_path = str(RESULT_DIR / f"{name}{self.storage.extension}")
+            
+            if n_workers > 1:
+                predict_args = {'model_path': model_path} if model_path else {}
+                if TOKENIZATION_CACHE["enabled"]:
+                    predict_args['token_cache_path'] = str(TOKENIZATION_CACHE["path"])
+                result = self.model.predict_parallel(
+                    data,
+                    n_workers=n_workers,
+                    chunk_size=DATA_PROCESSING["chunk_size"],
+                    output_path=output_path,
+                    storage=self.storage,
+                    **predict_args
+                )
+            else:
+                cache = None
+                if PREDICTION_CACHE["enabled"]:
+                    from modules.Cache import PredictionCache
+                    cache = PredictionCache(PREDICTION_CACHE["path"],
+                                            max_entries=PREDICTION_CACHE["max_entries"])
+                if self.model.tokenized:
+                    self.model.token_cache = open_token_cache()
+                try:
+                    if streaming:
+                        result = self.model.predict_stream(
+                            data, chunk_size=DATA_PROCESSING["chunk_size"], cache=cache,
+                            output_path=output_path, storage=self.storage
+                        )
+                    else:
+                        result = self.model.predict(data, cache=cache, output_path=output_path,
+                                                    storage=self.storage)
+                finally:
+                    if cache is not None:
+                        cache.close()
+                    if self.model.token_cache is not None:
+                        self.model.token_cache.close()
+                        self.model.token_cache = None
             
             if result is None:
                 self.logger.error("❌ Prediction failed")
                 return False
+            if self.manifest is not None and output_path is not None:
+                self.manifest.record("result", output_path)
             
             self.logger.info("✅ Sentiment analysis completed")
             return True
@@ -126,61 +336,582 @@ class SocialMediaListenTool:
             self.logger.error(f"❌ Error during prediction: {e}")
             return False
     
-    def visualize_results(self) -> bool:
+    def visualize_results(self, result_file: str = None, save_path: str = None,
+                          n_workers: int = 1, show: bool = None) -> bool:
         """
         Generate visualization from analysis results
         
+        Args:
+            result_file: Result file to chart (default: this run's result, else the newest)
+            save_path: Also save the figure here (.png / .svg)
+            n_workers: Worker processes for word-cloud tokenization
+            show: Open the figure in a window (default from config); without a
+                  window the report is rendered headless and always saved
+                  (default: result/<result name>.<image_format>)
+        
         Returns:
             True if successful, False otherwise
         """
+        if show is None:
+            show = VISUALIZATION["show"]
         self.logger.info("📊 Generating visualizations...")
         
         try:
-            self.visualizer.keyword()
-            self.logger.info("✅ Visualization completed")
+            if result_file is None and self.manifest is not None:
+                result_file = self.manifest.get("result")
+            if save_path is None and not show:
+                from reports.Visualize import report_path_for
+                result_file = result_file or self.visualizer._find_latest_result(str(RESULT_DIR))
+                if result_file is None:
+                    return False
+                save_path = report_path_for(result_file, str(RESULT_DIR), VISUALIZATION["image_format"])
+            
+            token_cache = open_token_cache()
+            try:
+                timing = self.visualizer.keyword(result_file=result_file, save_path=save_path,
+                                                 chunk_size=DATA_PROCESSING["chunk_size"],
+                                                 n_workers=n_workers, cache=token_cache, show=show)
+            finally:
+                if token_cache is not None:
+                    token_cache.close()
+            if timing is None:
+                self.logger.error("❌ Visualization failed")
+                return False
+            if self.manifest is not None and save_path is not None:
+                self.manifest.record("figure", str(save_path))
+            
+            self.logger.info(f"✅ Visualization completed (render {timing['render_seconds']:.2f}s)")
             return True
             
         except Exception as e:
             self.logger.error(f"❌ Error during visualization: {e}")
             return False
     
-    def run(self) -> None:
+    def record_trend(self) -> bool:
+        """
+        Append this run's per-label counts to the trend store
+
+        Returns:
+            True if recorded (or the store is disabled), False otherwise
+        """
+        if not TREND_STORE["enabled"]:
+            return True
+        result_file = self.manifest.get("result") if self.manifest is not None else None
+        if result_file is None:
+            self.logger.warning("⚠️ No result recorded for this run, trend not updated")
+            return False
+
+        from modules.TrendStore import TrendStore
+        try:
+            with TrendStore(TREND_STORE["path"]) as store:
+                counts = store.record_result(self.manifest.run_id, self.manifest.video_id, result_file,
+                                             recorded=self.manifest.created,
+                                             chunk_size=DATA_PROCESSING["chunk_size"])
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not update trend store: {e}")
+            return False
+        self.logger.info(f"📈 Trend updated ({sum(counts.values()):,} comments)")
+        return True
+
+    def run_overlapped(self, queue_size: int = 8, dedup: bool = None) -> bool:
+        """
+        Execute the pipeline with overlapping stages: comments are cleaned and
+        scored while scraping is still scrolling (bounded queues between
+        stages), then visualized
+        
+        Args:
+            queue_size: Maximum batches buffered between two stages
+            dedup: Process only comments unseen in earlier scrapes (default from config)
+        
+        Returns:
+            True if every stage succeeded
+        """
+        self.logger.info("="*60)
+        self.logger.info("🚀 SOCIAL MEDIA LISTEN TOOL - OVERLAPPED PIPELINE STARTED")
+        self.logger.info("="*60)
+        self.manifest = RunManifest.create(RUNS_DIR, self.url)
+        self.logger.info(f"📒 Run: {self.manifest.run_id}")
+        
+        if not self.model._loadModel():
+            self.logger.error("Pipeline stopped: Failed to load model")
+            return False
+        
+        from modules.Pipeline import StreamingPipeline
+        
+        cache_factory = None
+        if PREDICTION_CACHE["enabled"]:
+            from modules.Cache import PredictionCache
+            cache_factory = lambda: PredictionCache(PREDICTION_CACHE["path"],
+                                                    max_entries=PREDICTION_CACHE["max_entries"])
+        
+        pipeline = StreamingPipeline(
+            self.scraper, self.cleaner, self.model,
+            data_dir=DATA_DIR, result_dir=RESULT_DIR, queue_size=queue_size,
+            text_column=DATA_PROCESSING["text_column"], cache_factory=cache_factory,
+            storage=self.storage
+        )
+        
+        if self.model.tokenized:
+            # Shared with the predict stage thread (calls are serialized)
+            self.model.token_cache = open_token_cache()
+        # Used by the scrape stage thread only
+        self.scraper.dedup_index = open_comment_index(dedup)
+        try:
+            self.scraper._get_url(self.url)
+            outputs = pipeline.run(
+                scroll_time=SCRAPER["scroll_time"],
+                deadline=SCRAPER["scroll_deadline"],
+                idle_timeout=SCRAPER["scroll_idle_timeout"],
+                prune=SCRAPER["prune_dom"],
+                file_tag=self.manifest.video_id
+            )
+        except Exception as e:
+            self.logger.error(f"Pipeline stopped: {e}")
+            return False
+        finally:
+            if self.model.token_cache is not None:
+                self.model.token_cache.close()
+                self.model.token_cache = None
+            if self.scraper.dedup_index is not None:
+                self.scraper.dedup_index.close()
+                self.scraper.dedup_index = None
+        
+        for kind in ("raw", "clean", "result"):
+            self.manifest.record(kind, outputs[kind])
+        
+        if outputs['result'] is None:
+            if outputs['raw'] is None and self._nothing_new():
+                self.logger.info("ℹ️  No new comments since the last scrape, nothing to do")
+                return True
+            self.logger.error("Pipeline stopped: No comments were scored")
+            return False
+        
+        self.record_trend()
+        
+        if not self.visualize_results():
+            self.logger.error("Pipeline stopped: Visualization failed")
+            return False
+        
+        self.logger.info("="*60)
+        self.logger.info("🎉 PIPELINE COMPLETED SUCCESSFULLY!")
+        self.logger.info("="*60)
+        return True
+    
+    def run(self, overlapped: bool = False, n_workers: int = 1, streaming: bool = False,
+            dedup: bool = None) -> bool:
         """
         Execute complete pipeline: Scrape → Clean → Analyze → Visualize
+        
+        Args:
+            overlapped: Run scrape/clean/predict concurrently (see run_overlapped)
+                        instead of one stage after another via files
+            n_workers: Worker processes for scoring
+            streaming: Predict chunk by chunk
+            dedup: Process only comments unseen in earlier scrapes (default from config)
+        
+        Returns:
+            True if every stage succeeded
         """
+        if overlapped:
+            return self.run_overlapped(dedup=dedup)
+        
         self.logger.info("="*60)
         self.logger.info("🚀 SOCIAL MEDIA LISTEN TOOL - PIPELINE STARTED")
         self.logger.info("="*60)
+        self.manifest = RunManifest.create(RUNS_DIR, self.url)
+        self.logger.info(f"📒 Run: {self.manifest.run_id}")
         
         # Step 1: Scrape
-        if not self.scrape_comments():
+        scraped = self.scrape_comments(dedup=dedup)
+        if scraped is None:
+            self.logger.info("ℹ️  No new comments since the last scrape, nothing to do")
+            return True
+        if not scraped:
             self.logger.error("Pipeline stopped: Scraping failed")
-            return
+            return False
         
         # Step 2: Clean
         if not self.clean_data():
             self.logger.error("Pipeline stopped: Data cleaning failed")
-            return
+            return False
         
         # Step 3: Model
-        if not self.run_model():
+        if not self.run_model(streaming=streaming, n_workers=n_workers):
             self.logger.error("Pipeline stopped: Model prediction failed")
-            return
+            return False
+        
+        # Trend history is best effort: a failure is logged, the run goes on
+        self.record_trend()
         
         # Step 4: Visualize
         if not self.visualize_results():
             self.logger.error("Pipeline stopped: Visualization failed")
-            return
+            return False
         
         self.logger.info("="*60)
         self.logger.info("🎉 PIPELINE COMPLETED SUCCESSFULLY!")
         self.logger.info("="*60)
+        return True
 
 
-if __name__ == "__main__":
-    # Configure YouTube URL here
-    YOUTUBE_URL = 'https://www.youtube.com/watch?v=zSNgmQx-QqU&list=RDzSNgmQx-QqU&start_radio=1'
+
+# ==================== COMMAND LINE ====================
+
+def _entries(args, attr: str, file_attr: str) -> list:
+    """Positional entries plus the ones listed in the --*-file option"""
+    entries = list(getattr(args, attr) or [])
+    list_file = getattr(args, file_attr, None)
+    if list_file:
+        entries.extend(read_list_file(list_file))
+    return list(dict.fromkeys(entries))
+
+
+def _cmd_scrape(args) -> bool:
+    urls = _entries(args, 'urls', 'urls_file')
+    if not urls:
+        print("❌ Cần ít nhất một URL (đối số hoặc --urls-file)")
+        return False
+    scroll_time = args.scroll_time or SCRAPER["scroll_time"]
+    
+    if len(urls) > 1 and args.workers > 1:
+        # One shared driver pool, videos scraped concurrently
+        from modules.ScrapeScheduler import ScrapeScheduler
+        index = open_comment_index(False if args.no_dedup else None)
+        try:
+            scheduler = ScrapeScheduler(max_drivers=args.workers, headless=SCRAPER["headless"],
+                                        scroll_time=scroll_time, deadline=SCRAPER["scroll_deadline"],
+                                        idle_timeout=SCRAPER["scroll_idle_timeout"], dedup_index=index)
+            written = scheduler.scrape_many_to_csv(urls, output_dir=str(DATA_DIR))
+        finally:
+            if index is not None:
+                index.close()
+        # Videos without new comments are a successful no-op
+        return len(written) + len(scheduler.unchanged) == len(urls)
     
-    # Run pipeline
-    tool = SocialMediaListenTool(YOUTUBE_URL)
-    tool.run()
+    ok = True
+    for url in urls:
+        tool = SocialMediaListenTool(url)
+        tool.manifest = RunManifest.create(RUNS_DIR, url)
+        try:
+            scraped = tool.scrape_comments(scroll_time=scroll_time, streaming=args.streaming or None,
+                                           dedup=False if args.no_dedup else None)
+            ok = scraped is not False and ok  # None = no new comments, not a failure
+        finally:
+            if tool._scraper is not None:
+                tool.scraper.close()
+    return ok
+
+
+def _cmd_clean(args) -> bool:
+    inputs = _entries(args, 'inputs', 'inputs_file')
+    tool = SocialMediaListenTool()
+    if not inputs:
+        return tool.clean_data(all_pending=args.all_pending, n_workers=args.workers)
+    if len(inputs) == 1 and args.workers <= 1:
+        return tool.clean_data(input_path=inputs[0])
+    
+    pairs = [(path, tool.cleaner.clean_path_for(path, str(DATA_DIR), tool.storage.fmt))
+             for path in inputs]
+    written = tool.cleaner.clean_files(pairs, text_column_name=DATA_PROCESSING["text_column"],
+                                       n_workers=args.workers,
+                                       chunk_size=DATA_PROCESSING["chunk_size"],
+                                       storage_format=tool.storage.fmt)
+    return len(written) == len(pairs)
+
+
+def _cmd_predict(args) -> bool:
+    inputs = _entries(args, 'inputs', 'inputs_file') or [None]
+    tool = SocialMediaListenTool()
+    ok = True
+    for path in inputs:
+        ok = tool.run_model(streaming=args.streaming, n_workers=args.workers,
+                            input_path=path, model_path=args.model) and ok
+    return ok
+
+
+def _cmd_visualize(args) -> bool:
+    inputs = _entries(args, 'inputs', 'inputs_file')
+    image_format = args.image_format or VISUALIZATION["image_format"]
+    
+    if args.save_dir and len(inputs) > 1 and args.workers > 1:
+        # Headless reports rendered on a process pool, one per result file
+        from reports.Visualize import render_reports
+        token_cache_path = str(TOKENIZATION_CACHE["path"]) if TOKENIZATION_CACHE["enabled"] else None
+        reports = render_reports(inputs, args.save_dir, image_format, n_workers=args.workers,
+                                 max_words=VISUALIZATION["max_words"],
+                                 chunk_size=DATA_PROCESSING["chunk_size"],
+                                 token_cache_path=token_cache_path)
+        return all(report['path'] for report in reports)
+    
+    tool = SocialMediaListenTool()
+    ok = True
+    for path in inputs or [None]:
+        save_path = None
+        if args.save_dir:
+            from reports.Visualize import report_path_for
+            save_path = report_path_for(path or f"report_{get_timestamp()}", args.save_dir, image_format)
+        # Reports saved to a folder are rendered headless; otherwise config decides
+        ok = tool.visualize_results(result_file=path, save_path=save_path, n_workers=args.workers,
+                                    show=False if args.save_dir else None) and ok
+    return ok
+
+
+def _cmd_stats(args) -> bool:
+    from modules.Storage import glob_tables
+    if args.approximate:
+        from modules.Sketches import SketchedResultStatistics as ResultStatistics
+    else:
+        from modules.Statistics import ResultStatistics
+    
+    inputs = _entries(args, 'inputs', 'inputs_file')
+    if not inputs:
+        inputs = sorted(glob_tables(str(RESULT_DIR), 'test_results*'))
+    if not inputs:
+        print("❌ Không tìm thấy file kết quả")
+        return False
+    
+    # Saved aggregates (.json) are merged as they are; result files are read once
+    saved = [path for path in inputs if path.endswith('.json')]
+    tables = [path for path in inputs if not path.endswith('.json')]
+    try:
+        stats = ResultStatistics.from_files(tables, chunk_size=DATA_PROCESSING["chunk_size"],
+                                            n_workers=args.workers)
+        for path in saved:
+            stats.merge(ResultStatistics.load(path))
+    except Exception as e:
+        print(f"❌ Lỗi khi tính thống kê: {e}")
+        return False
+    
+    stopwords = set()
+    if os.path.exists(STOPWORDS_FILE):
+        with open(STOPWORDS_FILE, 'r', encoding='utf-8') as f:
+            stopwords = set(f.read().splitlines())
+    summary = stats.summary(args.top_k, stopwords, SENTIMENT_LABELS)
+    
+    approx = '~' if args.approximate else ''
+    print(f"📊 {len(inputs)} file, {summary['rows']:,} bình luận, {summary['tokens']:,} từ, "
+          f"{approx}{summary['vocabulary']:,} từ khác nhau")
+    length = summary['length']
+    if length['mean'] is not None:
+        print(f"   Độ dài: TB {length['mean']:.1f} ± {length['std']:.1f} từ, "
+              f"min {length['min']}, max {length['max']}")
+    for name, label in summary['labels'].items():
+        terms = ', '.join(f"{term} ({count:,})" for term, count in label['top_terms'])
+        print(f"   {name:<9} {label['count']:>10,} ({label['share'] * 100:5.1f}%)  {terms}")
+    
+    if args.output:
+        stats.save(args.output)
+        print(f"💾 Đã lưu thống kê tại: {args.output}")
+    return True
+
+
+def _cmd_trend(args) -> bool:
+    from modules.TrendStore import TrendStore
+    
+    with TrendStore(TREND_STORE["path"]) as store:
+        if args.backfill:
+            # Runs recorded before the store existed (or with it disabled)
+            added = 0
+            for name in sorted(os.listdir(str(RUNS_DIR))) if os.path.isdir(str(RUNS_DIR)) else []:
+                if not name.endswith('.json') or name.startswith('latest'):
+                    continue
+                manifest = RunManifest.load(str(RUNS_DIR / name))
+                result_file = manifest.get("result")
+                if result_file is None or not os.path.exists(result_file) or store.has_run(manifest.run_id):
+                    continue
+                store.record_result(manifest.run_id, manifest.video_id, result_file,
+                                    recorded=manifest.created, chunk_size=DATA_PROCESSING["chunk_size"])
+                added += 1
+            print(f"📒 Đã thêm {added} run vào lịch sử xu hướng")
+        
+        # Deduplicated runs hold only new comments; otherwise each run is a full snapshot
+        how = args.how or ('sum' if DEDUP_INDEX["enabled"] else 'last')
+        series = store.series(video_id=args.video, window=args.window, how=how,
+                              since=args.since, until=args.until, label_names=SENTIMENT_LABELS)
+    
+    if series.empty:
+        print("❌ Chưa có dữ liệu xu hướng")
+        return False
+    
+    names = [name for name in SENTIMENT_LABELS.values() if name in series]
+    print(f"📈 {len(series)} mốc thời gian, {int(series['runs'].sum())} run"
+          + (f" (video {args.video})" if args.video else ""))
+    print(f"   {'thời gian':<20}{'bình luận':>10}" + ''.join(f"{name:>10}" for name in names))
+    for recorded, row in series.iterrows():
+        shares = ''.join(f"{row[f'share_{name}'] * 100:>9.1f}%" for name in names)
+        print(f"   {recorded:%Y-%m-%d %H:%M}    {int(row['total']):>10,}{shares}")
+    
+    if args.save or args.show:
+        from reports.Trend import plot_trend
+        title = f"Xu hướng cảm xúc - {args.video}" if args.video else "Xu hướng cảm xúc"
+        return plot_trend(series, SENTIMENT_LABELS, title=title, save_path=args.save, show=args.show)
+    return True
+
+
+def _cmd_train(args) -> bool:
+    from modules.AIModel import SentimentClassifier
+    model = SentimentClassifier(featurizer=args.featurizer or MODEL["featurizer"],
+                                n_features=args.n_features or MODEL["n_features"],
+                                tokenized=args.tokenized or MODEL["tokenized"])
+    # Fold new rows into the saved model (a fresh model if there is none yet)
+    if args.incremental and os.path.exists(args.model):
+        model._loadModel(args.model)
+    if model.tokenized:
+        model.token_cache = open_token_cache()
+    
+    try:
+        if args.incremental:
+            ok = model.train_incremental(args.data, feature=args.feature, label=args.label,
+                                         chunk_size=DATA_PROCESSING["chunk_size"],
+                                         model_path=args.model)
+        else:
+            model._train(args.data, feature=args.feature, label=args.label, model_path=args.model)
+            ok = model.is_trained
+        
+        if ok and args.test:
+            model.evaluate_fast(args.test)
+        return bool(ok)
+    finally:
+        if model.token_cache is not None:
+            model.token_cache.close()
+
+
+def _cmd_run(args) -> bool:
+    urls = _entries(args, 'urls', 'urls_file')
+    if not urls:
+        print("❌ Cần ít nhất một URL (đối số hoặc --urls-file)")
+        return False
+    ok = True
+    for url in urls:
+        tool = SocialMediaListenTool(url)
+        try:
+            ok = tool.run(overlapped=args.overlapped, n_workers=args.workers,
+                          streaming=args.streaming, dedup=False if args.no_dedup else None) and ok
+        finally:
+            if tool._scraper is not None:
+                tool.scraper.close()
+    return ok
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser with one subcommand per pipeline stage"""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--format', choices=('csv', 'parquet', 'arrow'),
+                        help=f"output storage format (default: {DATA_PROCESSING['storage_format']})")
+    common.add_argument('--chunk-size', type=int,
+                        help=f"rows per chunk (default: {DATA_PROCESSING['chunk_size']})")
+    common.add_argument('--workers', type=int, default=1,
+                        help='worker processes / browsers (default: 1)')
+    
+    parser = argparse.ArgumentParser(
+        description="Social Media Listen Tool - YouTube comment sentiment analysis")
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    
+    scrape = commands.add_parser('scrape', parents=[common], help='scrape comments of one or more videos')
+    scrape.add_argument('urls', nargs='*', help='video URLs')
+    scrape.add_argument('--urls-file', help='file with one URL per line')
+    scrape.add_argument('--scroll-time', type=int, help='maximum scroll steps per video')
+    scrape.add_argument('--streaming', action='store_true', help='append comments after every scroll step')
+    scrape.add_argument('--no-dedup', action='store_true',
+                        help='write every comment, also those written by earlier scrapes')
+    scrape.set_defaults(handler=_cmd_scrape)
+    
+    clean = commands.add_parser('clean', parents=[common], help='clean raw comment files')
+    clean.add_argument('inputs', nargs='*', help='raw files (default: the newest raw_comments file)')
+    clean.add_argument('--inputs-file', help='file with one input path per line')
+    clean.add_argument('--all-pending', action='store_true',
+                       help='clean every raw file in data/ without a clean counterpart')
+    clean.set_defaults(handler=_cmd_clean)
+    
+    predict = commands.add_parser('predict', parents=[common], help='score clean comment files')
+    predict.add_argument('inputs', nargs='*', help='clean files (default: the newest clean_comments file)')
+    predict.add_argument('--inputs-file', help='file with one input path per line')
+    predict.add_argument('--streaming', action='store_true', help='predict chunk by chunk')
+    predict.add_argument('--model', help='model.pkl or artifact directory')
+    predict.set_defaults(handler=_cmd_predict)
+    
+    visualize = commands.add_parser('visualize', parents=[common], help='chart result files')
+    visualize.add_argument('inputs', nargs='*', help='result files (default: the newest test_results file)')
+    visualize.add_argument('--inputs-file', help='file with one input path per line')
+    visualize.add_argument('--save-dir', help='save each report as <save-dir>/<result name>.<image format>'
+                                              ' (headless, no window)')
+    visualize.add_argument('--image-format', choices=('png', 'svg', 'pdf'),
+                           help=f"report format (default: {VISUALIZATION['image_format']})")
+    visualize.set_defaults(handler=_cmd_visualize)
+    
+    stats = commands.add_parser('stats', parents=[common],
+                                help='aggregate statistics over result files in one pass')
+    stats.add_argument('inputs', nargs='*',
+                       help='result files or saved aggregates (.json) (default: every result file)')
+    stats.add_argument('--inputs-file', help='file with one input path per line')
+    stats.add_argument('--top-k', type=int, default=10, help='top terms per sentiment (default: 10)')
+    stats.add_argument('--output', help='save the merged aggregate as JSON (mergeable later)')
+    stats.add_argument('--approximate', action='store_true',
+                       help='fixed-memory sketches (HyperLogLog / Count-Min) for vocabulary and top terms')
+    stats.set_defaults(handler=_cmd_stats)
+    
+    trend = commands.add_parser('trend', parents=[common],
+                                help='sentiment over time from the trend store (no result files re-read)')
+    trend.add_argument('--video', help='only this video id (default: all videos)')
+    trend.add_argument('--window', help="bucket runs by period: h, D, W or M (default: one point per run)")
+    trend.add_argument('--how', choices=('last', 'sum'),
+                       help="several runs of a video in one window: keep the latest snapshot "
+                            "or add them up (default: sum when scrapes are deduplicated, else last)")
+    trend.add_argument('--since', help='first date or timestamp, ISO format (e.g. 2024-05-01)')
+    trend.add_argument('--until', help='last date (whole day included) or timestamp, ISO format')
+    trend.add_argument('--backfill', action='store_true',
+                       help='first add every recorded run (data/runs) missing from the store')
+    trend.add_argument('--save', help='save the trend chart here (.png / .svg / .pdf)')
+    trend.add_argument('--show', action='store_true', help='open the trend chart in a window')
+    trend.set_defaults(handler=_cmd_trend)
+    
+    train = commands.add_parser('train', parents=[common], help='train the sentiment model')
+    train.add_argument('data', help='labeled training file')
+    train.add_argument('--feature', default='text', help='text column (default: text)')
+    train.add_argument('--label', default='label', help='label column (default: label)')
+    train.add_argument('--incremental', action='store_true',
+                       help='fold the data into the saved model chunk by chunk')
+    train.add_argument('--model', default=str(MODEL_FILE), help='where to save the model')
+    train.add_argument('--featurizer', choices=('count', 'hashing'))
+    train.add_argument('--n-features', type=int, help='hash buckets for the hashing featurizer')
+    train.add_argument('--tokenized', action='store_true',
+                       help='word-segment texts with ViTokenizer before vectorizing')
+    train.add_argument('--test', help='evaluate on this labeled file after training')
+    train.set_defaults(handler=_cmd_train)
+    
+    run = commands.add_parser('run', parents=[common], help='full pipeline for one or more videos')
+    run.add_argument('urls', nargs='*', help='video URLs')
+    run.add_argument('--urls-file', help='file with one URL per line')
+    run.add_argument('--overlapped', action='store_true', help='scrape, clean and predict concurrently')
+    run.add_argument('--streaming', action='store_true', help='predict chunk by chunk')
+    run.add_argument('--no-dedup', action='store_true',
+                     help='process every comment, also those seen in earlier scrapes')
+    run.set_defaults(handler=_cmd_run)
+    
+    return parser
+
+
+def main(argv: list = None) -> int:
+    """
+    Command line entry point
+    
+    Returns:
+        Exit code: 0 if every input succeeded, 1 otherwise
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 1
+    
+    # Command line overrides of config.py settings
+    if args.format:
+        DATA_PROCESSING["storage_format"] = args.format
+    if args.chunk_size:
+        DATA_PROCESSING["chunk_size"] = args.chunk_size
+    
+    return 0 if args.handler(args) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
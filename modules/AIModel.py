@@ -1,33 +1,93 @@
 import pandas as pd
+import numpy as np
 import json
 from datetime import datetime
-from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
 from sklearn.naive_bayes import MultinomialNB
-from sklearn.metrics import accuracy_score
 import pickle
+import hashlib
 import os
-import glob
-from typing import Optional
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional, Union
+
+from modules.Storage import Storage, glob_tables, iter_tables, read_table
+
+DEFAULT_MODEL_PATH = 'modules/model.pkl'
+DEFAULT_ARTIFACT_DIR = 'modules/model_artifact'
+FEATURIZERS = ('count', 'hashing')
 
 class SentimentClassifier:
     """
     Sentiment Analysis model using sklearn's MultinomialNB
     Supports 3 classes: Positive (0), Neutral (1), Negative (2)
+    
+    Featurizers:
+        'count'   - CountVectorizer with a learned vocabulary (default)
+        'hashing' - stateless HashingVectorizer with n_features buckets;
+                    nothing to learn or pickle, usable out-of-core
+    
+    With tokenized=True texts are word-segmented by ViTokenizer before
+    vectorizing, so Vietnamese compounds ("sản_phẩm") become single features.
+    Set token_cache to a TokenizationCache to segment each distinct text once.
     """
     
-    def __init__(self):
+    LABEL_MAP = {0: 'Positive', 1: 'Neutral', 2: 'Negative'}
+    # Fixed value set of the Sentiment column (dictionary-encoded in columnar storage)
+    RESULT_CATEGORIES = {'Sentiment': list(LABEL_MAP.values()) + ['Unknown']}
+    
+    def __init__(self, featurizer: str = 'count', n_features: int = 2 ** 14,
+                 tokenized: bool = False):
+        if featurizer not in FEATURIZERS:
+            raise ValueError(f"featurizer phải là một trong {FEATURIZERS}, nhận được '{featurizer}'")
+        
         # sklearn components
-        self.vectorizer = CountVectorizer(
-            lowercase=True,
-            token_pattern=r'\b\w+\b',  # word tokenization
-            min_df=1,  # minimum document frequency
-        )
+        self.featurizer = featurizer
+        self.n_features = n_features
+        self.vectorizer = self._build_vectorizer()
         self.model = MultinomialNB(alpha=1.0)  # Laplace smoothing
+        self.tokenized = tokenized
+        self.token_cache = None  # optional modules.Cache.TokenizationCache (not saved)
         
         # Training statistics
         self.is_trained = False
         self.n_samples = 0
         self.class_distribution = {}
+        # Identifies the saved/loaded weights; keys the prediction cache
+        self.model_version: Optional[str] = None
+    
+    def _build_vectorizer(self):
+        """Create an unfitted vectorizer for the selected featurizer"""
+        if self.featurizer == 'hashing':
+            return HashingVectorizer(
+                lowercase=True,
+                token_pattern=r'\b\w+\b',  # same tokenization as CountVectorizer
+                n_features=self.n_features,
+                alternate_sign=False,  # MultinomialNB needs non-negative counts
+                norm=None,  # raw term counts
+            )
+        return CountVectorizer(
+            lowercase=True,
+            token_pattern=r'\b\w+\b',  # word tokenization
+            min_df=1,  # minimum document frequency
+        )
+    
+    def _vocabulary_size(self) -> int:
+        """Number of feature columns (learned vocabulary or hash buckets)"""
+        if self.featurizer == 'hashing':
+            return self.n_features
+        return len(getattr(self.vectorizer, 'vocabulary_', {}))
+    
+    def _segment(self, texts):
+        """Word-segment texts in tokenized mode (through token_cache if set); else unchanged"""
+        if not self.tokenized:
+            return texts
+        texts = [text if isinstance(text, str) else '' for text in texts]
+        if self.token_cache is not None:
+            return self.token_cache.tokenize_many(texts)
+        from pyvi import ViTokenizer
+        return [ViTokenizer.tokenize(text) for text in texts]
     
     def _token(self, text):
         """Simple tokenizer for compatibility"""
@@ -35,36 +95,43 @@ class SentimentClassifier:
             return text.lower().split()
         return []
     
-    def _train(self, data):
+    def _train(self, data, feature: Optional[str] = None, label: Optional[str] = None,
+               model_path: str = DEFAULT_MODEL_PATH):
         """
         Train the model with data from CSV file
         
         Args:
             data (str): Path to training CSV file
+            feature: Text column name (prompted interactively if None)
+            label: Label column name (prompted interactively if None)
+            model_path: Where the trained model is saved
         """
         print(f'Đang học từ {data}')
-        feature = str(input("Nhập feature:"))
-        label = str(input("Nhập label: "))
+        if feature is None:
+            feature = str(input("Nhập feature:"))
+        if label is None:
+            label = str(input("Nhập label: "))
         
         try:
             # Load data
             df = pd.read_csv(data)
             
             # Convert label to int and filter invalid values
-            df['label'] = pd.to_numeric(df['label'], errors='coerce')
-            df = df.dropna(subset=['label'])
-            df['label'] = df['label'].astype(int)
+            df[label] = pd.to_numeric(df[label], errors='coerce')
+            df = df.dropna(subset=[label])
+            df[label] = df[label].astype(int)
             
             X = df[feature]
             Y = df[label]
             
             # Vectorize text data
             print("Đang vectorize dữ liệu...")
-            X_vectorized = self.vectorizer.fit_transform(X)
+            X_vectorized = self.vectorizer.fit_transform(self._segment(X))
             
             # Train model
             print("Đang train model...")
             self.model.fit(X_vectorized, Y)
+            self.model_version = None
             
             # Update statistics
             self.is_trained = True
@@ -77,11 +144,14 @@ class SentimentClassifier:
             for label_id, count in sorted(self.class_distribution.items()):
                 label_name = {0: 'Positive', 1: 'Neutral', 2: 'Negative'}.get(label_id, 'Unknown')
                 print(f"  + {label_name} ({label_id}): {count} câu")
-            print(f"- Vocabulary size: {len(self.vectorizer.vocabulary_)}")
+            if self.featurizer == 'hashing':
+                print(f"- Hashing features: {self.n_features:,}")
+            else:
+                print(f"- Vocabulary size: {self._vocabulary_size()}")
             
             # Save model
-            self._saveModel()
-            print("- Xem kết quả chi tiết tại file model.pkl")
+            self._saveModel(model_path)
+            print(f"- Xem kết quả chi tiết tại file {model_path}")
             
         except FileNotFoundError:
             print("Không tìm thấy file")
@@ -90,35 +160,177 @@ class SentimentClassifier:
             import traceback
             traceback.print_exc()
     
-    def _saveModel(self):
+    def train_incremental(self, source: Union[str, Iterable[pd.DataFrame]],
+                          feature: str = 'text', label: str = 'label',
+                          chunk_size: int = 50000, checkpoint_every: int = 1,
+                          model_path: str = DEFAULT_MODEL_PATH) -> bool:
+        """
+        Non-interactive incremental training with MultinomialNB.partial_fit
+        Folds new labeled data into the current model chunk by chunk, so the
+        cost is proportional to the new data only. Call _loadModel() first
+        to continue from a saved model.
+        
+        With the 'count' featurizer the vocabulary must already be fitted
+        (by _train) and unseen words are ignored; the 'hashing' featurizer
+        can start from scratch and picks up new words.
+        
+        Args:
+            source: Path to labeled CSV file, or iterable of DataFrame chunks
+            feature: Text column name
+            label: Label column name
+            chunk_size: Rows per chunk when reading a CSV file
+            checkpoint_every: Save the model every N chunks (0 = only at the end)
+            model_path: Where checkpoints are written
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if self.featurizer == 'count' and not hasattr(self.vectorizer, 'vocabulary_'):
+            print("❌ Featurizer 'count' chưa có vocabulary. Hãy _train() hoặc _loadModel() trước, "
+                  "hoặc dùng featurizer='hashing'.")
+            return False
+        
+        try:
+            # Arrays loaded from a memory-mapped artifact are read-only
+            for attr in ('feature_count_', 'class_count_'):
+                counts = getattr(self.model, attr, None)
+                if counts is not None and not counts.flags.writeable:
+                    setattr(self.model, attr, np.array(counts))
+            
+            if isinstance(source, str):
+                print(f"Đang học tăng dần từ {source} (chunk={chunk_size:,})")
+                chunks = pd.read_csv(source, chunksize=chunk_size)
+            else:
+                print("Đang học tăng dần từ iterator")
+                chunks = source
+            
+            classes = sorted(self.LABEL_MAP)
+            n_new = 0
+            unsaved = False
+            start = time.perf_counter()
+            
+            for i, chunk in enumerate(chunks):
+                # Same label cleanup as _train
+                chunk = chunk.copy()
+                chunk[label] = pd.to_numeric(chunk[label], errors='coerce')
+                chunk = chunk.dropna(subset=[label, feature])
+                if chunk.empty:
+                    continue
+                Y = chunk[label].astype(int)
+                
+                X_vectorized = self.vectorizer.transform(self._segment(chunk[feature]))
+                self.model.partial_fit(X_vectorized, Y, classes=classes)
+                self.model_version = None
+                
+                # Update statistics
+                self.is_trained = True
+                self.n_samples += len(Y)
+                for label_id, count in Y.value_counts().items():
+                    self.class_distribution[int(label_id)] = self.class_distribution.get(int(label_id), 0) + int(count)
+                n_new += len(Y)
+                print(f"  + Chunk {i + 1}: +{len(Y):,} câu (tổng {self.n_samples:,})")
+                
+                unsaved = True
+                if checkpoint_every and (i + 1) % checkpoint_every == 0:
+                    self._saveModel(model_path)
+                    unsaved = False
+            
+            if n_new == 0:
+                print("⚠️  Không có dữ liệu hợp lệ để học")
+                return False
+            
+            if unsaved:
+                self._saveModel(model_path)
+            print(f">> Hoàn tất! Đã học thêm {n_new:,} câu trong {time.perf_counter() - start:.2f}s")
+            return True
+            
+        except FileNotFoundError:
+            print("Không tìm thấy file")
+            return False
+        except Exception as e:
+            print(f"Lỗi khi huấn luyện tăng dần: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+    
+    def _saveModel(self, model_path: str = DEFAULT_MODEL_PATH):
         """Save model using pickle"""
         try:
             model_data = {
-                'vectorizer': self.vectorizer,
+                # HashingVectorizer is stateless: rebuilt from featurizer/n_features on load
+                'vectorizer': self.vectorizer if self.featurizer == 'count' else None,
+                'featurizer': self.featurizer,
+                'n_features': self.n_features,
+                'tokenized': self.tokenized,
                 'model': self.model,
                 'is_trained': self.is_trained,
                 'n_samples': self.n_samples,
                 'class_distribution': self.class_distribution
             }
             
-            with open('modules/model.pkl', 'wb') as f:
-                pickle.dump(model_data, f)
+            payload = pickle.dumps(model_data)
             
-            print("Đã lưu model vào modules/model.pkl")
+            # Write to a temp file first so a crash never leaves a half-written model
+            tmp_path = f"{model_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, model_path)
+            self.model_version = hashlib.sha256(payload).hexdigest()[:16]
+            
+            print(f"Đã lưu model vào {model_path}")
         except Exception as e:
             print(f"Lỗi khi lưu model: {e}")
     
-    def _loadModel(self):
-        """Load model from pickle file"""
+    def _saveArtifact(self, directory: str = DEFAULT_ARTIFACT_DIR):
+        """Save model as a memory-mappable artifact directory (see ModelArtifact)"""
+        from modules.ModelArtifact import ModelArtifact
+        
         try:
-            with open('modules/model.pkl', 'rb') as f:
-                model_data = pickle.load(f)
+            header = ModelArtifact.save(self, directory)
+            self.model_version = header['checksum'][:16]
+            print(f"Đã lưu model artifact vào {directory} (checksum {header['checksum'][:12]})")
+            return True
+        except Exception as e:
+            print(f"Lỗi khi lưu model artifact: {e}")
+            return False
+    
+    def _loadModel(self, model_path: str = DEFAULT_MODEL_PATH, mmap: bool = True):
+        """
+        Load model from pickle file, or from an artifact directory
+        
+        Args:
+            model_path: model.pkl file or artifact directory
+            mmap: Memory-map artifact arrays (ignored for pickle files)
+        """
+        if os.path.isdir(model_path):
+            from modules.ModelArtifact import ModelArtifact
             
-            self.vectorizer = model_data['vectorizer']
+            try:
+                header = ModelArtifact.load(self, model_path, mmap=mmap)
+                self.model_version = header['checksum'][:16]
+                print("Đã load model artifact thành công!")
+                return True
+            except Exception as e:
+                print(f"Lỗi khi load model artifact: {e}")
+                return False
+        
+        try:
+            with open(model_path, 'rb') as f:
+                payload = f.read()
+            model_data = pickle.loads(payload)
+            
+            self.featurizer = model_data.get('featurizer', 'count')
+            self.n_features = model_data.get('n_features', self.n_features)
+            self.tokenized = model_data.get('tokenized', False)
+            if self.featurizer == 'hashing':
+                self.vectorizer = self._build_vectorizer()
+            else:
+                self.vectorizer = model_data['vectorizer']
             self.model = model_data['model']
             self.is_trained = model_data.get('is_trained', True)
             self.n_samples = model_data.get('n_samples', 0)
             self.class_distribution = model_data.get('class_distribution', {})
+            self.model_version = hashlib.sha256(payload).hexdigest()[:16]
             
             print("Đã load model thành công!")
             return True
@@ -139,8 +351,7 @@ class SentimentClassifier:
         Returns:
             Path to latest file or None if not found
         """
-        search_pattern = os.path.join(data_folder, 'clean_comments*.csv')
-        list_of_files = glob.glob(search_pattern)
+        list_of_files = glob_tables(data_folder, 'clean_comments*')
         
         if not list_of_files:
             print(f"⚠️  Không tìm thấy file clean_comments trong folder: {data_folder}")
@@ -150,7 +361,8 @@ class SentimentClassifier:
         print(f"📁 Tìm thấy file clean mới nhất: {os.path.basename(latest_file)}")
         return latest_file
     
-    def predict(self, data: Optional[str] = None, folder: str = "result"):
+    def predict(self, data: Optional[str] = None, folder: str = "result", cache=None,
+                output_path: Optional[str] = None, storage: Optional[Storage] = None):
         """
         Predict sentiment for input data
         Auto-detects latest clean_comments file if data is None
@@ -158,6 +370,9 @@ class SentimentClassifier:
         Args:
             data: Path to CSV file, list of texts, or None (auto-detect latest)
             folder: Output folder for results
+            cache: Optional PredictionCache; only cache misses are predicted
+            output_path: Exact result file (default: folder/test_results_<timestamp>.<ext>)
+            storage: Output format (default: CSV); input format follows its extension
             
         Returns:
             DataFrame with predictions or None if error
@@ -182,23 +397,18 @@ class SentimentClassifier:
                 X = data
             else:
                 print(f"📊 Đang phân tích file: {os.path.basename(data)}")
-                df = pd.read_csv(data)
+                df = read_table(data)
                 X = df.iloc[:, 0].tolist()  # First column (comment/text)
                 print(f"✅ Đã load {len(X)} dòng dữ liệu")
             
-            # Vectorize input
+            # Vectorize input + predict
             print(f"Bắt đầu dự đoán {len(X)} dòng...")
-            X_vectorized = self.vectorizer.transform(X)
-            
-            # Predict
-            predictions = self.model.predict(X_vectorized)
-            
-            # Map labels to sentiment names
-            label_map = {0: 'Positive', 1: 'Neutral', 2: 'Negative'}
+            predictions = self._predict_labels(X, cache)
+            self._print_cache_stats(cache)
             
             # Create results
             for text, pred_label in zip(X, predictions):
-                sentiment = label_map.get(pred_label, 'Unknown')
+                sentiment = self.LABEL_MAP.get(pred_label, 'Unknown')
                 results.append({
                     'Text': text,
                     'Label': int(pred_label),
@@ -207,11 +417,13 @@ class SentimentClassifier:
             
             # Save results
             result_df = pd.DataFrame(results)
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            output_path = f"{folder}/test_results_{timestamp}.csv"
+            storage = storage or Storage()
+            if output_path is None:
+                timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+                output_path = f"{folder}/test_results_{timestamp}{storage.extension}"
             
-            os.makedirs(folder, exist_ok=True)
-            result_df.to_csv(output_path, index=False, encoding='utf-8-sig')
+            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+            storage.write(result_df, output_path, self.RESULT_CATEGORIES)
             print(f">> Hoàn tất! Đã lưu kết quả dự đoán tại: {output_path}")
             
             return result_df
@@ -222,6 +434,215 @@ class SentimentClassifier:
             traceback.print_exc()
             return None
     
+    def _predict_labels(self, texts, cache=None):
+        """
+        Vectorize a batch of texts and predict their labels
+        With a PredictionCache, only texts not cached for this model_version
+        are vectorized and predicted (each distinct text once).
+        
+        Args:
+            texts: List of cleaned texts
+            cache: Optional modules.Cache.PredictionCache
+            
+        Returns:
+            Array of predicted label ids, aligned with texts
+        """
+        if cache is None or self.model_version is None:
+            X_vectorized = self.vectorizer.transform(self._segment(texts))
+            return self.model.predict(X_vectorized)
+        
+        labels = cache.get_labels(texts, self.model_version)
+        misses = list(dict.fromkeys(text for text, label in zip(texts, labels) if label is None))
+        if misses:
+            miss_labels = self.model.predict(self.vectorizer.transform(self._segment(misses)))
+            cache.put_labels(misses, miss_labels, self.model_version)
+            predicted = dict(zip(misses, miss_labels))
+            labels = [predicted[text] if label is None else label
+                      for text, label in zip(texts, labels)]
+        return np.array(labels, dtype=self.model.classes_.dtype)
+    
+    def _print_cache_stats(self, cache) -> None:
+        """Print prediction cache hit rate after a run"""
+        if cache is None:
+            return
+        if self.model_version is None:
+            print("⚠️  Model chưa được lưu/load nên không có model_version - bỏ qua cache")
+            return
+        stats = cache.stats()
+        print(f"🗄️  Cache: {stats['hits']:,} hit / {stats['misses']:,} miss "
+              f"({stats['hit_rate'] * 100:.1f}%), {stats['size']:,} mục")
+    
+    def _build_result_frame(self, texts, predictions) -> pd.DataFrame:
+        """Build a Text/Label/Sentiment DataFrame for one batch of predictions"""
+        labels = [int(label) for label in predictions]
+        return pd.DataFrame({
+            'Text': texts,
+            'Label': labels,
+            'Sentiment': [self.LABEL_MAP.get(label, 'Unknown') for label in labels],
+        })
+    
+    def predict_stream(self, data: Optional[str] = None, folder: str = "result",
+                       chunk_size: int = 50000, cache=None,
+                       output_path: Optional[str] = None,
+                       storage: Optional[Storage] = None) -> Optional[str]:
+        """
+        Streaming variant of predict for very large CSV files
+        Reads the input in chunks, predicts each chunk and appends it to the
+        output file, so memory stays flat regardless of input size.
+        Output is identical to predict().
+        
+        Args:
+            data: Path to CSV file, or None (auto-detect latest)
+            folder: Output folder for results
+            chunk_size: Number of rows read and predicted per chunk
+            cache: Optional PredictionCache; only cache misses are predicted
+            output_path: Exact result file (default: folder/test_results_<timestamp>.<ext>)
+            storage: Output format (default: CSV); input format follows its extension
+            
+        Returns:
+            Path to the result file or None if error
+        """
+        if not self.is_trained:
+            print("Mô hình chưa được huấn luyện (is_trained = False).")
+            return None
+        
+        try:
+            if data is None:
+                data = self._find_latest_clean_file()
+                if data is None:
+                    print("❌ Không thể tìm thấy file dữ liệu để dự đoán")
+                    return None
+            
+            print(f"📊 Đang phân tích file (streaming, chunk={chunk_size:,}): {os.path.basename(data)}")
+            
+            storage = storage or Storage()
+            if output_path is None:
+                timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+                output_path = f"{folder}/test_results_{timestamp}{storage.extension}"
+            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+            
+            total_rows = 0
+            start = time.perf_counter()
+            
+            # Read CSV columns as str so every chunk gets the same dtype
+            reader = iter_tables(data, chunk_size, as_str=True)
+            with storage.writer(output_path, self.RESULT_CATEGORIES) as writer:
+                for i, chunk in enumerate(reader):
+                    X = chunk.iloc[:, 0].tolist()
+                    predictions = self._predict_labels(X, cache)
+                    
+                    writer.write(self._build_result_frame(X, predictions))
+                    
+                    total_rows += len(X)
+                    elapsed = time.perf_counter() - start
+                    print(f"  + Chunk {i + 1}: {total_rows:,} dòng ({total_rows / max(elapsed, 1e-9):,.0f} dòng/s)")
+            if total_rows == 0:
+                storage.write(self._build_result_frame([], []), output_path)
+            
+            elapsed = time.perf_counter() - start
+            print(f">> Hoàn tất! {total_rows:,} dòng trong {elapsed:.2f}s "
+                  f"({total_rows / max(elapsed, 1e-9):,.0f} dòng/s)")
+            self._print_cache_stats(cache)
+            print(f">> Đã lưu kết quả dự đoán tại: {output_path}")
+            
+            return output_path
+            
+        except Exception as e:
+            print(f"Lỗi khi dự đoán (streaming): {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+    
+    def predict_parallel(self, data: Optional[str] = None, folder: str = "result",
+                         n_workers: Optional[int] = None, chunk_size: int = 50000,
+                         model_path: str = DEFAULT_MODEL_PATH,
+                         output_path: Optional[str] = None,
+                         storage: Optional[Storage] = None,
+                         token_cache_path: Optional[str] = None) -> Optional[str]:
+        """
+        Score a large CSV file across a pool of worker processes
+        Each worker loads the saved model once (from model_path) at startup;
+        only text shards and label arrays cross process boundaries.
+        Shards are written back in input order, so the output file is
+        identical to predict().
+        
+        Args:
+            data: Path to CSV file, or None (auto-detect latest)
+            folder: Output folder for results
+            n_workers: Number of worker processes (default: CPU count)
+            chunk_size: Number of rows per shard
+            model_path: Saved model loaded by every worker
+            output_path: Exact result file (default: folder/test_results_<timestamp>.<ext>)
+            storage: Output format (default: CSV); input format follows its extension
+            token_cache_path: TokenizationCache file opened by each worker
+                              (tokenized models only)
+            
+        Returns:
+            Path to the result file or None if error
+        """
+        if not self.is_trained:
+            print("Mô hình chưa được huấn luyện (is_trained = False).")
+            return None
+        
+        n_workers = n_workers or os.cpu_count() or 1
+        
+        try:
+            if data is None:
+                data = self._find_latest_clean_file()
+                if data is None:
+                    print("❌ Không thể tìm thấy file dữ liệu để dự đoán")
+                    return None
+            
+            print(f"📊 Đang phân tích file ({n_workers} workers, shard={chunk_size:,}): {os.path.basename(data)}")
+            
+            storage = storage or Storage()
+            if output_path is None:
+                timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+                output_path = f"{folder}/test_results_{timestamp}{storage.extension}"
+            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+            
+            total_rows = 0
+            start = time.perf_counter()
+            # Keep a bounded number of shards in flight so memory stays flat
+            max_pending = 2 * n_workers
+            pending = deque()
+            
+            reader = iter_tables(data, chunk_size, as_str=True)
+            with ProcessPoolExecutor(max_workers=n_workers,
+                                     initializer=_init_scoring_worker,
+                                     initargs=(model_path, token_cache_path)) as pool, \
+                    storage.writer(output_path, self.RESULT_CATEGORIES) as writer:
+                
+                def flush_oldest():
+                    nonlocal total_rows
+                    texts, future = pending.popleft()
+                    writer.write(self._build_result_frame(texts, future.result()))
+                    total_rows += len(texts)
+                
+                for chunk in reader:
+                    texts = chunk.iloc[:, 0].tolist()
+                    pending.append((texts, pool.submit(_score_shard, texts)))
+                    if len(pending) >= max_pending:
+                        flush_oldest()
+                
+                while pending:
+                    flush_oldest()
+            if total_rows == 0:
+                storage.write(self._build_result_frame([], []), output_path)
+            
+            elapsed = time.perf_counter() - start
+            print(f">> Hoàn tất! {total_rows:,} dòng trong {elapsed:.2f}s "
+                  f"({total_rows / max(elapsed, 1e-9):,.0f} dòng/s)")
+            print(f">> Đã lưu kết quả dự đoán tại: {output_path}")
+            
+            return output_path
+            
+        except Exception as e:
+            print(f"Lỗi khi dự đoán (parallel): {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+    
     def evaluate_fast(self, data_test):
         """
         Evaluate model accuracy on test dataset
@@ -251,6 +672,7 @@ class SentimentClassifier:
             y_pred = result_df['Label'].tolist()
             
             # Calculate accuracy
+            from sklearn.metrics import accuracy_score  # heavy (scipy.stats); only needed here
             accuracy = accuracy_score(y_true, y_pred)
             print(f"Accuracy: {accuracy * 100:.2f}%")
             
@@ -260,15 +682,38 @@ class SentimentClassifier:
             traceback.print_exc()
 
 
+# ==================== PARALLEL SCORING WORKERS ====================
+_worker_classifier: Optional[SentimentClassifier] = None
+
+
+def _init_scoring_worker(model_path: str, token_cache_path: Optional[str] = None) -> None:
+    """Process pool initializer: load the model (and open the token cache) once per worker"""
+    global _worker_classifier
+    _worker_classifier = SentimentClassifier()
+    if not _worker_classifier._loadModel(model_path):
+        raise RuntimeError(f"Worker không load được model: {model_path}")
+    if token_cache_path and _worker_classifier.tokenized:
+        from modules.Cache import TokenizationCache
+        _worker_classifier.token_cache = TokenizationCache(token_cache_path)
+
+
+def _score_shard(texts: list):
+    """Predict labels for one shard of texts inside a worker"""
+    return _worker_classifier._predict_labels(texts)
+
+
 if __name__ == "__main__":
-    # Initialize model
-    model = SentimentClassifier()
+    import argparse
     
-    # Train model
-    model._train("data/train_clean.csv")
+    parser = argparse.ArgumentParser(description="Train and evaluate the sentiment model")
+    parser.add_argument('data', nargs='?', default="data/train_clean.csv", help='labeled training file')
+    parser.add_argument('--feature', default='text')
+    parser.add_argument('--label', default='label')
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--test', default="data/test1.csv", help='evaluation file ("" to skip)')
+    args = parser.parse_args()
     
-    # Load model
-    model._loadModel()
-    
-    # Evaluate
-    model.evaluate_fast("data/test1.csv")
\ No newline at end of file
+    model = SentimentClassifier()
+    model._train(args.data, feature=args.feature, label=args.label, model_path=args.model)
+    if args.test and model._loadModel(args.model):
+        model.evaluate_fast(args.test)
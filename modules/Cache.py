@@ -0,0 +1,264 @@
+"""
+Persistent, size-bounded caches backed by SQLite
+Used to skip repeated work on comments seen in earlier runs.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import unicodedata
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# SQLite limits the number of bound parameters per statement
+_SQL_BATCH = 900
+
+
+class PersistentLRUCache:
+    """
+    Key/value cache stored in a SQLite file with least-recently-used eviction
+
+    Keys and values are any SQLite scalar (str, bytes, int, float). Each get/put batch advances a
+    logical clock; when the cache grows past max_entries the entries with the
+    oldest clock value are evicted. Hit/miss counters cover this instance.
+    One instance may be shared between threads (calls are serialized).
+    """
+
+    def __init__(self, path: str, max_entries: int = 1_000_000):
+        """
+        Open (or create) a cache file
+
+        Args:
+            path: SQLite file path
+            max_entries: Maximum number of entries kept
+        """
+        directory = os.path.dirname(str(path))
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent, fewer fsyncs
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key PRIMARY KEY, value, last_used INTEGER NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_last_used ON cache(last_used)")
+        self._conn.commit()
+        self._clock = self._conn.execute("SELECT COALESCE(MAX(last_used), 0) FROM cache").fetchone()[0]
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def get_many(self, keys: Iterable) -> Dict[object, object]:
+        """
+        Look up keys, marking hits as recently used
+
+        Returns:
+            Dict of found key -> value (missing keys are absent)
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            tick = self._tick()
+            for start in range(0, len(keys), _SQL_BATCH):
+                batch = keys[start:start + _SQL_BATCH]
+                placeholders = ','.join('?' * len(batch))
+                found.update(self._conn.execute(
+                    f"SELECT key, value FROM cache WHERE key IN ({placeholders})", batch
+                ).fetchall())
+                self._conn.execute(
+                    f"UPDATE cache SET last_used = ? WHERE key IN ({placeholders})", [tick, *batch]
+                )
+            self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Dict[object, object]) -> None:
+        """Insert or overwrite entries, then evict down to max_entries"""
+        if not items:
+            return
+        with self._lock:
+            tick = self._tick()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, last_used) VALUES (?, ?, ?)",
+                [(key, value, tick) for key, value in items.items()]
+            )
+            excess = self._count() - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN "
+                    "(SELECT key FROM cache ORDER BY last_used LIMIT ?)", (excess,)
+                )
+                self.evictions += excess
+            self._conn.commit()
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def stats(self) -> dict:
+        """Hit/miss counters (per distinct key looked up) for this instance plus current size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'size': len(self),
+            'max_entries': self.max_entries,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class PredictionCache(PersistentLRUCache):
+    """
+    Cache of predicted labels keyed by hash(model version, cleaned text)
+    A retrained model gets a new version, so stale labels are never returned.
+    """
+
+    @staticmethod
+    def make_key(text: str, model_version: str) -> bytes:
+        return hashlib.blake2b(f"{model_version}\0{text}".encode('utf-8'), digest_size=16).digest()
+
+    def get_labels(self, texts: List[str], model_version: str) -> List[Optional[int]]:
+        """Cached label per text, or None for misses"""
+        keys = [self.make_key(text, model_version) for text in texts]
+        found = self.get_many(keys)
+        return [found.get(key) for key in keys]
+
+    def put_labels(self, texts: List[str], labels: Iterable[int], model_version: str) -> None:
+        self.put_many({self.make_key(text, model_version): int(label)
+                       for text, label in zip(texts, labels)})
+
+
+def _vi_tokenize_batch(texts: List[str]) -> List[str]:
+    from pyvi import ViTokenizer  # imported on first miss only
+    return [ViTokenizer.tokenize(text) for text in texts]
+
+
+class TokenizationCache(PersistentLRUCache):
+    """
+    Cache of word-segmented text (ViTokenizer output) keyed by hash(cleaned text)
+    Repeated comments across runs and stages are segmented only once.
+    """
+
+    # Part of every key: a different segmenter never returns stale output
+    TOKENIZER = 'pyvi.ViTokenizer'
+
+    @classmethod
+    def make_key(cls, text: str) -> bytes:
+        return hashlib.blake2b(f"{cls.TOKENIZER}\0{text}".encode('utf-8'), digest_size=16).digest()
+
+    def tokenize_many(self, texts: List[str],
+                      tokenize: Optional[Callable[[List[str]], List[str]]] = None) -> List[str]:
+        """
+        Word-segment texts, tokenizing only cache misses (each distinct text once)
+
+        Args:
+            texts: Cleaned texts
+            tokenize: Batch tokenizer for the misses (default: ViTokenizer in
+                      this process; pass a pool-backed one to parallelize)
+
+        Returns:
+            Segmented texts, aligned with texts
+        """
+        keys = [self.make_key(text) for text in texts]
+        found = self.get_many(keys)
+        misses = list(dict.fromkeys(text for text, key in zip(texts, keys) if key not in found))
+        if misses:
+            segmented = (tokenize or _vi_tokenize_batch)(misses)
+            new = {self.make_key(text): value for text, value in zip(misses, segmented)}
+            self.put_many(new)
+            found.update(new)
+        return [found[key] for key in keys]
+
+
+class CommentIndex(PersistentLRUCache):
+    """
+    Comments already written by earlier scrapes, keyed by hash(video id,
+    author handle, normalized content), so a re-scrape writes only new comments
+
+    The scraped author field is "<handle>\\n<relative time>[ (đã chỉnh sửa)]";
+    only the handle is part of the key, so "2 giờ trước" turning into
+    "3 giờ trước" (or an edit marker appearing) does not make a comment new.
+    Content is normalized (Unicode NFC, case folding, collapsed whitespace).
+    Lookups never mark anything: callers mark_seen the keys of comments
+    only once they have been written. A comment seen again on a later scrape
+    is marked recently used, so LRU eviction only forgets comments that no
+    longer show up on the page.
+    """
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(unicodedata.normalize('NFC', str(text)).casefold().split())
+
+    @staticmethod
+    def author_handle(author: str) -> str:
+        """First line of the scraped author field (drops relative time / edit marker)"""
+        lines = str(author).strip().splitlines()
+        return lines[0].strip() if lines else ""
+
+    @classmethod
+    def make_key(cls, video_id: str, author: str, content: str) -> bytes:
+        raw = f"{video_id}\0{cls.author_handle(author)}\0{cls.normalize(content)}"
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).digest()
+
+    def filter_new(self, video_id: str, comments: List[dict], author_field: str = 'name',
+                   text_field: str = 'comment') -> Tuple[List[dict], List[bytes]]:
+        """
+        Comments not seen before (nor earlier in this list); nothing is marked
+
+        Args:
+            video_id: Video the comments belong to
+            comments: Scraped {author_field, text_field} dicts
+
+        Returns:
+            (new comments in their original order, their keys for mark_seen)
+        """
+        keys = [self.make_key(video_id, comment.get(author_field, ''), comment.get(text_field, ''))
+                for comment in comments]
+        seen = self.get_many(keys)
+        new, new_keys = [], []
+        for key, comment in zip(keys, comments):
+            if key in seen:
+                continue
+            seen[key] = None  # repeats within this list
+            new.append(comment)
+            new_keys.append(key)
+        return new, new_keys
+
+    def mark_seen(self, keys: Iterable[bytes]) -> None:
+        """Record comments as written (call after the raw file / chunk is on disk)"""
+        first_seen = datetime.now().isoformat(timespec='seconds')
+        self.put_many(dict.fromkeys(keys, first_seen))
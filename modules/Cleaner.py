@@ -3,22 +3,41 @@ import pandas as pd
 import numpy as np
 import glob
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from modules.Storage import EXTENSIONS, Storage, iter_tables, read_table
+
+# Precompiled patterns shared by the per-text and batch cleaners
+URL_PATTERN = re.compile(r'http\S+|www\.\S+')
+MENTION_PATTERN = re.compile(r'@[\w.]+')
+PUNCT_PATTERN = re.compile(r'[^\w\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Batch cleaning joins texts with a whitespace separator and runs every regex
+# once over the whole buffer. URL/mention matches never cross whitespace, and
+# "punct -> ' ' then collapse whitespace" equals "every non-word run -> ' '",
+# so the result split back per row is identical to clean_single_text.
+BATCH_SEPARATOR = '\u2029'  # paragraph separator: whitespace, never in cleaned output
+# Non-word runs except a lone ' ' (already in final form, and the most common match)
+BATCH_NON_WORD_PATTERN = re.compile(r'[^\w\u2029 ][^\w\u2029]*| [^\w\u2029]+')
+
 
 class Cleaner:
     def __init__(self):
         pass
 
     def url_clean(self, text):
-        return re.sub(r'http\S+|www\.\S+', '', text)
+        return URL_PATTERN.sub('', text)
 
     def punct_clean(self, text):
-        return re.sub(r'[^\w\s]', ' ', text)
+        return PUNCT_PATTERN.sub(' ', text)
 
     def mention_clean(self, text):
-        return re.sub(r'@[\w.]+', '', text)
+        return MENTION_PATTERN.sub('', text)
 
     def _standardize_whitespace(self, text):
-        return re.sub(r'\s+', ' ', text).strip()
+        return WHITESPACE_PATTERN.sub(' ', text).strip()
 
     def clean_single_text(self, text):
         if not isinstance(text, str): 
@@ -30,13 +49,111 @@ class Cleaner:
         text = self.punct_clean(text)
         text = self._standardize_whitespace(text)
         return text
+
+    def _clean_batch(self, texts):
+        """
+        Clean a list of texts in one fused regex pass over the joined buffer
+        Returns None if a text contains the separator (caller falls back).
+        """
+        texts = [text if isinstance(text, str) else '' for text in texts]
+        joined = BATCH_SEPARATOR.join(texts).lower()
+        if joined.count(BATCH_SEPARATOR) != len(texts) - 1:
+            return None
+
+        joined = URL_PATTERN.sub('', joined)
+        joined = MENTION_PATTERN.sub('', joined)
+        joined = BATCH_NON_WORD_PATTERN.sub(' ', joined)
+        # Each row has at most one space left at either end: strip them all at once
+        joined = joined.replace(' ' + BATCH_SEPARATOR, BATCH_SEPARATOR)
+        joined = joined.replace(BATCH_SEPARATOR + ' ', BATCH_SEPARATOR).strip(' ')
+        return joined.split(BATCH_SEPARATOR)
+
+    def clean_series(self, series, batch_size=100000):
+        """
+        Vectorized equivalent of series.apply(clean_single_text)
+        Output is byte-identical; rows are cleaned in batches of batch_size
+        so the joined buffer stays bounded.
+        """
+        values = series.tolist()
+        cleaned = []
+        for start in range(0, len(values), batch_size):
+            batch = values[start:start + batch_size]
+            result = self._clean_batch(batch)
+            if result is None:
+                result = [self.clean_single_text(text) for text in batch]
+            cleaned.extend(result)
+        return pd.Series(cleaned, index=series.index, dtype=object, name=series.name)
     
-    def process_csv(self, folder_path="data", text_column_name=None):
+    def _clean_frame(self, df, text_column_name=None, verbose=True):
         """
-        Process latest raw_comments CSV file
+        Clean one DataFrame (a whole file or a chunk of it)
         - Clean text
         - Keep only text column (drop name column)
         - Rename to 'text' for consistency
+        Every step is row-wise, so cleaning chunks and concatenating them
+        gives the same result as cleaning the whole file.
+        """
+        log = print if verbose else (lambda *args, **kwargs: None)
+
+        # Detect text column name
+        if text_column_name is None:
+            # Auto-detect: usually 'comment' or 'text'
+            if 'comment' in df.columns:
+                text_column_name = 'comment'
+            elif 'text' in df.columns:
+                text_column_name = 'text'
+            else:
+                # Use last column (usually comment is the last)
+                text_column_name = df.columns[-1]
+
+        if text_column_name not in df.columns:
+            print(f"Cảnh báo: Cột '{text_column_name}' không tồn tại trong file.")
+            return None
+
+        log(f"📝 Đang clean cột: {text_column_name}")
+
+        # Remove empty rows
+        df.replace(r'^\s*$', np.nan, regex=True, inplace=True)
+        df.replace('nan', np.nan, inplace=True)
+        df.dropna(subset=[text_column_name], inplace=True)
+
+        log(f"Số dòng sau khi xoá rỗng (NaN): {len(df)}")
+
+        # Clean text column
+        df[text_column_name] = self.clean_series(df[text_column_name])
+        df = df[df[text_column_name] != '']
+
+        # ✅ CRITICAL: Keep only text column, drop others (like 'name')
+        df = df[[text_column_name]].copy()
+
+        # ✅ Rename to 'text' for consistency
+        df.rename(columns={text_column_name: 'text'}, inplace=True)
+
+        log(f"✅ Output: {len(df)} dòng, chỉ cột 'text'")
+
+        return df
+
+    def process_file(self, file_path, text_column_name=None):
+        """
+        Clean a single raw comments CSV file
+
+        Returns:
+            Cleaned DataFrame with a single 'text' column, or None if error
+        """
+        try:
+            df = read_table(file_path, as_str=True)
+            print(f"Số dòng ban đầu: {len(df)}")
+            return self._clean_frame(df, text_column_name)
+
+        except Exception as e:
+            print(f"Lỗi khi xử lý file: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+
+    def process_csv(self, folder_path="data", text_column_name=None):
+        """
+        Process latest raw_comments CSV file (see _clean_frame)
         """
         search_pattern = os.path.join(folder_path, "raw_comments*.csv")
         
@@ -50,53 +167,172 @@ class Cleaner:
         
         print(f"--- Đang xử lý file mới nhất: {latest_file} ---")
 
-        try:
-            df = pd.read_csv(latest_file)
-            print(f"Số dòng ban đầu: {len(df)}")
-            
-            # Detect text column name
-            if text_column_name is None:
-                # Auto-detect: usually 'comment' or 'text'
-                if 'comment' in df.columns:
-                    text_column_name = 'comment'
-                elif 'text' in df.columns:
-                    text_column_name = 'text'
-                else:
-                    # Use last column (usually comment is the last)
-                    text_column_name = df.columns[-1]
-            
-            print(f"📝 Đang clean cột: {text_column_name}")
-            
-            # Remove empty rows
-            df.replace(r'^\s*$', np.nan, regex=True, inplace=True)
-            df.replace('nan', np.nan, inplace=True)
-            df.dropna(subset=[text_column_name], inplace=True)
-            
-            print(f"Số dòng sau khi xoá rỗng (NaN): {len(df)}")
-
-            # Clean text column
-            if text_column_name in df.columns:
-                df[text_column_name] = df[text_column_name].apply(self.clean_single_text)
-                df = df[df[text_column_name] != '']
+        return self.process_file(latest_file, text_column_name)
+
+    @staticmethod
+    def clean_path_for(raw_path, output_folder=None, storage_format='csv'):
+        """
+        Cleaned counterpart of a raw file: raw_comments<suffix> -> clean_comments<suffix>
+        (other names get a clean_comments_ prefix), with the storage format's extension
+        """
+        name, _ = os.path.splitext(os.path.basename(raw_path))
+        if name.startswith("raw_comments"):
+            name = "clean_comments" + name[len("raw_comments"):]
+        else:
+            name = f"clean_comments_{name}"
+        folder = output_folder or os.path.dirname(raw_path)
+        return os.path.join(folder, name + EXTENSIONS[storage_format])
+
+    def find_pending(self, folder_path="data", output_folder=None, storage_format='csv'):
+        """
+        List raw_comments files that have no cleaned counterpart yet
+        raw_comments_<stamp>.csv is cleaned into clean_comments_<stamp>.<ext>
+        (a counterpart in any storage format counts as cleaned)
+
+        Returns:
+            List of (raw_path, clean_path) tuples, oldest first
+        """
+        output_folder = output_folder or folder_path
+        pending = []
+        for raw_path in sorted(glob.glob(os.path.join(folder_path, "raw_comments*.csv"))):
+            clean_path = self.clean_path_for(raw_path, output_folder, storage_format)
+            stem = os.path.splitext(clean_path)[0]
+            if not any(os.path.exists(stem + ext) for ext in EXTENSIONS.values()):
+                pending.append((raw_path, clean_path))
+        return pending
+
+    def clean_pending(self, folder_path="data", output_folder=None, text_column_name=None,
+                      n_workers=None, chunk_size=None, storage_format='csv'):
+        """
+        Clean every pending raw_comments file on a process pool (see clean_files)
+
+        Args:
+            folder_path: Folder containing raw_comments files
+            output_folder: Folder for clean_comments files (default: folder_path)
+            text_column_name: Text column (auto-detected if None)
+            n_workers: Worker processes (default: CPU count)
+            chunk_size: Rows per chunk (None = whole file at once)
+            storage_format: Output format (csv | parquet | arrow)
+
+        Returns:
+            List of written clean_comments paths
+        """
+        pending = self.find_pending(folder_path, output_folder, storage_format)
+        if not pending:
+            print(f"✅ Không có file raw_comments nào cần clean trong '{folder_path}'")
+            return []
+
+        os.makedirs(output_folder or folder_path, exist_ok=True)
+        return self.clean_files(pending, text_column_name, n_workers, chunk_size, storage_format)
+
+    def clean_files(self, pairs, text_column_name=None, n_workers=None, chunk_size=None,
+                    storage_format='csv'):
+        """
+        Clean (raw_path, clean_path) pairs on a process pool
+        Several files are cleaned one per worker; a single file is split into
+        chunks of chunk_size rows that are cleaned in parallel.
+        Outputs are written to a temp file and renamed when complete, so
+        an interrupted run never leaves a file that looks already cleaned.
+
+        Returns:
+            List of written clean paths
+        """
+        n_workers = n_workers or os.cpu_count() or 1
+        print(f"--- Đang clean {len(pairs)} file với {n_workers} workers ---")
+
+        written = []
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            if len(pairs) == 1 and chunk_size:
+                raw_path, clean_path = pairs[0]
+                if self._clean_file_chunks_parallel(pool, n_workers, raw_path, clean_path,
+                                                    text_column_name, chunk_size, storage_format):
+                    written.append(clean_path)
             else:
-                print(f"Cảnh báo: Cột '{text_column_name}' không tồn tại trong file.")
-                return None
-            
-            # ✅ CRITICAL: Keep only text column, drop others (like 'name')
-            df = df[[text_column_name]].copy()
-            
-            # ✅ Rename to 'text' for consistency
-            df.rename(columns={text_column_name: 'text'}, inplace=True)
-            
-            print(f"✅ Output: {len(df)} dòng, chỉ cột 'text'")
-            
-            return df
+                futures = {
+                    pool.submit(_clean_file_task, raw_path, clean_path, text_column_name,
+                                chunk_size, storage_format): clean_path
+                    for raw_path, clean_path in pairs
+                }
+                for future in as_completed(futures):
+                    try:
+                        n_rows = future.result()
+                        print(f"  + {os.path.basename(futures[future])}: {n_rows} dòng")
+                        written.append(futures[future])
+                    except Exception as e:
+                        print(f"Lỗi khi clean {os.path.basename(futures[future])}: {e}")
+
+        print(f"✅ Đã clean {len(written)}/{len(pairs)} file")
+        return sorted(written)
+
+    def _clean_file_chunks_parallel(self, pool, n_workers, raw_path, clean_path,
+                                    text_column_name, chunk_size, storage_format='csv'):
+        """Clean one large file by fanning its chunks out to the pool, writing them in order"""
+        tmp_path = f"{clean_path}.tmp"
+        try:
+            n_rows = 0
+            in_flight = deque()
+            with Storage(storage_format).writer(tmp_path) as writer:
+                def write_oldest():
+                    nonlocal n_rows
+                    df = in_flight.popleft().result()
+                    if df is None:
+                        raise ValueError(f"Không clean được {raw_path}")
+                    writer.write(df)
+                    n_rows += len(df)
+
+                for chunk in iter_tables(raw_path, chunk_size, as_str=True):
+                    in_flight.append(pool.submit(_clean_chunk_task, chunk, text_column_name))
+                    # Keep a bounded number of chunks in flight so memory stays flat
+                    if len(in_flight) >= 2 * n_workers:
+                        write_oldest()
+                while in_flight:
+                    write_oldest()
+
+            if n_rows == 0:
+                Storage(storage_format).write(pd.DataFrame({'text': []}, dtype=object), tmp_path)
+            os.replace(tmp_path, clean_path)
+            print(f"  + {os.path.basename(clean_path)}: {n_rows} dòng")
+            return True
 
         except Exception as e:
-            print(f"Lỗi khi xử lý file: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+            print(f"Lỗi khi clean {raw_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+
+# ==================== PARALLEL CLEANING WORKERS ====================
+def _clean_chunk_task(df, text_column_name):
+    """Worker: clean one chunk of a raw file"""
+    return Cleaner()._clean_frame(df, text_column_name, verbose=False)
+
+
+def _clean_file_task(raw_path, clean_path, text_column_name=None, chunk_size=None,
+                     storage_format='csv'):
+    """Worker: clean one raw file (chunk by chunk if chunk_size) into clean_path"""
+    cleaner = Cleaner()
+    tmp_path = f"{clean_path}.tmp"
+    # Raw files are read as str without NaN conversion: a chunk of only
+    # digits or "NA" is cleaned exactly like the same rows in a whole-file read
+    chunks = (iter_tables(raw_path, chunk_size, as_str=True) if chunk_size
+              else [read_table(raw_path, as_str=True)])
+
+    n_rows = 0
+    try:
+        with Storage(storage_format).writer(tmp_path) as writer:
+            for chunk in chunks:
+                df = cleaner._clean_frame(chunk, text_column_name, verbose=False)
+                if df is None:
+                    raise ValueError(f"Không clean được {raw_path}")
+                writer.write(df)
+                n_rows += len(df)
+        if n_rows == 0:
+            Storage(storage_format).write(pd.DataFrame({'text': []}, dtype=object), tmp_path)
+        os.replace(tmp_path, clean_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return n_rows
 
 
 if __name__ == "__main__":
@@ -0,0 +1,306 @@
+"""
+Long-running sentiment scoring service
+Keeps one SentimentClassifier resident and serves it over local HTTP (TCP or
+a Unix socket). Concurrent requests are coalesced into micro-batches so the
+vectorizer and model run once per batch instead of once per request.
+
+Endpoints:
+    POST /predict   {"texts": [...], "clean": true}
+                    -> {"labels": [...], "sentiments": [...]}
+    GET  /metrics   request and batch latency p50/p99, throughput, batch sizes
+    GET  /health    {"status": "ok", "model_version": ...}
+
+Usage:
+    python -m modules.InferenceServer --port 8765 --max-batch 256 --max-wait-ms 0
+    python -m modules.InferenceServer --unix-socket /tmp/sentiment.sock
+"""
+
+import argparse
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+import numpy as np
+
+from modules.AIModel import DEFAULT_MODEL_PATH, SentimentClassifier
+from modules.Cleaner import Cleaner
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent scoring requests into batches
+
+    A single worker thread takes the first waiting request, then keeps
+    collecting until max_batch texts are queued or max_wait seconds have
+    passed, and scores everything with one _predict_labels call. With
+    max_wait=0 it takes only what is already queued: no added latency when
+    idle, and batches grow by themselves under load.
+    """
+
+    def __init__(self, classifier: SentimentClassifier, max_batch: int = 256,
+                 max_wait: float = 0.0, latency_window: int = 10000):
+        """
+        Args:
+            classifier: Loaded SentimentClassifier
+            max_batch: Maximum texts per model call
+            max_wait: Seconds to wait for more requests after the first one
+                      (0 = only take requests already queued)
+            latency_window: Number of recent requests kept for percentiles
+        """
+        self.classifier = classifier
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=latency_window)            # queue + model call
+        self._request_latencies = deque(maxlen=latency_window)    # whole HTTP request
+        self._batch_sizes = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._requests = 0
+        self._texts = 0
+        self._batches = 0
+
+        self._running = True
+        self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        """Queue cleaned texts for scoring; the Future resolves to a label array"""
+        future = Future()
+        self._queue.put((texts, future, time.perf_counter()))
+        return future
+
+    def predict(self, texts: List[str], timeout: Optional[float] = 30) -> np.ndarray:
+        return self.submit(texts).result(timeout)
+
+    def record_request(self, seconds: float) -> None:
+        """Record the end-to-end latency of one served request (parse, clean, score, reply)"""
+        with self._lock:
+            self._request_latencies.append(seconds)
+
+    def _collect(self) -> list:
+        """Block for one request, then gather more until the batch is full or max_wait expires"""
+        first = self._queue.get()
+        if first is None:
+            return []
+        pending = [first]
+        n_texts = len(first[0])
+        deadline = time.perf_counter() + self.max_wait
+        while n_texts < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._running = False
+                break
+            pending.append(item)
+            n_texts += len(item[0])
+        return pending
+
+    def _run(self) -> None:
+        while self._running:
+            pending = self._collect()
+            if not pending:
+                break
+
+            texts = [text for item in pending for text in item[0]]
+            try:
+                labels = self.classifier._predict_labels(texts)
+            except Exception as e:
+                for _, future, _ in pending:
+                    future.set_exception(e)
+                continue
+
+            done = time.perf_counter()
+            offset = 0
+            for item_texts, future, submitted in pending:
+                future.set_result(labels[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+            with self._lock:
+                self._batches += 1
+                self._batch_sizes.append(len(texts))
+                self._requests += len(pending)
+                self._texts += len(texts)
+                self._latencies.extend(done - submitted for _, _, submitted in pending)
+
+    def metrics(self) -> dict:
+        """
+        Latency percentiles (ms, recent window), throughput and batch sizes since start
+
+        latency_ms covers whole requests as recorded by the HTTP handler;
+        batch_latency_ms only the time from submit to the batch result
+        (queueing + model call).
+        """
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            request_latencies = np.array(self._request_latencies) * 1000
+            batch_sizes = np.array(self._batch_sizes)
+            requests, texts, batches = self._requests, self._texts, self._batches
+        uptime = time.monotonic() - self._started
+        return {
+            'uptime_seconds': uptime,
+            'requests': requests,
+            'texts': texts,
+            'batches': batches,
+            'requests_per_second': requests / uptime if uptime else 0.0,
+            'texts_per_second': texts / uptime if uptime else 0.0,
+            'latency_ms': _percentiles(request_latencies),
+            'batch_latency_ms': _percentiles(latencies),
+            'batch_size': {
+                'mean': float(batch_sizes.mean()) if len(batch_sizes) else None,
+                'max': int(batch_sizes.max()) if len(batch_sizes) else None,
+            },
+            'max_batch': self.max_batch,
+            'max_wait_ms': self.max_wait * 1000,
+        }
+
+    def close(self) -> None:
+        self._running = False
+        self._queue.put(None)
+        self._worker.join(timeout=5)
+
+
+def _percentiles(values_ms: np.ndarray) -> dict:
+    return {
+        'p50': float(np.percentile(values_ms, 50)) if len(values_ms) else None,
+        'p99': float(np.percentile(values_ms, 99)) if len(values_ms) else None,
+        'max': float(values_ms.max()) if len(values_ms) else None,
+    }
+
+
+class _ScoringHandler(BaseHTTPRequestHandler):
+    """HTTP handler; the server object carries the batcher and cleaner"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive: clients reuse connections
+    # Headers and body go out in two writes: without TCP_NODELAY the body
+    # waits for the client's delayed ACK (~40 ms per keep-alive request)
+    disable_nagle_algorithm = True
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self._send_json(200, self.server.batcher.metrics())
+        elif self.path == '/health':
+            self._send_json(200, {'status': 'ok',
+                                  'model_version': self.server.batcher.classifier.model_version})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        if self.path != '/predict':
+            self._send_json(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            texts = request['texts']
+            if isinstance(texts, str):
+                texts = [texts]
+            texts = [str(text) for text in texts]
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': f'invalid request: {e}'})
+            return
+
+        if not texts:
+            self._send_json(200, {'labels': [], 'sentiments': []})
+            return
+        if request.get('clean', True):
+            texts = [self.server.cleaner.clean_single_text(text) for text in texts]
+
+        try:
+            labels = [int(label) for label in self.server.batcher.predict(texts)]
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+        label_map = SentimentClassifier.LABEL_MAP
+        self._send_json(200, {'labels': labels,
+                              'sentiments': [label_map.get(label, 'Unknown') for label in labels]})
+        self.server.batcher.record_request(time.perf_counter() - start)
+
+    def log_message(self, format, *args):
+        pass  # one line per request would dominate the service's cost
+
+
+class _UnixScoringHandler(_ScoringHandler):
+    disable_nagle_algorithm = False  # TCP_NODELAY does not apply to Unix sockets
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ('unix', 0)  # BaseHTTPRequestHandler expects (host, port)
+
+
+def create_server(classifier: SentimentClassifier, host: str = '127.0.0.1', port: int = 8765,
+                  unix_socket: Optional[str] = None, max_batch: int = 256,
+                  max_wait: float = 0.0):
+    """
+    Build (not start) a scoring server around a loaded classifier
+
+    Returns:
+        Server with .batcher; call serve_forever(), then shutdown() and
+        server_close() + batcher.close() to stop
+    """
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = _UnixHTTPServer(unix_socket, _UnixScoringHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), _ScoringHandler)
+        server.daemon_threads = True
+    server.batcher = MicroBatcher(classifier, max_batch=max_batch, max_wait=max_wait)
+    server.cleaner = Cleaner()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentiment scoring service with micro-batching")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH, help='model.pkl or artifact directory')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix-socket', help='serve on this Unix socket instead of TCP')
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=0.0,
+                        help='wait for more requests after the first (0 = only what is queued)')
+    args = parser.parse_args()
+
+    classifier = SentimentClassifier()
+    if not classifier._loadModel(args.model):
+        raise SystemExit(1)
+
+    server = create_server(classifier, args.host, args.port, args.unix_socket,
+                           args.max_batch, args.max_wait_ms / 1000)
+    where = args.unix_socket or f"http://{args.host}:{args.port}"
+    print(f"🚀 Scoring service tại {where} (batch ≤ {args.max_batch}, chờ ≤ {args.max_wait_ms}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Memory-mappable model artifact for SentimentClassifier
+Stores the MultinomialNB arrays as .npy files and the vocabulary as a plain
+text index, described by a versioned JSON header with per-file checksums.
+
+Layout of an artifact directory:
+    header.json           format version, model settings, file sizes + sha256
+    feature_log_prob.npy  (n_classes, n_features) float64
+    class_log_prior.npy   (n_classes,) float64
+    feature_count.npy     (n_classes, n_features) float64, for partial_fit
+    class_count.npy       (n_classes,) float64, for partial_fit
+    vocabulary.txt        one term per line, line number = column index
+                          ('count' featurizer only)
+
+Loading with mmap=True maps the .npy files read-only: no deserialization,
+and every process that loads the same artifact shares the OS page cache.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+from sklearn.naive_bayes import MultinomialNB
+
+ARTIFACT_FORMAT = "sentiment-nb"
+ARTIFACT_VERSION = 1
+
+HEADER_FILE = "header.json"
+VOCABULARY_FILE = "vocabulary.txt"
+NB_ARRAYS = ("feature_log_prob", "class_log_prior", "feature_count", "class_count")
+
+
+class ModelArtifact:
+    """
+    Save / load a SentimentClassifier as a memory-mappable artifact directory
+    """
+
+    @staticmethod
+    def _sha256(path: str) -> str:
+        """Checksum of a file, read in 1 MB blocks"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @classmethod
+    def save(cls, classifier, directory: str) -> dict:
+        """
+        Write classifier to an artifact directory (replaced atomically)
+
+        Args:
+            classifier: Trained SentimentClassifier
+            directory: Target artifact directory
+
+        Returns:
+            The written header
+        """
+        directory = os.path.normpath(directory)
+        tmp_dir = f"{directory}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        files = {}
+        for name in NB_ARRAYS:
+            filename = f"{name}.npy"
+            path = os.path.join(tmp_dir, filename)
+            np.save(path, np.ascontiguousarray(getattr(classifier.model, f"{name}_")))
+            files[name] = filename
+
+        terms = None
+        if classifier.featurizer == 'count':
+            vocabulary = classifier.vectorizer.vocabulary_
+            terms = sorted(vocabulary, key=vocabulary.get)
+            with open(os.path.join(tmp_dir, VOCABULARY_FILE), 'w', encoding='utf-8', newline='\n') as f:
+                f.write('\n'.join(terms))
+            files['vocabulary'] = VOCABULARY_FILE
+
+        checksums = {
+            name: {
+                'file': filename,
+                'bytes': os.path.getsize(os.path.join(tmp_dir, filename)),
+                'sha256': cls._sha256(os.path.join(tmp_dir, filename)),
+            }
+            for name, filename in files.items()
+        }
+        header = {
+            'format': ARTIFACT_FORMAT,
+            'version': ARTIFACT_VERSION,
+            # Identifies the exact model weights (changes whenever any file changes)
+            'checksum': hashlib.sha256(
+                ''.join(checksums[name]['sha256'] for name in sorted(checksums)).encode()
+            ).hexdigest(),
+            'featurizer': classifier.featurizer,
+            'n_features': classifier.n_features,
+            'tokenized': classifier.tokenized,
+            # An empty vocabulary.txt cannot tell zero terms from one empty term
+            'vocabulary_size': len(terms) if terms is not None else None,
+            'alpha': classifier.model.alpha,
+            'classes': [int(c) for c in classifier.model.classes_],
+            'n_samples': int(classifier.n_samples),
+            'class_distribution': {str(k): int(v) for k, v in classifier.class_distribution.items()},
+            'files': checksums,
+        }
+        with open(os.path.join(tmp_dir, HEADER_FILE), 'w', encoding='utf-8') as f:
+            json.dump(header, f, indent=2)
+
+        # Swap directories; processes holding maps of the old files keep them valid
+        old_dir = f"{directory}.old"
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if os.path.exists(directory):
+            os.replace(directory, old_dir)
+        os.replace(tmp_dir, directory)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+        return header
+
+    @classmethod
+    def read_header(cls, directory: str) -> dict:
+        """Read and validate the header of an artifact directory"""
+        with open(os.path.join(directory, HEADER_FILE), 'r', encoding='utf-8') as f:
+            header = json.load(f)
+
+        if header.get('format') != ARTIFACT_FORMAT:
+            raise ValueError(f"Không phải model artifact: format={header.get('format')!r}")
+        if header.get('version') != ARTIFACT_VERSION:
+            raise ValueError(f"Artifact version {header.get('version')} không được hỗ trợ "
+                             f"(cần {ARTIFACT_VERSION})")
+        return header
+
+    @classmethod
+    def load(cls, classifier, directory: str, mmap: bool = True, verify: bool = False) -> dict:
+        """
+        Populate classifier from an artifact directory
+
+        File sizes are always checked against the header; full sha256
+        verification reads every file and is only done when verify=True.
+
+        Args:
+            classifier: SentimentClassifier to load into
+            directory: Artifact directory
+            mmap: Map arrays read-only (fast, shared). Use False before partial_fit.
+            verify: Recompute sha256 of every file
+
+        Returns:
+            The artifact header
+        """
+        header = cls.read_header(directory)
+
+        for name, entry in header['files'].items():
+            path = os.path.join(directory, entry['file'])
+            if os.path.getsize(path) != entry['bytes']:
+                raise ValueError(f"Artifact hỏng: {entry['file']} sai kích thước")
+            if verify and cls._sha256(path) != entry['sha256']:
+                raise ValueError(f"Artifact hỏng: {entry['file']} sai checksum")
+
+        arrays = {
+            name: np.load(os.path.join(directory, header['files'][name]['file']),
+                          mmap_mode='r' if mmap else None)
+            for name in NB_ARRAYS
+        }
+
+        model = MultinomialNB(alpha=header['alpha'])
+        model.classes_ = np.array(header['classes'])
+        for name, array in arrays.items():
+            setattr(model, f"{name}_", array)
+        model.n_features_in_ = arrays['feature_log_prob'].shape[1]
+
+        classifier.featurizer = header['featurizer']
+        classifier.n_features = header['n_features']
+        classifier.tokenized = header.get('tokenized', False)
+        classifier.vectorizer = classifier._build_vectorizer()
+        if classifier.featurizer == 'count':
+            with open(os.path.join(directory, header['files']['vocabulary']['file']),
+                      'r', encoding='utf-8') as f:
+                content = f.read()
+            # Older artifacts have no vocabulary_size: an empty file is still no terms
+            size = header.get('vocabulary_size', None if content else 0)
+            terms = content.split('\n') if size != 0 else []
+            if size is not None and len(terms) != size:
+                raise ValueError(f"vocabulary.txt có {len(terms)} từ, header ghi {size}")
+            classifier.vectorizer.vocabulary_ = {term: i for i, term in enumerate(terms)}
+            classifier.vectorizer.fixed_vocabulary_ = False
+
+        classifier.model = model
+        classifier.is_trained = True
+        classifier.n_samples = header['n_samples']
+        classifier.class_distribution = {int(k): v for k, v in header['class_distribution'].items()}
+
+        return header
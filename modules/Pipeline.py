@@ -0,0 +1,210 @@
+"""
+Overlapped scrape → clean → predict pipeline
+Stages run in their own threads connected by bounded queues: comments are
+cleaned and scored while the scraper is still scrolling, and a full queue
+blocks the stage in front of it (back-pressure), so memory stays bounded.
+Every stage also appends its output to the usual raw / clean / result file.
+"""
+
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+from modules.Storage import Storage
+
+# Marks the end of a stage's output
+_DONE = object()
+
+
+class PipelineError(RuntimeError):
+    """Raised by StreamingPipeline.run when a stage failed"""
+
+
+class StreamingPipeline:
+    """
+    Run scrape, clean and predict concurrently on one video
+
+    End-to-end time is roughly the slowest stage instead of the sum of all
+    stages. Output files are the same as the file-based pipeline, named
+    with one shared timestamp.
+    """
+
+    def __init__(self, scraper, cleaner, model, data_dir: str = "data",
+                 result_dir: str = "result", queue_size: int = 8,
+                 text_column: Optional[str] = "comment",
+                 cache_factory: Optional[Callable] = None,
+                 storage: Optional[Storage] = None):
+        """
+        Args:
+            scraper: YoutubeCommentScraper with the video page already open
+            cleaner: Cleaner
+            model: Loaded SentimentClassifier
+            data_dir: Folder for raw_comments / clean_comments files
+            result_dir: Folder for test_results files
+            queue_size: Maximum batches waiting between two stages
+            text_column: Comment column of the raw batches
+            cache_factory: Optional callable returning a PredictionCache; it is
+                           called in the predict thread (SQLite connections
+                           are per-thread)
+            storage: Output format of the three files (default: CSV)
+        """
+        self.scraper = scraper
+        self.cleaner = cleaner
+        self.model = model
+        self.data_dir = str(data_dir)
+        self.result_dir = str(result_dir)
+        self.queue_size = queue_size
+        self.text_column = text_column
+        self.cache_factory = cache_factory
+        self.storage = storage or Storage()
+
+        self.stats: Dict[str, dict] = {}
+        self._errors = []
+        self._stop = threading.Event()
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Blocking put that gives up when another stage failed"""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue):
+        """Blocking get that returns _DONE when another stage failed"""
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _run_stage(self, name: str, body: Callable, out_q: Optional[queue.Queue]) -> None:
+        """Run one stage body, recording timing and failures; always signal the next stage"""
+        start = time.perf_counter()
+        self.stats[name] = {'batches': 0, 'rows': 0, 'busy_seconds': 0.0}
+        try:
+            body(self.stats[name])
+        except Exception as e:
+            print(f"❌ Lỗi ở bước {name}: {e}")
+            self._errors.append((name, e))
+            self._stop.set()
+        finally:
+            self.stats[name]['seconds'] = time.perf_counter() - start
+            if out_q is not None:
+                self._put(out_q, _DONE)
+
+    def run(self, scroll_time: int = 30, deadline: float = 120, idle_timeout: float = 6,
+            prune: bool = True, file_tag: Optional[str] = None) -> dict:
+        """
+        Scrape, clean and predict with overlapping stages
+
+        Args:
+            file_tag: Optional name part (e.g. video id) put before the
+                      timestamp in output file names
+
+        Returns:
+            Dict with the written 'raw', 'clean' and 'result' paths (None when
+            a stage produced no rows) and per-stage 'stats'
+
+        Raises:
+            PipelineError: A stage raised; the other stages are stopped
+        """
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        if file_tag:
+            timestamp = f"{file_tag}_{timestamp}"
+        ext = self.storage.extension
+        raw_out = self.storage.writer(os.path.join(self.data_dir, f"raw_comments_{timestamp}{ext}"))
+        clean_out = self.storage.writer(os.path.join(self.data_dir, f"clean_comments_{timestamp}{ext}"))
+        result_out = self.storage.writer(os.path.join(self.result_dir, f"test_results_{timestamp}{ext}"),
+                                         self.model.RESULT_CATEGORIES)
+
+        to_clean = queue.Queue(maxsize=self.queue_size)
+        to_predict = queue.Queue(maxsize=self.queue_size)
+
+        def scrape(stats):
+            batches = self.scraper.stream_comments(scroll_time, deadline, idle_timeout, prune)
+            for batch in batches:
+                if self._stop.is_set():
+                    break
+                t0 = time.perf_counter()
+                df = pd.DataFrame(batch)
+                raw_out.write(df)
+                self.scraper.mark_written()  # dedup index: these comments are on disk now
+                stats['busy_seconds'] += time.perf_counter() - t0
+                stats['batches'] += 1
+                stats['rows'] += len(df)
+                if not self._put(to_clean, df):
+                    break
+            batches.close()
+
+        def clean(stats):
+            while True:
+                df = self._get(to_clean)
+                if df is _DONE:
+                    break
+                t0 = time.perf_counter()
+                cleaned = self.cleaner._clean_frame(df, self.text_column, verbose=False)
+                clean_out.write(cleaned)
+                stats['busy_seconds'] += time.perf_counter() - t0
+                stats['batches'] += 1
+                if cleaned is None or cleaned.empty:
+                    continue
+                stats['rows'] += len(cleaned)
+                if not self._put(to_predict, cleaned['text'].tolist()):
+                    break
+
+        def predict(stats):
+            cache = self.cache_factory() if self.cache_factory else None
+            try:
+                while True:
+                    texts = self._get(to_predict)
+                    if texts is _DONE:
+                        break
+                    t0 = time.perf_counter()
+                    predictions = self.model._predict_labels(texts, cache)
+                    result_out.write(self.model._build_result_frame(texts, predictions))
+                    stats['busy_seconds'] += time.perf_counter() - t0
+                    stats['batches'] += 1
+                    stats['rows'] += len(texts)
+                self.model._print_cache_stats(cache)
+            finally:
+                if cache is not None:
+                    cache.close()
+
+        print(f"🔀 Pipeline streaming (queue={self.queue_size})...")
+        start = time.perf_counter()
+        threads = [
+            threading.Thread(target=self._run_stage, args=('scrape', scrape, to_clean), name='scrape'),
+            threading.Thread(target=self._run_stage, args=('clean', clean, to_predict), name='clean'),
+            threading.Thread(target=self._run_stage, args=('predict', predict, None), name='predict'),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        paths = {
+            'raw': raw_out.close(),
+            'clean': clean_out.close(),
+            'result': result_out.close(),
+        }
+
+        for name, stage in self.stats.items():
+            print(f"  - {name}: {stage['rows']:,} dòng, {stage['batches']} batch, "
+                  f"bận {stage['busy_seconds']:.2f}s / {stage['seconds']:.2f}s")
+        print(f"⏱️  Tổng thời gian: {elapsed:.2f}s")
+
+        if self._errors:
+            name, error = self._errors[0]
+            raise PipelineError(f"Bước {name} thất bại: {error}") from error
+
+        return {**paths, 'stats': self.stats, 'seconds': elapsed}
@@ -0,0 +1,126 @@
+"""
+Run manifests: the exact artifacts each pipeline run produced
+Stages hand files to each other through the manifest instead of globbing
+data/ and result/ for the newest file, so lookups cost O(1) regardless of how
+many files have accumulated, and concurrent runs never pick up each other's
+output.
+
+Layout of the runs directory:
+    <run_id>.json             one manifest per run (url, video id, artifacts)
+    latest.json               pointer to the most recent run
+    latest_<video_id>.json    pointer to the most recent run for one video
+Every file is written to a temp file and swapped in with os.replace.
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from utils import extract_video_id
+
+ARTIFACT_KINDS = ("raw", "clean", "result", "figure")
+
+
+def _write_json(path: str, payload: dict) -> None:
+    """Atomically write a JSON file (unique temp name, safe across processes)"""
+    tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+class RunManifest:
+    """
+    Record and look up the artifacts of one pipeline run
+    """
+
+    def __init__(self, runs_dir: str, run_id: str, url: str = "", video_id: str = "",
+                 created: str = "", artifacts: Optional[dict] = None):
+        self.runs_dir = str(runs_dir)
+        self.run_id = run_id
+        self.url = url
+        self.video_id = video_id
+        self.created = created
+        self.artifacts = dict(artifacts or {})
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.runs_dir, f"{self.run_id}.json")
+
+    @classmethod
+    def create(cls, runs_dir: str, url: str) -> "RunManifest":
+        """
+        Start a new run for url and write its (empty) manifest
+
+        The run id combines timestamp, video id and a random suffix, so two
+        runs started in the same second never collide.
+        """
+        os.makedirs(str(runs_dir), exist_ok=True)
+        video_id = extract_video_id(url)
+        now = datetime.now()
+        run_id = f"{now.strftime('%Y-%m-%d_%H-%M-%S')}_{video_id}_{uuid.uuid4().hex[:6]}"
+        manifest = cls(runs_dir, run_id, url=url, video_id=video_id,
+                       created=now.isoformat(timespec='seconds'))
+        manifest._save()
+        return manifest
+
+    def to_dict(self) -> dict:
+        return {
+            'run_id': self.run_id,
+            'url': self.url,
+            'video_id': self.video_id,
+            'created': self.created,
+            'artifacts': self.artifacts,
+        }
+
+    def _save(self) -> None:
+        _write_json(self.path, self.to_dict())
+
+    def record(self, kind: str, path: Optional[str]) -> None:
+        """
+        Record the artifact a stage produced and move the latest pointers
+
+        Args:
+            kind: One of ARTIFACT_KINDS
+            path: File written by the stage (None is ignored)
+        """
+        if kind not in ARTIFACT_KINDS:
+            raise ValueError(f"kind phải là một trong {ARTIFACT_KINDS}, nhận được '{kind}'")
+        if path is None:
+            return
+        self.artifacts[kind] = str(path)
+        self._save()
+
+        pointer = {'run_id': self.run_id, 'manifest': os.path.basename(self.path)}
+        _write_json(os.path.join(self.runs_dir, f"latest_{self.video_id}.json"), pointer)
+        _write_json(os.path.join(self.runs_dir, "latest.json"), pointer)
+
+    def get(self, kind: str) -> Optional[str]:
+        """Path of a recorded artifact, or None if the stage has not run"""
+        return self.artifacts.get(kind)
+
+    @classmethod
+    def load(cls, path: str) -> "RunManifest":
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        return cls(os.path.dirname(path), payload['run_id'], url=payload.get('url', ''),
+                   video_id=payload.get('video_id', ''), created=payload.get('created', ''),
+                   artifacts=payload.get('artifacts'))
+
+    @classmethod
+    def latest(cls, runs_dir: str, video_id: Optional[str] = None) -> Optional["RunManifest"]:
+        """
+        Most recent run (optionally for one video) via its pointer file
+
+        Returns:
+            RunManifest, or None if no run was recorded
+        """
+        name = f"latest_{video_id}.json" if video_id else "latest.json"
+        try:
+            with open(os.path.join(str(runs_dir), name), 'r', encoding='utf-8') as f:
+                pointer = json.load(f)
+            return cls.load(os.path.join(str(runs_dir), pointer['manifest']))
+        except (OSError, ValueError, KeyError):
+            return None
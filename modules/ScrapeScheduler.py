@@ -0,0 +1,205 @@
+"""
+Concurrent multi-video scraping with a bounded pool of reusable Chrome drivers
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from modules.YoutubeCommentScraper import YoutubeCommentScraper
+from utils import extract_video_id
+
+
+class DriverPool:
+    """
+    Bounded pool of WebDriver instances shared by scraping threads
+    Drivers are created lazily (at most `size`) and handed back after each
+    video, so Chrome start-up is paid once per driver instead of once per URL.
+    """
+
+    def __init__(self, size: int = 3, headless: bool = True):
+        self.size = size
+        self.headless = headless
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._all = []
+
+    @contextmanager
+    def acquire(self):
+        """
+        Borrow a driver; a driver that raised or no longer responds is
+        discarded and replaced later
+        """
+        driver = self._take()
+        try:
+            yield driver
+        except Exception:
+            self._discard(driver)
+            raise
+        else:
+            # The scraper catches and prints its own WebDriver errors, so a
+            # crashed Chrome only shows up here
+            if self._is_alive(driver):
+                self._idle.put(driver)
+            else:
+                print("Trình duyệt không phản hồi, tạo driver mới cho video sau")
+                self._discard(driver)
+
+    @staticmethod
+    def _is_alive(driver) -> bool:
+        try:
+            driver.title
+            return True
+        except Exception:
+            return False
+
+    def _take(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                break
+
+            # Pool is full: wait for a driver to come back (or a slot to free up)
+            try:
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+        try:
+            driver = YoutubeCommentScraper.create_driver(self.headless)
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        with self._lock:
+            self._all.append(driver)
+        return driver
+
+    def _discard(self, driver) -> None:
+        with self._lock:
+            self._created -= 1
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Quit every driver created by the pool"""
+        with self._lock:
+            drivers, self._all = self._all, []
+            self._created = 0
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ScrapeScheduler:
+    """
+    Scrape many videos concurrently, yielding each video's comments as soon
+    as it finishes (completion order, not input order)
+    """
+
+    def __init__(self, max_drivers: int = 3, headless: bool = True, scroll_time: int = 30,
+                 deadline: float = 120, idle_timeout: float = 6, dedup_index=None):
+        """
+        Args:
+            max_drivers: Maximum number of concurrent browsers
+            headless: Run Chrome without a window
+            scroll_time: Scroll iterations per video
+            deadline: Total scroll time budget per video (seconds)
+            idle_timeout: Seconds without new comments or spinner = end of list
+            dedup_index: Optional CommentIndex; scrape_many_to_csv then writes
+                         only comments unseen in earlier scrapes
+        """
+        self.max_drivers = max_drivers
+        self.headless = headless
+        self.scroll_time = scroll_time
+        self.deadline = deadline
+        self.idle_timeout = idle_timeout
+        self.dedup_index = dedup_index
+        self.unchanged: List[str] = []  # URLs of the last scrape_many_to_csv with nothing new
+
+    def _scrape_one(self, pool: DriverPool, url: str) -> List[dict]:
+        with pool.acquire() as driver:
+            scraper = YoutubeCommentScraper(headless=self.headless, driver=driver)
+            scraper._get_url(url)
+            scraper._scroll(self.scroll_time, deadline=self.deadline, idle_timeout=self.idle_timeout)
+            return scraper.extract_comments()
+
+    def scrape_many(self, urls: Iterable[str]) -> Iterator[Tuple[str, Optional[List[dict]]]]:
+        """
+        Scrape every URL on the driver pool
+
+        Yields:
+            (url, comments) as each video finishes; comments is None if the
+            scrape raised
+        """
+        urls = list(dict.fromkeys(urls))
+        with DriverPool(self.max_drivers, self.headless) as pool, \
+                ThreadPoolExecutor(max_workers=self.max_drivers) as executor:
+            futures = {executor.submit(self._scrape_one, pool, url): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    yield url, future.result()
+                except Exception as e:
+                    print(f"Lỗi khi scrape {url}: {e}")
+                    yield url, None
+
+    def scrape_many_to_csv(self, urls: Iterable[str], output_dir: str = "data") -> List[str]:
+        """
+        Scrape every URL and write data/raw_comments_<video_id>_<timestamp>.csv
+        for each video as soon as it finishes
+
+        With a dedup index only new comments are written, and they are marked
+        as seen once their file is on disk. Videos with no new comment get no
+        file and are listed in self.unchanged.
+
+        Returns:
+            Written CSV paths, in completion order
+        """
+        written = []
+        self.unchanged = []
+        writer = YoutubeCommentScraper(headless=self.headless)
+        for url, comments in self.scrape_many(urls):
+            if not comments:
+                continue
+            video_id = extract_video_id(url)
+            keys = []
+            if self.dedup_index is not None:
+                # Filtered here on the writing thread, so a failed write marks nothing
+                n_scraped = len(comments)
+                comments, keys = self.dedup_index.filter_new(video_id, comments)
+                print(f"{video_id}: {len(comments)} comment mới, bỏ qua {n_scraped - len(comments)} đã có")
+                if not comments:
+                    self.unchanged.append(url)
+                    continue
+            output_path = os.path.join(output_dir, f"raw_comments_{video_id}.csv")
+            path = writer._save_to_csv(comments, output_path)
+            if path:
+                if keys:
+                    self.dedup_index.mark_seen(keys)
+                written.append(path)
+        return written
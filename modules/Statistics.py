@@ -0,0 +1,250 @@
+"""
+Single-pass, mergeable statistics over result files
+One streaming pass over Text / Label computes the label distribution,
+distinct tokens, comment lengths and term counts per sentiment. Partial
+aggregates (per chunk, per file, per worker) merge by addition, so totals
+over many files never need the rows in memory at once.
+"""
+
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.Storage import iter_tables
+
+# Upper bounds (in words) of the comment-length histogram buckets; the last
+# bucket collects everything longer
+LENGTH_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+
+class ResultStatistics:
+    """
+    Mergeable aggregate of Text / Label rows
+
+    Memory grows with the vocabulary (term counts per label), not with the
+    number of rows. Tokens are the whitespace-separated words of the cleaned
+    text. See modules.Sketches.SketchedResultStatistics for a fixed-memory
+    approximate variant.
+    """
+
+    KIND = 'exact'  # saved with the aggregate; only the same kind loads it back
+
+    def __init__(self):
+        self.rows = 0
+        self.label_counts = Counter()
+        self.term_counts: Dict[int, Counter] = {}
+        self.length_sum = 0
+        self.length_sq_sum = 0
+        self.length_min: Optional[int] = None
+        self.length_max: Optional[int] = None
+        self.length_histogram = np.zeros(len(LENGTH_BUCKETS) + 1, dtype=np.int64)
+
+    # ---------- building ----------
+
+    def update(self, df: pd.DataFrame, text_column: str = 'Text',
+               label_column: str = 'Label') -> 'ResultStatistics':
+        """Add one chunk of rows"""
+        if df.empty:
+            return self
+        texts = df[text_column].fillna('').astype(str)
+        labels = pd.to_numeric(df[label_column], errors='coerce').fillna(-1).astype(int)
+        tokens = texts.str.split()
+        lengths = tokens.str.len().to_numpy(dtype=np.int64)
+
+        self.rows += len(df)
+        self.label_counts.update(labels.value_counts().to_dict())
+        self.length_sum += int(lengths.sum())
+        self.length_sq_sum += int((lengths ** 2).sum())
+        self.length_min = int(lengths.min()) if self.length_min is None else min(self.length_min, int(lengths.min()))
+        self.length_max = int(lengths.max()) if self.length_max is None else max(self.length_max, int(lengths.max()))
+        self.length_histogram += np.bincount(np.searchsorted(LENGTH_BUCKETS, lengths),
+                                             minlength=len(LENGTH_BUCKETS) + 1)
+
+        self._update_terms(tokens, labels)
+        return self
+
+    def _update_terms(self, tokens: pd.Series, labels: pd.Series) -> None:
+        """Count the token lists of one chunk per label"""
+        for label, label_tokens in tokens.groupby(labels.to_numpy()):
+            self.term_counts.setdefault(int(label), Counter()).update(chain.from_iterable(label_tokens))
+
+    def merge(self, other: 'ResultStatistics') -> 'ResultStatistics':
+        """Add another aggregate into this one (in place) and return self"""
+        self.rows += other.rows
+        self.label_counts.update(other.label_counts)
+        self._merge_terms(other)
+        self.length_sum += other.length_sum
+        self.length_sq_sum += other.length_sq_sum
+        for attr, pick in (('length_min', min), ('length_max', max)):
+            values = [v for v in (getattr(self, attr), getattr(other, attr)) if v is not None]
+            setattr(self, attr, pick(values) if values else None)
+        self.length_histogram += other.length_histogram
+        return self
+
+    def _merge_terms(self, other: 'ResultStatistics') -> None:
+        for label, counts in other.term_counts.items():
+            self.term_counts.setdefault(label, Counter()).update(counts)
+
+    @classmethod
+    def from_file(cls, path: str, chunk_size: int = 50000) -> 'ResultStatistics':
+        """Aggregate one result file in a single chunked pass (only Text / Label are read)"""
+        stats = cls()
+        for chunk in iter_tables(path, chunk_size, columns=['Text', 'Label']):
+            stats.update(chunk)
+        return stats
+
+    @classmethod
+    def from_files(cls, paths: Iterable[str], chunk_size: int = 50000,
+                   n_workers: int = 1) -> 'ResultStatistics':
+        """
+        Aggregate many result files, one file per worker process
+
+        Args:
+            paths: Result files
+            chunk_size: Rows per chunk
+            n_workers: Worker processes (1 = in this process)
+        """
+        paths = list(paths)
+        total = cls()
+        if n_workers <= 1 or len(paths) <= 1:
+            for path in paths:
+                total.merge(cls.from_file(path, chunk_size))
+            return total
+
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(paths))) as pool:
+            for partial in pool.map(cls.from_file, paths, [chunk_size] * len(paths)):
+                total.merge(partial)
+        return total
+
+    # ---------- queries ----------
+
+    @property
+    def vocabulary_size(self) -> int:
+        """Number of distinct tokens over all labels"""
+        if len(self.term_counts) == 1:
+            return len(next(iter(self.term_counts.values())))
+        return len(set().union(*self.term_counts.values()))
+
+    @property
+    def token_count(self) -> int:
+        return self.length_sum
+
+    def label_share(self, label: int) -> float:
+        return self.label_counts.get(label, 0) / self.rows if self.rows else 0.0
+
+    def length_summary(self) -> dict:
+        """Mean / std / min / max comment length (words) and a bucketed median"""
+        if not self.rows:
+            return {'mean': None, 'std': None, 'min': None, 'max': None, 'median_bucket': None}
+        mean = self.length_sum / self.rows
+        variance = max(self.length_sq_sum / self.rows - mean ** 2, 0.0)
+        median_index = int(np.searchsorted(np.cumsum(self.length_histogram), (self.rows + 1) / 2))
+        return {
+            'mean': mean,
+            'std': variance ** 0.5,
+            'min': self.length_min,
+            'max': self.length_max,
+            # Upper bound of the bucket holding the median (None = above the last bound)
+            'median_bucket': LENGTH_BUCKETS[median_index] if median_index < len(LENGTH_BUCKETS) else None,
+        }
+
+    def top_terms(self, k: int = 10, label: Optional[int] = None,
+                  stopwords: Optional[Iterable[str]] = None) -> List[Tuple[str, int]]:
+        """
+        Most frequent tokens overall or for one label
+
+        Args:
+            k: Number of terms
+            label: Label id (None = all labels)
+            stopwords: Tokens to skip
+        """
+        if label is None:
+            counts = Counter()
+            for label_counts in self.term_counts.values():
+                counts.update(label_counts)
+        else:
+            counts = self.term_counts.get(label, Counter())
+        if not stopwords:
+            return counts.most_common(k)
+        stopwords = set(stopwords)
+        top = []
+        for term, count in counts.most_common():
+            if term not in stopwords:
+                top.append((term, count))
+                if len(top) == k:
+                    break
+        return top
+
+    # ---------- persistence ----------
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form (see from_dict)"""
+        return {
+            'kind': self.KIND,
+            'rows': self.rows,
+            'label_counts': {str(k): int(v) for k, v in self.label_counts.items()},
+            **self._terms_to_dict(),
+            'length_sum': self.length_sum,
+            'length_sq_sum': self.length_sq_sum,
+            'length_min': self.length_min,
+            'length_max': self.length_max,
+            'length_histogram': self.length_histogram.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ResultStatistics':
+        if data.get('kind', 'exact') != cls.KIND:
+            raise ValueError(f"Thống kê loại '{data.get('kind')}' không dùng được cho '{cls.KIND}'")
+        stats = cls()
+        stats.rows = data['rows']
+        stats.label_counts = Counter({int(k): v for k, v in data['label_counts'].items()})
+        stats._terms_from_dict(data)
+        stats.length_sum = data['length_sum']
+        stats.length_sq_sum = data['length_sq_sum']
+        stats.length_min = data['length_min']
+        stats.length_max = data['length_max']
+        stats.length_histogram = np.array(data['length_histogram'], dtype=np.int64)
+        return stats
+
+    def _terms_to_dict(self) -> dict:
+        return {'term_counts': {str(label): dict(counts) for label, counts in self.term_counts.items()}}
+
+    def _terms_from_dict(self, data: dict) -> None:
+        self.term_counts = {int(label): Counter(counts) for label, counts in data['term_counts'].items()}
+
+    def save(self, path: str) -> str:
+        """Write as JSON (temp file + rename, never half-written)"""
+        os.makedirs(os.path.dirname(str(path)) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return str(path)
+
+    @classmethod
+    def load(cls, path: str) -> 'ResultStatistics':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def summary(self, k: int = 10, stopwords: Optional[Iterable[str]] = None,
+                label_names: Optional[Dict[int, str]] = None) -> dict:
+        """Dashboard view: counts, shares, lengths and top-k terms per label"""
+        label_names = label_names or {}
+        labels = sorted(self.label_counts)
+        return {
+            'rows': self.rows,
+            'tokens': self.token_count,
+            'vocabulary': self.vocabulary_size,
+            'labels': {label_names.get(label, str(label)): {
+                'count': self.label_counts[label],
+                'share': self.label_share(label),
+                'top_terms': self.top_terms(k, label, stopwords),
+            } for label in labels},
+            'length': self.length_summary(),
+        }
@@ -0,0 +1,246 @@
+"""
+Pluggable table storage for raw / clean / result datasets
+CSV (utf-8-sig, the historical format), Parquet or Arrow IPC. Reading is
+driven by the file extension, so any stage reads files of every format;
+writing uses the format the Storage was created with.
+
+Columnar formats let readers load only the columns they need, and columns
+with a fixed set of values (Label / Sentiment) are stored dictionary-encoded.
+pyarrow is only imported when a columnar format is actually used.
+"""
+
+import glob
+import os
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+FORMATS = ('csv', 'parquet', 'arrow')
+EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow'}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError as e:
+        raise ImportError("Định dạng parquet/arrow cần pyarrow: pip install pyarrow") from e
+
+
+def format_of(path: str) -> str:
+    """Storage format of a file, from its extension (unknown extensions = csv)"""
+    ext = os.path.splitext(str(path))[1].lower()
+    for fmt, fmt_ext in EXTENSIONS.items():
+        if ext == fmt_ext:
+            return fmt
+    return 'csv'
+
+
+def glob_tables(folder: str, pattern: str) -> List[str]:
+    """Files in folder matching pattern (without extension) in any storage format"""
+    files = []
+    for ext in EXTENSIONS.values():
+        files.extend(glob.glob(os.path.join(str(folder), f"{pattern}{ext}")))
+    return files
+
+
+def table_columns(path: str) -> List[str]:
+    """Column names of a table file, read from its header / schema only"""
+    fmt = format_of(path)
+    if fmt == 'csv':
+        return pd.read_csv(path, nrows=0).columns.tolist()
+
+    pa = _require_pyarrow()
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+
+    with pa.memory_map(str(path), 'r') as source:
+        return pa.ipc.open_file(source).schema.names
+
+
+def read_table(path: str, columns: Optional[Sequence[str]] = None,
+               as_str: bool = False) -> pd.DataFrame:
+    """
+    Read a whole table file
+
+    Args:
+        path: CSV / Parquet / Arrow file
+        columns: Only these columns (columnar formats skip the others on disk)
+        as_str: CSV only - read every column as str with no NaN conversion
+                (same values as iter_tables(..., as_str=True) chunks)
+    """
+    fmt = format_of(path)
+    if fmt == 'csv':
+        kwargs = {'dtype': str, 'keep_default_na': False} if as_str else {}
+        return pd.read_csv(path, usecols=list(columns) if columns else None, **kwargs)
+
+    _require_pyarrow()
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_table(path, columns=list(columns) if columns else None).to_pandas()
+
+    # Arrow IPC file == Feather v2; feather reads only the selected columns
+    import pyarrow.feather as feather
+    return feather.read_table(str(path), columns=list(columns) if columns else None,
+                              memory_map=True).to_pandas()
+
+
+def iter_tables(path: str, chunk_size: int, columns: Optional[Sequence[str]] = None,
+                as_str: bool = False) -> Iterator[pd.DataFrame]:
+    """
+    Read a table file in chunks of at most chunk_size rows
+
+    Args:
+        path: CSV / Parquet / Arrow file
+        chunk_size: Rows per chunk
+        columns: Only these columns
+        as_str: CSV only - read every column as str with no NaN conversion
+                (stable dtypes across chunks)
+    """
+    fmt = format_of(path)
+    if fmt == 'csv':
+        kwargs = {'dtype': str, 'keep_default_na': False} if as_str else {}
+        yield from pd.read_csv(path, chunksize=chunk_size,
+                               usecols=list(columns) if columns else None, **kwargs)
+        return
+
+    pa = _require_pyarrow()
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size,
+                                               columns=list(columns) if columns else None):
+            yield batch.to_pandas()
+        return
+
+    with pa.memory_map(str(path), 'r') as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns:
+                batch = batch.select(list(columns))
+            for start in range(0, batch.num_rows, chunk_size):
+                yield batch.slice(start, chunk_size).to_pandas()
+
+
+class TableWriter:
+    """
+    Append DataFrames to one table file (header / schema taken from the first
+    non-empty frame); use as a context manager or call close()
+    """
+
+    def __init__(self, path: str, fmt: str, categories: Optional[Dict[str, List]] = None,
+                 compression: str = 'zstd'):
+        self.path = str(path)
+        self.fmt = fmt
+        self.categories = categories or {}
+        self.compression = compression
+        self.rows = 0
+        self._file = None
+        self._writer = None
+        self._schema = None
+
+    def _encode(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Dictionary-encode columns with a fixed category list (same dictionary in every batch)"""
+        encode = [column for column in self.categories if column in df.columns]
+        if not encode:
+            return df
+        df = df.copy()
+        for column in encode:
+            df[column] = pd.Categorical(df[column], categories=self.categories[column])
+        return df
+
+    def write(self, df: pd.DataFrame) -> None:
+        if df is None or df.empty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+
+        if self.fmt == 'csv':
+            if self._file is None:
+                self._file = open(self.path, 'w', encoding='utf-8-sig', newline='')
+            df.to_csv(self._file, index=False, header=(self.rows == 0))
+            self._file.flush()
+            self.rows += len(df)
+            return
+
+        pa = _require_pyarrow()
+        table = pa.Table.from_pandas(self._encode(df), schema=self._schema, preserve_index=False)
+        if self._writer is None:
+            self._open(table.schema)
+        self._writer.write_table(table)
+        self.rows += len(df)
+
+    def _open(self, schema) -> None:
+        """Create the columnar file writer for schema"""
+        pa = _require_pyarrow()
+        self._schema = schema
+        if self.fmt == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(self.path, schema, compression=self.compression)
+        else:
+            self._file = pa.OSFile(self.path, 'wb')
+            self._writer = pa.ipc.new_file(
+                self._file, schema, options=pa.ipc.IpcWriteOptions(compression=self.compression))
+
+    def close(self) -> Optional[str]:
+        """Finish the file; returns its path, or None if nothing was written"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return self.path if self.rows else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class Storage:
+    """
+    Writer factory for one configured format
+    """
+
+    def __init__(self, fmt: str = 'csv'):
+        if fmt not in FORMATS:
+            raise ValueError(f"storage format phải là một trong {FORMATS}, nhận được '{fmt}'")
+        if fmt != 'csv':
+            _require_pyarrow()
+        self.fmt = fmt
+
+    @property
+    def extension(self) -> str:
+        return EXTENSIONS[self.fmt]
+
+    def with_extension(self, path: str) -> str:
+        """path with its extension replaced by this format's"""
+        return os.path.splitext(str(path))[0] + self.extension
+
+    def writer(self, path: str, categories: Optional[Dict[str, List]] = None) -> TableWriter:
+        """
+        Open an appending writer
+
+        Args:
+            path: Output file
+            categories: column -> fixed value list, stored dictionary-encoded
+                        (ignored for CSV)
+        """
+        return TableWriter(path, self.fmt, categories)
+
+    def write(self, df: pd.DataFrame, path: str, categories: Optional[Dict[str, List]] = None) -> str:
+        """Write one DataFrame to path (an empty frame still produces a file) and return path"""
+        if not df.empty:
+            with self.writer(path, categories) as writer:
+                writer.write(df)
+        elif self.fmt == 'csv':
+            df.to_csv(path, index=False, encoding='utf-8-sig')
+        else:
+            # Schema-only file
+            pa = _require_pyarrow()
+            with self.writer(path, categories) as writer:
+                writer._open(pa.Table.from_pandas(writer._encode(df), preserve_index=False).schema)
+        return str(path)
@@ -0,0 +1,238 @@
+"""
+Sentiment trends across repeated scrapes
+Every finished run appends one row to a runs table and its per-label comment
+counts (one row per run and label) to a SQLite store, so time series over
+weeks of runs are answered from a few rows per run instead of re-reading
+every historical result file.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from modules.Storage import iter_tables
+
+
+def count_labels(result_file: str, chunk_size: int = 50000) -> Dict[int, int]:
+    """Comments per label of one result file (only the Label column is read)"""
+    counts: Dict[int, int] = {}
+    for chunk in iter_tables(result_file, chunk_size, columns=['Label']):
+        labels = pd.to_numeric(chunk['Label'], errors='coerce').dropna().astype(int)
+        for label, count in labels.value_counts().items():
+            counts[int(label)] = counts.get(int(label), 0) + int(count)
+    return counts
+
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+def _timestamp(value) -> str:
+    """Any ISO-like timestamp as the stored YYYY-MM-DDTHH:MM:SS form (so strings compare in time order)"""
+    return pd.Timestamp(value).strftime(TIMESTAMP_FORMAT)
+
+
+def _is_date_only(value) -> bool:
+    return isinstance(value, str) and len(value.strip()) <= 10 and ':' not in value
+
+
+class TrendStore:
+    """
+    Append-only store of per-run, per-video sentiment counts
+
+    Recording the same run again replaces its rows, so re-running the record
+    step (or a backfill) never double counts. A run with no comments is kept
+    (as a zero-volume point). One instance may be shared between threads
+    (calls are serialized).
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a trend store
+
+        Args:
+            path: SQLite file path
+        """
+        directory = os.path.dirname(str(path))
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment ("
+            " run_id TEXT NOT NULL, video_id TEXT NOT NULL, recorded TEXT NOT NULL,"
+            " label INTEGER NOT NULL, count INTEGER NOT NULL,"
+            " PRIMARY KEY (run_id, label)) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sentiment_video ON sentiment(video_id, recorded)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run_id TEXT PRIMARY KEY, video_id TEXT NOT NULL, recorded TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS runs_video ON runs(video_id, recorded)")
+        # Stores written before the runs table existed
+        self._conn.execute(
+            "INSERT OR IGNORE INTO runs (run_id, video_id, recorded)"
+            " SELECT run_id, MIN(video_id), MIN(recorded) FROM sentiment GROUP BY run_id"
+        )
+        self._conn.commit()
+
+    # ---------- recording ----------
+
+    def record(self, run_id: str, video_id: str, label_counts: Dict[int, int],
+               recorded: Optional[str] = None) -> None:
+        """
+        Store the label counts of one run
+
+        Args:
+            run_id: Run identifier (e.g. RunManifest.run_id)
+            video_id: Video the run scraped
+            label_counts: Comments per label
+            recorded: ISO timestamp of the run (default: now)
+        """
+        recorded = _timestamp(recorded) if recorded else datetime.now().strftime(TIMESTAMP_FORMAT)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO runs (run_id, video_id, recorded) VALUES (?, ?, ?)",
+                               (run_id, video_id, recorded))
+            self._conn.execute("DELETE FROM sentiment WHERE run_id = ?", (run_id,))
+            self._conn.executemany(
+                "INSERT INTO sentiment (run_id, video_id, recorded, label, count) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, video_id, recorded, int(label), int(count)) for label, count in label_counts.items()]
+            )
+            self._conn.commit()
+
+    def record_result(self, run_id: str, video_id: str, result_file: str,
+                      recorded: Optional[str] = None, chunk_size: int = 50000) -> Dict[int, int]:
+        """
+        Count the labels of a run's result file and store them
+
+        Returns:
+            The recorded label counts
+        """
+        counts = count_labels(result_file, chunk_size)
+        self.record(run_id, video_id, counts, recorded)
+        return counts
+
+    def has_run(self, run_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone() is not None
+
+    # ---------- queries ----------
+
+    def videos(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT video_id FROM runs ORDER BY video_id")]
+
+    def runs(self, video_id: Optional[str] = None, since: Optional[str] = None,
+             until: Optional[str] = None) -> pd.DataFrame:
+        """
+        Label counts per run
+
+        Args:
+            video_id: Only this video (None = all videos)
+            since / until: ISO dates or timestamps bounding `recorded`
+                           (inclusive; a date-only until covers that whole day)
+
+        Returns:
+            One row per run (run_id, video_id, recorded) with one count column per label
+        """
+        query = ("SELECT r.run_id, r.video_id, r.recorded, s.label, s.count"
+                 " FROM runs r LEFT JOIN sentiment s ON s.run_id = r.run_id WHERE 1 = 1")
+        params = []
+        if video_id is not None:
+            query += " AND r.video_id = ?"
+            params.append(video_id)
+        if since is not None:
+            query += " AND r.recorded >= ?"
+            params.append(_timestamp(since))
+        if until is not None:
+            if _is_date_only(until):
+                query += " AND r.recorded < ?"
+                params.append(_timestamp(pd.Timestamp(until) + timedelta(days=1)))
+            else:
+                query += " AND r.recorded <= ?"
+                params.append(_timestamp(until))
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        df = pd.DataFrame(rows, columns=['run_id', 'video_id', 'recorded', 'label', 'count'])
+        if df.empty:
+            return pd.DataFrame({'run_id': [], 'video_id': [], 'recorded': pd.to_datetime([])})
+        runs = df[['run_id', 'video_id', 'recorded']].drop_duplicates('run_id')
+        counts = df.dropna(subset=['label'])
+        if not counts.empty:
+            # Runs without comments have no label rows: their counts are 0
+            counts = counts.pivot_table(index='run_id', columns='label', values='count',
+                                        aggfunc='sum', fill_value=0)
+            counts.columns = [int(label) for label in counts.columns]
+            runs = runs.join(counts, on='run_id')
+            runs[list(counts.columns)] = runs[list(counts.columns)].fillna(0).astype(int)
+        runs['recorded'] = pd.to_datetime(runs['recorded'])
+        return runs.sort_values(['recorded', 'run_id'], ignore_index=True)
+
+    def series(self, video_id: Optional[str] = None, window: Optional[str] = None,
+               how: str = 'last', since: Optional[str] = None, until: Optional[str] = None,
+               label_names: Optional[Dict[int, str]] = None) -> pd.DataFrame:
+        """
+        Sentiment time series
+
+        Args:
+            video_id: Only this video (None = all videos)
+            window: Pandas period alias to bucket runs by ('h', 'D', 'W', 'M');
+                    None = one point per run
+            how: Combining several runs of one video in a window:
+                 'last' = latest run (scrapes are cumulative snapshots),
+                 'sum' = add them up (runs hold only new comments)
+            since / until: ISO dates or timestamps bounding the runs (inclusive,
+                           see runs)
+            label_names: Column names per label (default: the label ids)
+
+        Returns:
+            DataFrame indexed by time with count columns per label, 'total',
+            'runs' and share_<name> columns (fraction of total)
+        """
+        if how not in ('last', 'sum'):
+            raise ValueError(f"how phải là 'last' hoặc 'sum', nhận được '{how}'")
+        runs = self.runs(video_id, since, until)
+        labels = [column for column in runs.columns if isinstance(column, int)]
+
+        if window is None:
+            series = runs.set_index('recorded')[labels].copy()
+            series['runs'] = 1
+        else:
+            runs['window'] = runs['recorded'].dt.to_period(window).dt.start_time
+            if how == 'last':
+                # Runs are sorted by time: keep each video's newest run per window
+                picked = runs.groupby(['window', 'video_id']).tail(1)
+            else:
+                picked = runs
+            series = picked.groupby('window')[labels].sum()
+            series['runs'] = runs.groupby('window').size()
+            series.index.name = 'recorded'
+
+        series['total'] = series[labels].sum(axis=1)
+        names = {label: (label_names or {}).get(label, str(label)) for label in labels}
+        for label in labels:
+            series[f"share_{names[label]}"] = (series[label] / series['total'].where(series['total'] > 0)).fillna(0.0)
+        return series.rename(columns=names)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
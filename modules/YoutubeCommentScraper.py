@@ -5,37 +5,218 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 import pandas as pd
 import time
-import random
 import os
+import json
+import threading
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from datetime import datetime
 from webdriver_manager.chrome import ChromeDriverManager
 
+from utils import extract_video_id
+
+
+# Returns {count, height, loading} for the comment section in a single call
+# (pending = rendered comments not yet taken by the streaming extractor)
+_PAGE_STATE_JS = """
+const threads = document.querySelectorAll('ytd-comment-thread-renderer').length;
+const count = threads || document.querySelectorAll('ytd-comment-renderer, ytd-comment-view-model').length;
+const pending = threads
+    ? document.querySelectorAll('ytd-comment-thread-renderer:not([data-sml-done])').length
+    : document.querySelectorAll(
+        'ytd-comment-renderer:not([data-sml-done]), ytd-comment-view-model:not([data-sml-done])').length;
+const spinner = document.querySelector(
+    'ytd-continuation-item-renderer tp-yt-paper-spinner, ytd-continuation-item-renderer #spinner');
+return {
+    count: count,
+    pending: pending,
+    height: document.documentElement.scrollHeight,
+    loading: !!(spinner && spinner.offsetParent !== null),
+};
+"""
+
+# Same selectors and fallbacks as the per-element path, evaluated in-page.
+# Returns a JSON string: {comments: [[author, content], ...], total, skipped, fallback}
+_EXTRACT_COMMENTS_JS = """
+let nodes = document.querySelectorAll('ytd-comment-thread-renderer');
+let fallback = false;
+if (!nodes.length) {
+    nodes = document.querySelectorAll('ytd-comment-renderer, ytd-comment-view-model');
+    fallback = true;
+}
+const comments = [];
+let skipped = 0;
+for (const node of nodes) {
+    const author = node.querySelector('#author-text, #header-author');
+    const content = node.querySelector('#content-text, #content');
+    if (!author || !content) {
+        skipped++;
+        continue;
+    }
+    comments.push([author.innerText, content.innerText]);
+}
+return JSON.stringify({comments: comments, total: nodes.length, skipped: skipped, fallback: fallback});
+"""
+
+# Streaming variant: only comments not extracted before (no data-sml-done mark).
+# Marks what it took; with arguments[0] == true also removes those nodes from
+# the DOM so browser memory and later extraction cost stay bounded.
+_EXTRACT_NEW_COMMENTS_JS = """
+const prune = arguments[0];
+let nodes = document.querySelectorAll('ytd-comment-thread-renderer:not([data-sml-done])');
+let fallback = false;
+if (!nodes.length && !document.querySelector('ytd-comment-thread-renderer')) {
+    nodes = document.querySelectorAll(
+        'ytd-comment-renderer:not([data-sml-done]), ytd-comment-view-model:not([data-sml-done])');
+    fallback = nodes.length > 0;
+}
+const comments = [];
+let skipped = 0;
+for (const node of nodes) {
+    const author = node.querySelector('#author-text, #header-author');
+    const content = node.querySelector('#content-text, #content');
+    if (author && content) {
+        comments.push([author.innerText, content.innerText]);
+    } else {
+        skipped++;
+    }
+    node.setAttribute('data-sml-done', '1');
+    if (prune) {
+        node.remove();
+    }
+}
+return JSON.stringify({comments: comments, total: nodes.length, skipped: skipped, fallback: fallback});
+"""
+
 
 class YoutubeCommentScraper:
-    def __init__(self, headless=True):
+    # Poll interval while waiting for new comments: doubles up to the max (seconds)
+    BACKOFF_INITIAL = 0.25
+    BACKOFF_MAX = 2.0
+
+    # chromedriver path resolved once per process (ChromeDriverManager hits the network)
+    _driver_path = None
+    _driver_path_lock = threading.Lock()
+
+    def __init__(self, headless=True, driver=None):
+        """
+        Args:
+            headless: Run Chrome without a window
+            driver: Existing WebDriver to reuse (e.g. from a DriverPool);
+                    a new one is created on first use otherwise
+        """
         self.headless = headless
-        self.driver = None
-    def _setup_driver(self):
+        self.driver = driver
+        self.scroll_stats = {}
+        self.extract_stats = {}
+        # Optional modules.Cache.CommentIndex: when set, only comments not
+        # emitted by an earlier scrape of the same video are returned
+        self.dedup_index = None
+        self.dedup_stats = {'new': 0, 'skipped': 0}
+        self.video_id = None
+        self._unwritten_keys = []  # keys of returned comments, marked once written
+
+    @classmethod
+    def create_driver(cls, headless=True):
         options = Options()
-        if self.headless:
+        if headless:
             options.add_argument("--headless=new")
         options.add_argument("--disable-gpu")
         options.add_argument("--window-size=1920,1080")
 
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=options)
+        with cls._driver_path_lock:
+            if cls._driver_path is None:
+                cls._driver_path = ChromeDriverManager().install()
+        service = Service(cls._driver_path)
+        return webdriver.Chrome(service=service, options=options)
+
+    def _setup_driver(self):
+        self.driver = self.create_driver(self.headless)
+
     def _get_url(self,url):
         try: 
-         self._setup_driver()
+         # Reuse the open browser across calls instead of starting a new Chrome
+         if self.driver is None:
+             self._setup_driver()
+         self.video_id = extract_video_id(url)
+         self.dedup_stats = {'new': 0, 'skipped': 0}
+         self._unwritten_keys = []
          self.driver.get(url)
          print("Truy cập thành công trang", self.driver.title)
         except Exception as e :
           print("Lỗi khi truy cập",e)        
-    def _scroll(self, scroll_time=50):
+    def _only_new(self, comments):
+        """
+        Drop comments the dedup index has already seen for this video (no-op
+        without an index). The returned comments are only marked as seen by
+        mark_written, after they have been written.
+        """
+        if self.dedup_index is None or not comments:
+            return comments
+        new, keys = self.dedup_index.filter_new(self.video_id or "", comments)
+        self._unwritten_keys.extend(keys)
+        skipped = len(comments) - len(new)
+        self.dedup_stats['new'] += len(new)
+        self.dedup_stats['skipped'] += skipped
+        if skipped:
+            print(f"Bỏ qua {skipped} comment đã có từ lần scrape trước")
+        return new
+
+    def mark_written(self):
+        """Mark every comment returned so far as seen (call once they are on disk)"""
+        if self.dedup_index is not None and self._unwritten_keys:
+            self.dedup_index.mark_seen(self._unwritten_keys)
+        self._unwritten_keys = []
+
+    def _page_state(self):
+        """Comment count, page height and continuation-spinner visibility in one round trip"""
+        return self.driver.execute_script(_PAGE_STATE_JS)
+
+    def _wait_for_more(self, before, idle_timeout, deadline_at, streaming=False):
+        """
+        Poll the page with exponential backoff until new comments render
+        Returns the new page state, or None when nothing arrived within
+        idle_timeout while no continuation spinner was showing (end of list).
+        In streaming mode progress means unextracted comments are pending
+        (the total count can shrink when processed nodes are pruned).
+        """
+        delay = self.BACKOFF_INITIAL
+        idle_since = time.monotonic()
+        while time.monotonic() < deadline_at:
+            time.sleep(min(delay, max(0.0, deadline_at - time.monotonic())))
+            state = self._page_state()
+            if streaming:
+                grew = state['pending'] > 0
+            else:
+                grew = state['count'] > before['count']
+            if grew or (state['count'] == 0 and state['height'] > before['height']):
+                return state
+            if state['loading']:
+                # YouTube is still fetching the next batch: keep waiting
+                idle_since = time.monotonic()
+            elif time.monotonic() - idle_since >= idle_timeout:
+                return None
+            delay = min(delay * 2, self.BACKOFF_MAX)
+        return None
+
+    def _scroll(self, scroll_time=50, deadline=120, idle_timeout=6):
+        """
+        Scroll the comment section until no more comments load
+        Each step scrolls to the bottom and then waits on DOM signals (comment
+        count growing, continuation spinner) with exponential backoff instead
+        of fixed sleeps. Stats are kept in self.scroll_stats.
+
+        Args:
+            scroll_time: Maximum number of scroll steps
+            deadline: Total time budget in seconds
+            idle_timeout: Seconds without new comments or spinner = end of list
+        """
         print("Bắt đầu quy trình cuộn trang...")
+        start = time.monotonic()
+        deadline_at = start + deadline
+        initial_count = 0
+        state = None
         
         try:
             
@@ -45,61 +226,80 @@ class YoutubeCommentScraper:
             self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", comment_section)
             
             print("Đã tìm thấy khung bình luận, đang chờ tải dữ liệu...")
-            time.sleep(3) 
+            # Comments render lazily once the section is in view
+            try:
+                WebDriverWait(self.driver, min(15, deadline)).until(
+                    lambda driver: self._page_state()['count'] > 0)
+            except Exception:
+                pass
 
-    
-            last_height = self.driver.execute_script("return document.documentElement.scrollHeight")
+            state = self._page_state()
+            initial_count = state['count']
 
             for i in range(scroll_time):
-                print(f"Đang tải thêm comment... (Lần {i+1}/{scroll_time})")
-                
+                if time.monotonic() >= deadline_at:
+                    print("Hết thời gian cuộn (deadline).")
+                    break
+
                 self.driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
-                
-                time.sleep(random.randint(2, 4))
 
-                new_height = self.driver.execute_script("return document.documentElement.scrollHeight")
+                new_state = self._wait_for_more(state, idle_timeout, deadline_at)
+                if new_state is None:
+                    print("Đã đến đáy trang hoặc không còn comment mới.")
+                    break
 
-                if new_height == last_height:
-                    time.sleep(2)
-                    new_height = self.driver.execute_script("return document.documentElement.scrollHeight")
-                    
-                    if new_height == last_height:
-                        print("Đã đến đáy trang hoặc không còn comment mới.")
-                        break
-                
-                last_height = new_height
+                print(f"Đang tải thêm comment... (Lần {i+1}/{scroll_time}): {new_state['count']} comment")
+                state = new_state
 
         except Exception as e:
             print(f"Lỗi trong quá trình cuộn (Có thể video tắt comment): {e}")
 
-        print("Hoàn tất quy trình cuộn.")
-    def extract_comments(self, timeout=10):
+        elapsed = time.monotonic() - start
+        loaded = state['count'] if state else 0
+        self.scroll_stats = {
+            'comments': loaded,
+            'loaded_by_scroll': loaded - initial_count,
+            'seconds': elapsed,
+            'seconds_per_comment': elapsed / loaded if loaded else None,
+        }
+        if loaded:
+            print(f"Hoàn tất quy trình cuộn: {loaded} comment trong {elapsed:.1f}s "
+                  f"({elapsed / loaded * 1000:.0f} ms/comment).")
+        else:
+            print("Hoàn tất quy trình cuộn.")
+    def extract_comments(self, timeout=10, bulk=True):
+        """
+        Extract author + content of every rendered comment
+        bulk=True collects everything in a single execute_script call (one
+        WebDriver round trip); bulk=False walks elements with find_element.
+        Both use the same selector fallbacks. Per-phase timings are kept in
+        self.extract_stats.
+        """
         print("Đang trích xuất comment")
         comment_list = []
         wait = WebDriverWait(self.driver, timeout)
+        timings = {}
 
         try:
+            start = time.perf_counter()
             wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#contents")))
+            timings['wait'] = time.perf_counter() - start
 
-            comments = self.driver.find_elements(By.CSS_SELECTOR, "ytd-comment-thread-renderer")
-            if not comments:
-                print("Không tìm thấy thẻ cũ, thử selector thay thế...")
-                comments = self.driver.find_elements(By.CSS_SELECTOR, "ytd-comment-renderer, ytd-comment-view-model")
-
-            print(f"Đã tìm thấy {len(comments)} thẻ comment")
-
-            for comment in comments:
+            if bulk:
                 try:
-                    author_elem = comment.find_element(By.CSS_SELECTOR, "#author-text, #header-author")
-                    content_elem = comment.find_element(By.CSS_SELECTOR, "#content-text, #content")
-                    author_name = author_elem.text.strip()
-                    content_text = " ".join(content_elem.text.split())  # collapse whitespace/newlines
-                    comment_list.append({"name": author_name, "comment": content_text})
+                    comment_list = self._extract_comments_bulk(timings)
                 except Exception as e:
-                    print(f"Ignored comment due to: {e}")
-                    continue
+                    print(f"Bulk extraction lỗi, chuyển sang từng phần tử: {e}")
+                    comment_list = self._extract_comments_elementwise(timings)
+            else:
+                comment_list = self._extract_comments_elementwise(timings)
+
+            timings['total'] = time.perf_counter() - start
+            self.extract_stats = {'comments': len(comment_list), 'bulk': bulk, **timings}
+            print("Thời gian trích xuất: " + ", ".join(f"{phase} {seconds * 1000:.0f}ms"
+                                                     for phase, seconds in timings.items()))
 
-            return comment_list
+            return self._only_new(comment_list)
 
         except Exception as e:
             print("Timeout: vùng chứa comments không xuất hiện",e)
@@ -108,6 +308,155 @@ class YoutubeCommentScraper:
             print(f"Lỗi: {e}")
             return []
 
+    def _extract_comments_bulk(self, timings):
+        """Collect all comments in one execute_script call returning a JSON array"""
+        start = time.perf_counter()
+        payload = json.loads(self.driver.execute_script(_EXTRACT_COMMENTS_JS))
+        timings['script'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if payload['fallback']:
+            print("Không tìm thấy thẻ cũ, thử selector thay thế...")
+        print(f"Đã tìm thấy {payload['total']} thẻ comment")
+        if payload['skipped']:
+            print(f"Ignored {payload['skipped']} comment thiếu author/content")
+
+        comment_list = [
+            {"name": author.strip(), "comment": " ".join(content.split())}  # collapse whitespace/newlines
+            for author, content in payload['comments']
+        ]
+        timings['parse'] = time.perf_counter() - start
+        return comment_list
+
+    def _extract_comments_elementwise(self, timings):
+        """Original extraction: find_element + .text per comment (2-3 round trips each)"""
+        start = time.perf_counter()
+        comment_list = []
+
+        comments = self.driver.find_elements(By.CSS_SELECTOR, "ytd-comment-thread-renderer")
+        if not comments:
+            print("Không tìm thấy thẻ cũ, thử selector thay thế...")
+            comments = self.driver.find_elements(By.CSS_SELECTOR, "ytd-comment-renderer, ytd-comment-view-model")
+
+        print(f"Đã tìm thấy {len(comments)} thẻ comment")
+        timings['find'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for comment in comments:
+            try:
+                author_elem = comment.find_element(By.CSS_SELECTOR, "#author-text, #header-author")
+                content_elem = comment.find_element(By.CSS_SELECTOR, "#content-text, #content")
+                author_name = author_elem.text.strip()
+                content_text = " ".join(content_elem.text.split())  # collapse whitespace/newlines
+                comment_list.append({"name": author_name, "comment": content_text})
+            except Exception as e:
+                print(f"Ignored comment due to: {e}")
+                continue
+        timings['read'] = time.perf_counter() - start
+
+        return comment_list
+
+    def _extract_new_comments(self, prune=False):
+        """Extract (and mark / optionally prune) comments rendered since the last call"""
+        payload = json.loads(self.driver.execute_script(_EXTRACT_NEW_COMMENTS_JS, prune))
+        return [
+            {"name": author.strip(), "comment": " ".join(content.split())}  # collapse whitespace/newlines
+            for author, content in payload['comments']
+        ]
+
+    def stream_comments(self, scroll_time=50, deadline=120, idle_timeout=6, prune=False):
+        """
+        Scroll and extract incrementally: after every scroll step only the
+        newly rendered comments are extracted and yielded, so callers can
+        persist them while scrolling continues.
+
+        Args:
+            scroll_time: Maximum number of scroll steps
+            deadline: Total time budget in seconds
+            idle_timeout: Seconds without new comments or spinner = end of list
+            prune: Remove extracted comment nodes from the DOM
+
+        Yields:
+            Lists of {"name", "comment"} dicts (one list per scroll step)
+        """
+        print("Bắt đầu cuộn + trích xuất (streaming)...")
+        start = time.monotonic()
+        deadline_at = start + deadline
+        total = 0
+        
+        try:
+            wait = WebDriverWait(self.driver, 15)
+            comment_section = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#contents")))
+            self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", comment_section)
+            try:
+                WebDriverWait(self.driver, min(15, deadline)).until(
+                    lambda driver: self._page_state()['count'] > 0)
+            except Exception:
+                pass
+
+            state = self._page_state()
+            for i in range(scroll_time + 1):
+                batch = self._only_new(self._extract_new_comments(prune))
+                if batch:
+                    total += len(batch)
+                    print(f"  + Lần {i}: {len(batch)} comment mới (tổng {total})")
+                    yield batch
+
+                if i == scroll_time or time.monotonic() >= deadline_at:
+                    break
+
+                self.driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
+                new_state = self._wait_for_more(state, idle_timeout, deadline_at, streaming=True)
+                if new_state is None:
+                    print("Đã đến đáy trang hoặc không còn comment mới.")
+                    break
+                state = new_state
+
+        except Exception as e:
+            print(f"Lỗi trong quá trình cuộn (Có thể video tắt comment): {e}")
+
+        elapsed = time.monotonic() - start
+        self.scroll_stats = {
+            'comments': total,
+            'seconds': elapsed,
+            'seconds_per_comment': elapsed / total if total else None,
+        }
+        print(f"Hoàn tất streaming: {total} comment trong {elapsed:.1f}s.")
+
+    def stream_to_csv(self, output_path="data/raw_comments.csv", scroll_time=50,
+                      deadline=120, idle_timeout=6, prune=True):
+        """
+        Streaming scrape: append each scroll step's new comments to the raw CSV
+        (same naming and format as _save_to_csv), flushing as it goes, so a
+        crash keeps everything extracted so far.
+
+        Returns:
+            Path of the written CSV, or None if no comment was found
+        """
+        output_dir = os.path.dirname(output_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        root, ext = os.path.splitext(output_path)
+        current_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        final_path = f"{root}_{current_time}{ext}"
+
+        n_rows = 0
+        with open(final_path, 'w', encoding='utf-8-sig', newline='') as f:
+            for batch in self.stream_comments(scroll_time, deadline, idle_timeout, prune):
+                pd.DataFrame(batch).to_csv(f, index=False, header=(n_rows == 0))
+                f.flush()
+                self.mark_written()
+                n_rows += len(batch)
+
+        if n_rows == 0:
+            os.remove(final_path)
+            print("Không có dữ liệu để lưu")
+            return None
+
+        print(f"Đã lưu {n_rows} dòng vào {final_path}")
+        return final_path
+
     def _save_to_csv(self, data, output_path="data/raw_comments.csv"):
         if not data:
             print("Không có dữ liệu để lưu")
@@ -126,6 +475,7 @@ class YoutubeCommentScraper:
 
            
             df.to_csv(final_path, index=False, encoding='utf-8-sig')
+            self.mark_written()
             
             print(f"Đã lưu {len(data)} dòng vào {final_path}")
             
@@ -133,6 +483,7 @@ class YoutubeCommentScraper:
 
         except Exception as e:
             print("Lỗi khi lưu file:", e)
+            self._unwritten_keys = []  # not written: leave them new for the next scrape
     def close(self):
         if self.driver:
             print("Đang đóng trình duyệt...")
@@ -0,0 +1,108 @@
+"""
+Sentiment trend chart from a TrendStore series
+Top panel: share of each sentiment over time; bottom panel: comments per
+point. Drawn on an Agg canvas unless shown on screen, like the keyword report.
+"""
+
+import os
+from typing import Dict, Optional
+
+import matplotlib.style
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+FIGURE_SIZE = (14, 8)
+DPI = 100
+
+COLORS = {
+    'background': '#1F2937',
+    'text': '#F9FAFB',
+    'accent': '#3B82F6',
+}
+
+# Positive, Neutral, Negative (same palette as the keyword report)
+SENTIMENT_COLORS = {0: '#10B981', 1: '#6B7280', 2: '#EF4444'}
+
+
+def _style():
+    return matplotlib.style.context(['dark_background', {
+        'font.family': 'sans-serif',
+        'font.sans-serif': ['DejaVu Sans', 'Arial'],
+        'font.size': 11,
+        'axes.titlesize': 16,
+        'axes.titleweight': 'bold',
+        'axes.facecolor': COLORS['background'],
+        'figure.facecolor': '#111827',
+        'text.color': COLORS['text'],
+        'axes.labelcolor': COLORS['text'],
+        'xtick.color': COLORS['text'],
+        'ytick.color': COLORS['text'],
+        'axes.unicode_minus': False,
+    }])
+
+
+def plot_trend(series: pd.DataFrame, label_names: Dict[int, str], title: str = 'Xu hướng cảm xúc',
+               save_path: Optional[str] = None, show: bool = False) -> bool:
+    """
+    Draw share per sentiment and comment volume over time
+
+    Args:
+        series: TrendStore.series(..., label_names=label_names) output
+        label_names: Label id -> name used in the series columns
+        title: Figure title
+        save_path: Save the chart here (.png / .svg / .pdf)
+        show: Open the chart in a window
+
+    Returns:
+        True if a chart was drawn, False if the series is empty
+    """
+    if series.empty:
+        print("❌ Chưa có dữ liệu xu hướng")
+        return False
+
+    with _style():
+        if show:
+            import matplotlib.pyplot as plt
+            fig = plt.figure(figsize=FIGURE_SIZE, dpi=DPI)
+        else:
+            fig = Figure(figsize=FIGURE_SIZE, dpi=DPI)
+            FigureCanvasAgg(fig)
+
+        share_ax, volume_ax = fig.subplots(2, 1, sharex=True, gridspec_kw={'height_ratios': [3, 1]})
+        for label, name in label_names.items():
+            column = f"share_{name}"
+            if column in series:
+                share_ax.plot(series.index, series[column] * 100, marker='o', linewidth=2,
+                              color=SENTIMENT_COLORS.get(label, COLORS['accent']), label=name)
+        share_ax.set_ylabel('Tỷ lệ (%)')
+        share_ax.set_ylim(0, 100)
+        share_ax.grid(alpha=0.2)
+        share_ax.legend(loc='upper left', frameon=False)
+        share_ax.set_title(title, pad=15)
+
+        volume_ax.bar(series.index, series['total'], color=COLORS['accent'], alpha=0.7,
+                      width=_bar_width(series.index))
+        volume_ax.set_ylabel('Bình luận')
+        volume_ax.grid(alpha=0.2, axis='y')
+        fig.autofmt_xdate()
+
+        if save_path:
+            os.makedirs(os.path.dirname(str(save_path)) or '.', exist_ok=True)
+            fig.savefig(save_path, dpi=DPI, bbox_inches='tight', facecolor=fig.get_facecolor())
+            print(f"💾 Đã lưu biểu đồ xu hướng tại: {save_path}")
+
+        if show:
+            fig.tight_layout()
+            plt.show()
+            plt.close(fig)
+    return True
+
+
+def _bar_width(index: pd.Index) -> float:
+    """Bar width in days: 80% of the smallest gap between points, at least 1% of the span"""
+    if len(index) < 2:
+        return 1 / 24
+    gaps = pd.Series(index).diff().dropna()
+    span = (index.max() - index.min()).total_seconds() / 86400
+    return max(gaps.min().total_seconds() / 86400 * 0.8, span / 100)
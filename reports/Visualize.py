@@ -1,18 +1,81 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib import font_manager
+import matplotlib.style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle
 from wordcloud import WordCloud
 import os
-import glob
+import re
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from modules.Statistics import ResultStatistics
+from modules.Storage import glob_tables, iter_tables, table_columns
 from pyvi import ViTokenizer
-from typing import Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 import numpy as np
 
+# pyplot (and with it an interactive backend) is only imported to show a
+# figure on screen; reports written to disk are drawn on an Agg canvas.
+
+# Same word pattern as WordCloud.process_text (ViTokenizer joins compounds with '_')
+WORD_PATTERN = re.compile(r"\w[\w']*")
+
+
+def count_tokens(texts: Iterable[str], stopwords: frozenset = frozenset(),
+                 segmented: Optional[Iterable[str]] = None) -> Counter:
+    """
+    Tokenize texts with ViTokenizer and count words the way WordCloud does
+    (numbers and stopwords dropped, trailing 's removed)
+    
+    Args:
+        texts: Cleaned texts
+        stopwords: Lower-case words to drop
+        segmented: ViTokenizer output aligned with texts (e.g. from a
+                   TokenizationCache); tokenized here if None
+    
+    Returns:
+        Token counts
+    """
+    texts = list(texts)
+    if segmented is None:
+        segmented = map(ViTokenizer.tokenize, texts)
+    counts = Counter()
+    for text, tokenized in zip(texts, segmented):
+        words = WORD_PATTERN.findall(tokenized)
+        counts.update(word[:-2] if word.lower().endswith("'s") else word
+                      for word in words
+                      if not word.isdigit() and word.lower() not in stopwords)
+    return counts
+
+
+def normalize_counts(counts: Counter) -> Counter:
+    """
+    Fold case variants and plurals the way WordCloud.process_text does:
+    each word is shown in its most common case, and 'words' is merged into
+    'word' when both occur (not for words ending in 'ss')
+    """
+    by_lower = {}
+    for word, count in counts.items():
+        by_lower.setdefault(word.lower(), Counter())[word] += count
+    
+    for key in list(by_lower):
+        singular = key[:-1]
+        if key.endswith('s') and not key.endswith('ss') and singular in by_lower:
+            for word, count in by_lower.pop(key).items():
+                by_lower[singular][word[:-1]] += count
+    
+    return Counter({max(cases.items(), key=lambda item: item[1])[0]: sum(cases.values())
+                    for cases in by_lower.values()})
+
 
 class _CloudKeyword:
     """
     Modern visualization class for sentiment analysis results
     Features: Word Cloud + Donut Chart + Statistics
+    
+    The style is applied per figure (never to the global rcParams), so
+    rendering does not leak into other plots in the same process.
     """
     
     # Visual Constants
@@ -41,7 +104,6 @@ class _CloudKeyword:
             stopwords_path: Path to stopwords file
         """
         self.stopwords_set = self._load_stopwords(stopwords_path)
-        self._setup_style()
     
     def _load_stopwords(self, path: str) -> set:
         """Load stopwords from file"""
@@ -58,10 +120,9 @@ class _CloudKeyword:
             print(f"❌ Không thể đọc file stopwords: {e}")
             return set()
     
-    def _setup_style(self):
-        """Setup matplotlib style for modern look"""
-        plt.style.use('dark_background')
-        plt.rcParams.update({
+    def _style(self):
+        """Context applying the dark style while a figure is built and saved"""
+        return matplotlib.style.context(['dark_background', {
             'font.family': 'sans-serif',
             'font.sans-serif': ['DejaVu Sans', 'Arial'],
             'font.size': 11,
@@ -75,12 +136,11 @@ class _CloudKeyword:
             'xtick.color': self.COLORS['text'],
             'ytick.color': self.COLORS['text'],
             'axes.unicode_minus': False,
-        })
+        }])
     
     def _find_latest_result(self, data_path: str = 'result') -> Optional[str]:
         """Find the latest result CSV file"""
-        search_pattern = os.path.join(data_path, '*results*.csv')
-        list_of_files = glob.glob(search_pattern)
+        list_of_files = glob_tables(data_path, '*results*')
         
         if not list_of_files:
             print("❌ Không tìm thấy file kết quả")
@@ -90,12 +150,12 @@ class _CloudKeyword:
         print(f"📁 Phân tích file: {os.path.basename(latest_file)}")
         return latest_file
     
-    def _create_wordcloud(self, text: str, max_words: int = 150) -> WordCloud:
+    def _create_wordcloud(self, frequencies: dict, max_words: int = 150) -> WordCloud:
         """
         Create modern word cloud with gradient colors
         
         Args:
-            text: Tokenized text data
+            frequencies: Word -> count (stopwords already removed)
             max_words: Maximum number of words to display
         """
         # Custom color function for gradient effect
@@ -109,20 +169,20 @@ class _CloudKeyword:
             height=self.WORDCLOUD_HEIGHT,
             background_color='#1F2937',
             colormap='viridis',
-            stopwords=self.stopwords_set,
             max_words=max_words,
             relative_scaling=0.5,
             min_font_size=10,
-            collocations=False,
             color_func=color_func
-        ).generate(text)
+        ).generate_from_frequencies(frequencies)
         
         return wordcloud
     
-    def _create_statistics_text(self, df: pd.DataFrame) -> str:
+    def _create_statistics_text(self, summary: dict) -> str:
         """Create statistics summary text (no emoji for encoding)"""
-        total = len(df)
-        label_counts = df['Label'].value_counts()
+        stats = summary['stats']
+        total = stats.rows
+        label_counts = stats.label_counts
+        length = stats.length_summary()
         
         stats = f"""
 THONG KE PHAN TICH
@@ -135,64 +195,164 @@ Phan bo cam xuc:
   Trung lap: {label_counts.get(1, 0):,} ({label_counts.get(1, 0)/total*100:.1f}%)
   Tieu cuc:  {label_counts.get(2, 0):,} ({label_counts.get(2, 0)/total*100:.1f}%)
 
-Tu vung: {len(set(' '.join(df['Text']).split())):,} tu duy nhat
+Tu vung: {stats.vocabulary_size:,} tu duy nhat
+Do dai TB: {length['mean']:.1f} tu (max {length['max']:,})
         """
         return stats
     
+    def token_frequencies(self, result_file: str, chunk_size: int = 50000,
+                          n_workers: int = 1, cache=None) -> dict:
+        """
+        Count word-cloud tokens and labels of a result file chunk by chunk
+        Only the counters are kept, so memory grows with the vocabulary,
+        not with the total text length. Label / length / vocabulary
+        statistics are aggregated in the same pass (ResultStatistics).
+        
+        Args:
+            result_file: Result file with Text and Label columns
+            chunk_size: Rows per chunk
+            n_workers: Worker processes for tokenization (1 = in this process)
+            cache: Optional modules.Cache.TokenizationCache; only texts never
+                   segmented before are passed to ViTokenizer
+        
+        Returns:
+            {'frequencies': Counter, 'stats': ResultStatistics,
+             'label_counts': pd.Series, 'total': int}
+        """
+        frequencies = Counter()
+        stats = ResultStatistics()
+        merge = frequencies.update
+        
+        stopwords = frozenset(word.lower() for word in self.stopwords_set)
+        pool = None
+        if n_workers > 1:
+            pool = ProcessPoolExecutor(max_workers=n_workers, initializer=_init_token_worker,
+                                       initargs=(stopwords,))
+        try:
+            in_flight = deque()
+            for chunk in iter_tables(result_file, chunk_size, columns=['Text', 'Label']):
+                stats.update(chunk)
+                texts = chunk['Text'].astype(str).tolist()
+                
+                if cache is not None:
+                    tokenize = (lambda misses: _tokenize_on_pool(pool, n_workers, misses)) if pool else None
+                    merge(count_tokens(texts, stopwords, cache.tokenize_many(texts, tokenize)))
+                elif pool is not None:
+                    in_flight.append(pool.submit(_count_tokens_task, texts))
+                    # Bounded number of chunks in flight so memory stays flat
+                    if len(in_flight) >= 2 * n_workers:
+                        merge(in_flight.popleft().result())
+                else:
+                    merge(count_tokens(texts, stopwords))
+            while in_flight:
+                merge(in_flight.popleft().result())
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        return {
+            'frequencies': normalize_counts(frequencies),
+            'stats': stats,
+            'label_counts': pd.Series(stats.label_counts, dtype='int64').sort_index(),
+            'total': stats.rows,
+        }
+    
     def keyword(self, max_words: int = 150, data_path: str = 'result', 
-                save_path: Optional[str] = None) -> None:
+                save_path: Optional[str] = None, result_file: Optional[str] = None,
+                chunk_size: int = 50000, n_workers: int = 1, cache=None,
+                show: bool = True) -> Optional[dict]:
         """
         Generate visualization with word cloud and sentiment distribution
         
         Args:
             max_words: Maximum words in word cloud
             data_path: Path to result folder
-            save_path: Optional path to save figure
+            save_path: Optional path to save figure (.png / .svg / .pdf)
+            result_file: Exact result file to analyze (skips the latest-file search)
+            chunk_size: Rows read and tokenized at a time
+            n_workers: Worker processes for tokenization
+            cache: Optional TokenizationCache shared across runs
+            show: Open the figure in a window (plt.show); False renders
+                  headless on an Agg canvas and only writes save_path
+        
+        Returns:
+            Timings {'count_seconds', 'render_seconds', 'path'}, or None on error
         """
         # Find latest result file
-        latest_file = self._find_latest_result(data_path)
+        latest_file = result_file or self._find_latest_result(data_path)
         if not latest_file:
-            return
+            return None
         
         try:
-            # Load data
-            df = pd.read_csv(latest_file)
-            print(f"📊 Đã load {len(df)} dòng dữ liệu")
-            
-            # Check required columns
-            required_cols = ['Text', 'Label', 'Sentiment']
-            if not all(col in df.columns for col in required_cols):
+            # Check required columns (header / schema only)
+            required_cols = ['Text', 'Label']
+            columns = table_columns(latest_file)
+            if not all(col in columns for col in required_cols):
                 print(f"❌ File thiếu cột cần thiết: {required_cols}")
-                return
+                return None
             
-            # Prepare text data with ViTokenizer
+            # Count tokens chunk by chunk with ViTokenizer (only Text / Label are read)
             print("Dang tokenize voi ViTokenizer...")
-            tokenized_texts = []
-            for text in df['Text'].astype(str):
-                tokenized = ViTokenizer.tokenize(text)
-                tokenized_texts.append(tokenized)
-            
-            tokenized_text = " ".join(tokenized_texts)
-            print(f"Da tokenize {len(tokenized_texts)} cau, {len(tokenized_text.split())} tu")
+            start = time.perf_counter()
+            summary = self.token_frequencies(latest_file, chunk_size, n_workers, cache)
+            count_seconds = time.perf_counter() - start
+            if summary['total'] == 0:
+                print("❌ File kết quả không có dữ liệu")
+                return None
+            frequencies = summary['frequencies']
+            print(f"Da tokenize {summary['total']} cau, {sum(frequencies.values())} tu "
+                  f"({len(frequencies)} tu khac nhau)")
+            if cache is not None:
+                stats = cache.stats()
+                print(f"🗄️  Token cache: {stats['hits']:,} hit / {stats['misses']:,} miss "
+                      f"({stats['hit_rate'] * 100:.1f}%), {stats['size']:,} mục")
             
             # Create visualizations
-            self._create_visualization(df, tokenized_text, max_words, save_path)
+            start = time.perf_counter()
+            self._create_visualization(summary, max_words, save_path, show)
+            return {'count_seconds': count_seconds,
+                    'render_seconds': time.perf_counter() - start,
+                    'path': save_path}
             
         except Exception as e:
             print(f"❌ Lỗi khi phân tích dữ liệu: {e}")
             import traceback
             traceback.print_exc()
+            return None
+    
+    def _create_visualization(self, summary: dict, max_words: int,
+                              save_path: Optional[str], show: bool = True) -> None:
+        """Create the main visualization figure; save it and / or show it"""
+        with self._style():
+            if show:
+                import matplotlib.pyplot as plt
+                fig = plt.figure(figsize=self.FIGURE_SIZE, dpi=self.DPI)
+            else:
+                # Not registered with pyplot: no backend, no window, freed with the object
+                fig = Figure(figsize=self.FIGURE_SIZE, dpi=self.DPI)
+                FigureCanvasAgg(fig)
+            self._draw_figure(fig, summary, max_words)
+            
+            # Save or show
+            if save_path:
+                os.makedirs(os.path.dirname(str(save_path)) or '.', exist_ok=True)
+                fig.savefig(save_path, dpi=self.DPI, bbox_inches='tight',
+                            facecolor=fig.get_facecolor())
+                print(f"💾 Đã lưu visualization tại: {save_path}")
+            
+            if show:
+                fig.tight_layout()
+                plt.show()
+                plt.close(fig)
     
-    def _create_visualization(self, df: pd.DataFrame, text: str, 
-                            max_words: int, save_path: Optional[str]) -> None:
-        """Create the main visualization figure"""
+    def _draw_figure(self, fig, summary: dict, max_words: int) -> None:
+        """Draw word cloud, donut chart and statistics onto fig"""
         # Create figure with 3 subplots
-        fig = plt.figure(figsize=self.FIGURE_SIZE, dpi=self.DPI)
         gs = fig.add_gridspec(2, 3, hspace=0.3, wspace=0.3)
         
         # 1. Word Cloud (large, spans 2 rows)
         ax1 = fig.add_subplot(gs[:, :2])
-        wordcloud = self._create_wordcloud(text, max_words)
+        wordcloud = self._create_wordcloud(summary['frequencies'], max_words)
         ax1.imshow(wordcloud, interpolation='bilinear')
         ax1.set_title('Word Cloud - Tu khoa pho bien', 
                      fontsize=18, fontweight='bold', pad=20,
@@ -201,34 +361,25 @@ Tu vung: {len(set(' '.join(df['Text']).split())):,} tu duy nhat
         
         # 2. Donut Chart (top right)
         ax2 = fig.add_subplot(gs[0, 2])
-        self._plot_donut_chart(ax2, df)
+        self._plot_donut_chart(ax2, summary['label_counts'])
         
         # 3. Statistics (bottom right)
         ax3 = fig.add_subplot(gs[1, 2])
-        self._plot_statistics(ax3, df)
+        self._plot_statistics(ax3, summary)
         
         # Add main title
         fig.suptitle('PHAN TICH CAM XUC - SENTIMENT ANALYSIS', 
                     fontsize=22, fontweight='bold', y=0.98,
                     color=self.COLORS['text'])
-        
-        # Save or show
-        if save_path:
-            plt.savefig(save_path, dpi=self.DPI, bbox_inches='tight', 
-                       facecolor=fig.get_facecolor())
-            print(f"💾 Đã lưu visualization tại: {save_path}")
-        
-        plt.tight_layout()
-        plt.show()
     
-    def _plot_donut_chart(self, ax, df: pd.DataFrame) -> None:
-        """Plot modern donut chart for sentiment distribution"""
-        label_counts = df['Label'].value_counts().sort_index()
+    def _plot_donut_chart(self, ax, label_counts: pd.Series) -> None:
+        """Plot modern donut chart for sentiment distribution (label -> count)"""
         
         # Dynamic labels and colors based on actual data
         label_map = {0: 'Tich cuc', 1: 'Trung lap', 2: 'Tieu cuc'}
         color_map = {0: '#10B981', 1: '#6B7280', 2: '#EF4444'}
         
+        label_counts = label_counts[label_counts.index.isin(list(label_map))]
         labels = [label_map[label] for label in label_counts.index]
         colors = [color_map[label] for label in label_counts.index]
         
@@ -244,7 +395,7 @@ Tu vung: {len(set(' '.join(df['Text']).split())):,} tu duy nhat
         )
         
         # Make it donut (add white circle in center)
-        centre_circle = plt.Circle((0, 0), 0.70, fc='#1F2937', linewidth=0)
+        centre_circle = Circle((0, 0), 0.70, fc='#1F2937', linewidth=0)
         ax.add_artist(centre_circle)
         
         # Style autopct
@@ -256,9 +407,9 @@ Tu vung: {len(set(' '.join(df['Text']).split())):,} tu duy nhat
         ax.set_title('Phan bo cam xuc', fontsize=14, fontweight='bold', 
                     pad=15, color=self.COLORS['text'])
     
-    def _plot_statistics(self, ax, df: pd.DataFrame) -> None:
+    def _plot_statistics(self, ax, summary: dict) -> None:
         """Plot statistics text panel"""
-        stats_text = self._create_statistics_text(df)
+        stats_text = self._create_statistics_text(summary)
         
         ax.text(0.5, 0.5, stats_text, 
                transform=ax.transAxes,
@@ -274,6 +425,109 @@ Tu vung: {len(set(' '.join(df['Text']).split())):,} tu duy nhat
         ax.axis('off')
 
 
+# ==================== PARALLEL TOKENIZATION WORKERS ====================
+_worker_stopwords: frozenset = frozenset()
+
+
+def _init_token_worker(stopwords: frozenset) -> None:
+    """Process pool initializer: receive the stopword set once per worker"""
+    global _worker_stopwords
+    _worker_stopwords = stopwords
+
+
+def _count_tokens_task(texts: list) -> Counter:
+    return count_tokens(texts, _worker_stopwords)
+
+
+def _tokenize_task(texts: list) -> list:
+    return [ViTokenizer.tokenize(text) for text in texts]
+
+
+def _tokenize_on_pool(pool: ProcessPoolExecutor, n_workers: int, texts: list) -> list:
+    """Segment texts split evenly across the pool, order preserved"""
+    size = -(-len(texts) // n_workers)
+    parts = pool.map(_tokenize_task, [texts[i:i + size] for i in range(0, len(texts), size)])
+    return [text for part in parts for text in part]
+
+
+
+# ==================== BATCH REPORT RENDERING ====================
+_worker_cloud: Optional[_CloudKeyword] = None
+_worker_token_cache = None
+
+
+def _init_render_worker(stopwords_path: str, token_cache_path: Optional[str]) -> None:
+    """Process pool initializer: load stopwords (and open the token cache) once per worker"""
+    global _worker_cloud, _worker_token_cache
+    _worker_cloud = _CloudKeyword(stopwords_path)
+    if token_cache_path:
+        from modules.Cache import TokenizationCache
+        _worker_token_cache = TokenizationCache(token_cache_path)
+
+
+def _render_task(result_file: str, output_path: str, max_words: int, chunk_size: int) -> Optional[dict]:
+    return _worker_cloud.keyword(max_words=max_words, save_path=output_path, result_file=result_file,
+                                 chunk_size=chunk_size, cache=_worker_token_cache, show=False)
+
+
+def report_path_for(result_file: str, output_dir: str, image_format: str = 'png') -> str:
+    """<output_dir>/<result file name>.<image_format>"""
+    stem = os.path.splitext(os.path.basename(str(result_file)))[0]
+    return os.path.join(str(output_dir), f"{stem}.{image_format}")
+
+
+def render_reports(result_files: List[str], output_dir: str, image_format: str = 'png',
+                   n_workers: Optional[int] = None, max_words: int = 150,
+                   chunk_size: int = 50000, stopwords_path: str = 'data/stopwords.txt',
+                   token_cache_path: Optional[str] = None) -> List[dict]:
+    """
+    Render one headless report per result file on a process pool
+    
+    Args:
+        result_files: Result files to chart
+        output_dir: Folder for <result name>.<image_format> reports
+        image_format: 'png', 'svg' or 'pdf'
+        n_workers: Worker processes (default: CPU count)
+        max_words: Maximum words per word cloud
+        chunk_size: Rows read and tokenized at a time
+        stopwords_path: Stopwords file loaded once per worker
+        token_cache_path: TokenizationCache file opened by each worker
+    
+    Returns:
+        One dict per result file, in input order: {'result_file', 'path'
+        (None if it failed), 'count_seconds', 'render_seconds'}
+    """
+    n_workers = min(n_workers or os.cpu_count() or 1, len(result_files)) or 1
+    os.makedirs(str(output_dir), exist_ok=True)
+    print(f"--- Đang render {len(result_files)} report với {n_workers} workers ---")
+    
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_render_worker,
+                             initargs=(stopwords_path, token_cache_path)) as pool:
+        futures = [pool.submit(_render_task, result_file,
+                               report_path_for(result_file, output_dir, image_format),
+                               max_words, chunk_size)
+                   for result_file in result_files]
+        
+        reports = []
+        for result_file, future in zip(result_files, futures):
+            try:
+                timing = future.result()
+            except Exception as e:
+                print(f"❌ Lỗi khi render {os.path.basename(str(result_file))}: {e}")
+                timing = None
+            timing = timing or {'count_seconds': None, 'render_seconds': None, 'path': None}
+            reports.append({'result_file': str(result_file), **timing})
+    
+    for report in reports:
+        if report['path']:
+            print(f"  + {os.path.basename(report['path'])}: đếm {report['count_seconds']:.2f}s, "
+                  f"vẽ {report['render_seconds']:.2f}s")
+    done = sum(1 for report in reports if report['path'])
+    print(f"✅ Đã render {done}/{len(reports)} report trong {time.perf_counter() - start:.2f}s")
+    return reports
+
+
 if __name__ == "__main__":
     print("="*50)
     print("SENTIMENT VISUALIZATION - MODERN UI")
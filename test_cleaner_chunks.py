@@ -0,0 +1,72 @@
+"""
+Chunked cleaning must give byte-identical output to a whole-file clean,
+even when one chunk holds only digits, empty cells or NA-like strings.
+
+Run: python -m pytest -q test_cleaner_chunks.py   (or python test_cleaner_chunks.py)
+"""
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from modules.Cleaner import Cleaner, _clean_file_task
+
+CHUNK_SIZE = 4
+
+
+def _write_raw(folder: str) -> str:
+    comments = (
+        ["Video hay quá!", "@ban xem đi https://youtu.be/x", "tuyệt vời", "Quá đỉnh"]
+        + ["123", "0042", "7", "2024"]             # chunk 2: only digits
+        + ["NA", "null", "", "  "]                 # chunk 3: NA-like strings and empty cells
+        + ["nan", "N/A", "ok 100%", "cảm ơn"]
+    )
+    path = os.path.join(folder, "raw_comments_test.csv")
+    pd.DataFrame({"name": [f"@user{i}" for i in range(len(comments))],
+                  "comment": comments}).to_csv(path, index=False, encoding="utf-8-sig")
+    return path
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_chunked_clean_matches_whole_file():
+    with tempfile.TemporaryDirectory() as folder:
+        raw_path = _write_raw(folder)
+        whole = os.path.join(folder, "whole.csv")
+        chunked = os.path.join(folder, "chunked.csv")
+        parallel = os.path.join(folder, "parallel.csv")
+
+        _clean_file_task(raw_path, whole, "comment")
+        _clean_file_task(raw_path, chunked, "comment", chunk_size=CHUNK_SIZE)
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            assert Cleaner()._clean_file_chunks_parallel(pool, 1, raw_path, parallel,
+                                                         "comment", CHUNK_SIZE)
+
+        assert _read_bytes(chunked) == _read_bytes(whole)
+        assert _read_bytes(parallel) == _read_bytes(whole)
+
+        texts = pd.read_csv(whole, dtype=str, keep_default_na=False)["text"].tolist()
+        assert "123" in texts and "0042" in texts       # digit-only chunk is kept as text
+        assert "" not in texts                          # empty cells are dropped
+
+
+def test_process_file_matches_file_task():
+    with tempfile.TemporaryDirectory() as folder:
+        raw_path = _write_raw(folder)
+        whole = os.path.join(folder, "whole.csv")
+        _clean_file_task(raw_path, whole, "comment")
+
+        df = Cleaner().process_file(raw_path, "comment")
+        expected = pd.read_csv(whole, dtype=str, keep_default_na=False)["text"].tolist()
+        assert df["text"].tolist() == expected
+
+
+if __name__ == "__main__":
+    test_chunked_clean_matches_whole_file()
+    test_process_file_matches_file_task()
+    print("✓ Chunked cleaning == whole-file cleaning")
@@ -0,0 +1,110 @@
+"""
+Comment dedup index: comments are keyed on the author handle (not the relative
+time under it) and only marked as seen once they have been written.
+
+Run: python -m pytest -q test_comment_index.py   (or python test_comment_index.py)
+"""
+
+import os
+import tempfile
+
+from modules.Cache import CommentIndex
+from modules.ScrapeScheduler import ScrapeScheduler
+from modules.YoutubeCommentScraper import YoutubeCommentScraper
+
+VIDEO_ID = "dQw4w9WgXcQ"
+URL = f"https://www.youtube.com/watch?v={VIDEO_ID}"
+
+
+def _index(folder: str) -> CommentIndex:
+    return CommentIndex(os.path.join(folder, "comment_index.sqlite"))
+
+
+def test_relative_time_and_edit_marker_are_ignored():
+    with tempfile.TemporaryDirectory() as folder:
+        index = _index(folder)
+        first = [{'name': '@KhoiVuOfficial\n1 tháng trước', 'comment': 'Video hay quá!'}]
+        new, keys = index.filter_new(VIDEO_ID, first)
+        assert new == first
+        index.mark_seen(keys)
+
+        later = [
+            {'name': '@KhoiVuOfficial\n2 tháng trước', 'comment': 'Video hay quá!'},
+            {'name': '@KhoiVuOfficial\n2 tháng trước (đã chỉnh sửa)', 'comment': 'video  HAY quá! '},
+            {'name': '@other\n2 tháng trước', 'comment': 'Video hay quá!'},
+        ]
+        new, _ = index.filter_new(VIDEO_ID, later)
+        assert [c['name'] for c in new] == ['@other\n2 tháng trước']
+        index.close()
+
+
+def test_filter_new_marks_nothing():
+    with tempfile.TemporaryDirectory() as folder:
+        index = _index(folder)
+        comments = [{'name': '@a\n1 giờ trước', 'comment': 'x'}, {'name': '@a', 'comment': 'X'}]
+        new, keys = index.filter_new(VIDEO_ID, comments)
+        assert len(new) == 1 and len(keys) == 1       # duplicate within one scrape dropped
+
+        assert len(index.filter_new(VIDEO_ID, comments)[0]) == 1
+        index.mark_seen(keys)
+        assert index.filter_new(VIDEO_ID, comments)[0] == []
+        index.close()
+
+
+def test_scraper_marks_only_written_comments():
+    with tempfile.TemporaryDirectory() as folder:
+        index = _index(folder)
+        scraper = YoutubeCommentScraper()
+        scraper.dedup_index = index
+        scraper.video_id = VIDEO_ID
+        comments = [{'name': '@a\n1 giờ trước', 'comment': 'x'}]
+
+        # Output directory is a file: the write fails and nothing is marked
+        blocker = os.path.join(folder, "blocker")
+        open(blocker, "w").close()
+        assert scraper._save_to_csv(scraper._only_new(comments),
+                                    os.path.join(blocker, "raw_comments.csv")) is None
+        scraper.mark_written()
+        assert index.filter_new(VIDEO_ID, comments)[0] == comments
+
+        path = scraper._save_to_csv(scraper._only_new(comments), os.path.join(folder, "raw_comments.csv"))
+        assert path and os.path.exists(path)
+        assert scraper._only_new(comments) == []
+        index.close()
+
+
+class _FixedScheduler(ScrapeScheduler):
+    """Yields fixed comments instead of opening browsers"""
+
+    def __init__(self, comments_by_url, **kwargs):
+        super().__init__(**kwargs)
+        self.comments_by_url = comments_by_url
+
+    def scrape_many(self, urls):
+        for url in urls:
+            yield url, list(self.comments_by_url[url])
+
+
+def test_scheduler_lists_unchanged_videos():
+    with tempfile.TemporaryDirectory() as folder:
+        index = _index(folder)
+        other = "https://www.youtube.com/watch?v=9bZkp7q19f0"
+        comments = {URL: [{'name': '@a\n1 giờ trước', 'comment': 'x'}],
+                    other: [{'name': '@b\n1 giờ trước', 'comment': 'y'}]}
+        scheduler = _FixedScheduler(comments, dedup_index=index)
+
+        written = scheduler.scrape_many_to_csv([URL, other], output_dir=folder)
+        assert len(written) == 2 and scheduler.unchanged == []
+
+        comments[URL] = [{'name': '@a\n3 giờ trước', 'comment': 'x'}]
+        assert scheduler.scrape_many_to_csv([URL, other], output_dir=folder) == []
+        assert scheduler.unchanged == [URL, other]
+        index.close()
+
+
+if __name__ == "__main__":
+    test_relative_time_and_edit_marker_are_ignored()
+    test_filter_new_marks_nothing()
+    test_scraper_marks_only_written_comments()
+    test_scheduler_lists_unchanged_videos()
+    print("✓ Comment index dedup")
@@ -0,0 +1,74 @@
+"""
+Trend store: date bounds are inclusive whole days and runs without comments
+are kept as zero-volume points (so a backfill never recounts them).
+
+Run: python -m pytest -q test_trend_store.py   (or python test_trend_store.py)
+"""
+
+import os
+import sqlite3
+import tempfile
+
+from modules.TrendStore import TrendStore
+
+
+def _store(folder: str) -> TrendStore:
+    store = TrendStore(os.path.join(folder, "trends.sqlite"))
+    store.record("run-a", "vid", {0: 3, 2: 1}, recorded="2024-04-30T23:59:59")
+    store.record("run-b", "vid", {0: 2, 1: 2}, recorded="2024-05-01T10:00:00")
+    store.record("run-c", "vid", {1: 5}, recorded="2024-05-01 12:00")
+    store.record("run-d", "vid", {2: 4}, recorded="2024-05-02T00:00:00")
+    return store
+
+
+def test_same_day_bounds_are_inclusive():
+    with tempfile.TemporaryDirectory() as folder:
+        with _store(folder) as store:
+            assert store.runs(since="2024-05-01", until="2024-05-01")['run_id'].tolist() == ["run-b", "run-c"]
+            assert len(store.series(since="2024-05-01", until="2024-05-01")) == 2
+            assert store.runs(until="2024-05-01 10:00")['run_id'].tolist() == ["run-a", "run-b"]
+            assert store.runs(since="2024-05-01T12:00:00")['run_id'].tolist() == ["run-c", "run-d"]
+
+
+def test_empty_run_is_kept():
+    with tempfile.TemporaryDirectory() as folder:
+        with _store(folder) as store:
+            store.record("run-e", "vid", {}, recorded="2024-05-03T08:00:00")
+            assert store.has_run("run-e")
+
+            series = store.series(video_id="vid", label_names={0: "pos", 1: "neu", 2: "neg"})
+            assert series['total'].tolist() == [4, 4, 5, 4, 0]
+            assert series['share_pos'].iloc[-1] == 0.0
+
+            store.record("run-e", "vid", {}, recorded="2024-05-03T08:00:00")
+            assert len(store.runs()) == 5
+
+
+def test_only_empty_runs():
+    with tempfile.TemporaryDirectory() as folder:
+        with TrendStore(os.path.join(folder, "trends.sqlite")) as store:
+            store.record("run-a", "vid", {}, recorded="2024-05-01T10:00:00")
+            series = store.series(window='D')
+            assert series['total'].tolist() == [0] and series['runs'].tolist() == [1]
+
+
+def test_store_without_runs_table_is_migrated():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "trends.sqlite")
+        with _store(folder):
+            pass
+        conn = sqlite3.connect(path)
+        conn.execute("DROP TABLE runs")
+        conn.commit()
+        conn.close()
+
+        with TrendStore(path) as store:
+            assert store.has_run("run-a") and len(store.runs()) == 4
+
+
+if __name__ == "__main__":
+    test_same_day_bounds_are_inclusive()
+    test_empty_run_is_kept()
+    test_only_empty_runs()
+    test_store_without_runs_table_is_migrated()
+    print("✓ Trend store bounds and empty runs")
@@ -4,11 +4,14 @@ Common helpers to avoid code duplication
 """
 
 import os
+import re
 import glob
+import hashlib
 import logging
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
+from urllib.parse import urlparse, parse_qs
 
 from config import DATA_PROCESSING, FILE_PATTERNS
 
@@ -113,3 +116,50 @@ def validate_csv_columns(df, required_columns: list) -> bool:
         True if all columns exist, False otherwise
     """
     return all(col in df.columns for col in required_columns)
+
+
+def extract_video_id(url: str) -> str:
+    """
+    Get a filesystem-safe video id from a YouTube URL
+    
+    Handles watch?v=, youtu.be/, /shorts/ and /embed/ URLs. Other URLs
+    (e.g. local file:// fixtures) fall back to the file name, or a short
+    hash of the URL.
+    
+    Args:
+        url: Video URL
+        
+    Returns:
+        Video id string
+    """
+    parsed = urlparse(url)
+    
+    video_id = parse_qs(parsed.query).get('v', [None])[0]
+    if not video_id and parsed.netloc.endswith('youtu.be'):
+        video_id = parsed.path.lstrip('/').split('/')[0]
+    if not video_id:
+        match = re.search(r'/(?:shorts|embed|live)/([^/?#]+)', parsed.path)
+        video_id = match.group(1) if match else None
+    if not video_id and parsed.scheme == 'file':
+        video_id = Path(parsed.path).stem
+    if not video_id:
+        video_id = hashlib.sha1(url.encode('utf-8')).hexdigest()[:11]
+    
+    return re.sub(r'[^\w-]', '_', video_id)
+
+
+def read_list_file(path: str) -> list:
+    """
+    Read one entry (URL or file path) per line
+    
+    Blank lines and lines starting with '#' are skipped.
+    
+    Args:
+        path: Text file
+        
+    Returns:
+        List of stripped entries, in file order
+    """
+    with open(path, encoding='utf-8') as f:
+        entries = [line.strip() for line in f]
+    return [entry for entry in entries if entry and not entry.startswith('#')]